@@ -0,0 +1,226 @@
+"""
+Offline end-to-end benchmark of a trading run.
+
+Generates synthetic price, Finnhub, SimFin and Reddit data in a temporary
+data directory, then times full propagate runs with a deterministic fake LLM
+and fake embeddings, every offline dataflow function, and the agent memory
+operations. No API keys or network access are needed. Reports the first
+call and the p50 / p95 of the repeated ones, and the peak RSS of the process
+after each scenario.
+
+Usage:
+    python -m benchmarks.bench_end_to_end [--scenarios propagate dataflows memory]
+        [--runs 5] [--latency 0.0] [--parallel-analysts] [--json results.json]
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import tradingagents.dataflows.interface as interface
+from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.dataflows.config import set_config
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+from benchmarks.fakes import FakeChatModel, fake_embeddings
+from benchmarks.fixtures import build_fixtures
+
+SCENARIOS = ("propagate", "dataflows", "memory")
+
+
+def peak_rss_mb():
+    """Peak resident set size of the process so far, None where unknown."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def timed(func, runs):
+    """Call func runs times; (seconds of every call, result of the last)."""
+    seconds, result = [], None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        seconds.append(time.perf_counter() - start)
+    return seconds, result
+
+
+def summarize(name, seconds):
+    repeated = seconds[1:] or seconds
+    return {
+        "name": name,
+        "runs": len(seconds),
+        "first": seconds[0],
+        "p50": float(np.percentile(repeated, 50)),
+        "p95": float(np.percentile(repeated, 95)),
+    }
+
+
+def bench_propagate(args, workdir):
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config.update(
+        {
+            "data_dir": os.path.join(workdir, "data"),
+            "data_cache_dir": os.path.join(workdir, "cache"),
+            "results_dir": os.path.join(workdir, "results"),
+            "online_tools": False,
+            "parallel_analysts": args.parallel_analysts,
+            "llm_cache": None,
+            "memory_dir": None,
+        }
+    )
+    llm = FakeChatModel(latency=args.latency, response_chars=args.response_chars)
+    graph = TradingAgentsGraph(
+        config=config,
+        quick_thinking_llm=llm,
+        deep_thinking_llm=llm.model_copy(update={"model_name": "fake-deep"}),
+        embedding_func=fake_embeddings,
+    )
+
+    profiles = []
+
+    def run():
+        graph.propagate(args.ticker, args.date)
+        profiles.append(graph.last_profile)
+
+    seconds, _ = timed(run, args.runs)
+    rows = [summarize("propagate", seconds)]
+    # where the time of a run goes
+    for node in (profiles[-1] or {}).get("nodes", {}):
+        node_seconds = [
+            profile["nodes"].get(node, {}).get("wall_time", 0.0)
+            for profile in profiles
+            if profile
+        ]
+        if node_seconds:
+            rows.append(summarize(f"  {node}", node_seconds))
+    return rows
+
+
+def bench_dataflows(args, workdir):
+    set_config({"data_dir": os.path.join(workdir, "data")})
+    ticker, date = args.ticker, args.date
+    start = (np.datetime64(date) - np.timedelta64(30, "D")).astype(str)
+    calls = {
+        "get_YFin_data": lambda: interface.get_YFin_data(ticker, start, date),
+        "get_stock_stats_indicators_window": lambda: interface.get_stock_stats_indicators_window(
+            ticker, "rsi", date, 30, False
+        ),
+        "get_stockstats_indicator": lambda: interface.get_stockstats_indicator(
+            ticker, "macd", date, False
+        ),
+        "get_finnhub_news": lambda: interface.get_finnhub_news(ticker, date, 30),
+        "get_finnhub_company_insider_sentiment": lambda: interface.get_finnhub_company_insider_sentiment(
+            ticker, date, 30
+        ),
+        "get_finnhub_company_insider_transactions": lambda: interface.get_finnhub_company_insider_transactions(
+            ticker, date, 30
+        ),
+        "get_simfin_statements": lambda: interface.get_simfin_statements(
+            ticker, "quarterly", date, ["balance_sheet", "cashflow", "income"]
+        ),
+        "get_reddit_global_news": lambda: interface.get_reddit_global_news(date, 3, 2),
+        "get_reddit_company_news": lambda: interface.get_reddit_company_news(ticker, date, 3, 2),
+    }
+
+    rows = []
+    for name, call in calls.items():
+        seconds, result = timed(call, args.repeat)
+        if result is None or len(result) == 0:
+            print(f"warning: {name} returned nothing, check the fixtures", file=sys.stderr)
+        rows.append(summarize(name, seconds))
+    return rows
+
+
+def bench_memory(args, workdir):
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config["memory_dir"] = None
+    memory = FinancialSituationMemory("bench_memory", config, fake_embeddings)
+
+    # fresh texts every round, so the embedding cache never answers
+    rounds = iter(range(1 << 30))
+
+    def situations(count):
+        batch = next(rounds)
+        return [
+            f"round {batch} situation {index}: {args.ticker} rallies on earnings, rates {index % 7} bps"
+            for index in range(count)
+        ]
+
+    rows = []
+    seconds, _ = timed(
+        lambda: memory.add_situations(
+            [(situation, "Hold and rebalance.") for situation in situations(args.memories)]
+        ),
+        args.repeat,
+    )
+    rows.append(summarize(f"add_situations ({args.memories})", seconds))
+
+    seconds, _ = timed(lambda: memory.get_memories(situations(1)[0], n_matches=2), args.repeat)
+    rows.append(summarize("get_memories", seconds))
+
+    seconds, _ = timed(lambda: memory.get_memories_batch(situations(5), n_matches=2), args.repeat)
+    rows.append(summarize("get_memories_batch (5)", seconds))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--scenarios", nargs="+", default=list(SCENARIOS), choices=SCENARIOS
+    )
+    parser.add_argument(
+        "--ticker", default="AAPL", help="ticker of the synthetic data, must be a known company"
+    )
+    parser.add_argument("--date", default="2024-06-03", help="trade date, 2024-01-31..2025-03-25")
+    parser.add_argument("--runs", type=int, default=5, help="propagate runs")
+    parser.add_argument("--repeat", type=int, default=20, help="calls per dataflow and memory operation")
+    parser.add_argument("--memories", type=int, default=500, help="situations added per add_situations call")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the fake LLM takes per call")
+    parser.add_argument("--response-chars", type=int, default=2000, help="length of the fake LLM answers")
+    parser.add_argument("--parallel-analysts", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        build_fixtures(os.path.join(workdir, "data"), [args.ticker], seed=args.seed)
+        # the graph writes its logs under the working directory
+        os.chdir(workdir)
+        try:
+            for scenario in args.scenarios:
+                rows = globals()[f"bench_{scenario}"](args, workdir)
+                results[scenario] = {"timings": rows, "peak_rss_mb": peak_rss_mb()}
+        finally:
+            os.chdir(cwd)
+
+    print(f"{'':<44}{'runs':>6}{'first (ms)':>12}{'p50 (ms)':>12}{'p95 (ms)':>12}")
+    for scenario, result in results.items():
+        peak = result["peak_rss_mb"]
+        print(f"{scenario} (peak RSS {'n/a' if peak is None else f'{peak:.0f} MB'})")
+        for row in result["timings"]:
+            print(
+                f"  {row['name']:<42}{row['runs']:>6}{row['first'] * 1000:>12.2f}"
+                f"{row['p50'] * 1000:>12.2f}{row['p95'] * 1000:>12.2f}"
+            )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark for get_stock_stats_indicators_window.
+
+Compares the previous per-day lookup (one get_stockstats_indicator call, i.e. one
+CSV parse and one full indicator computation, per day in the window) against the
+window engine that loads the prices and computes the indicator once.
+
+Usage:
+    python -m benchmarks.bench_indicator_window [--look-back-days 30] [--repeat 5]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+import tradingagents.dataflows.interface as interface
+from tradingagents.dataflows.config import get_config, set_config
+
+INDICATORS = ["close_50_sma", "close_10_ema", "macd", "rsi", "boll_ub", "atr", "vwma", "mfi"]
+
+
+def write_price_file(data_dir, symbol):
+    """Write ten years of synthetic daily OHLCV in the offline YFin layout."""
+    price_dir = os.path.join(data_dir, "market_data", "price_data")
+    os.makedirs(price_dir, exist_ok=True)
+
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2015-01-02", "2025-03-25")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))
+    pd.DataFrame(
+        {
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Open": close * 0.99,
+            "High": close * 1.01,
+            "Low": close * 0.98,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": rng.integers(1_000_000, 10_000_000, len(dates)),
+        }
+    ).to_csv(
+        os.path.join(price_dir, f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv"),
+        index=False,
+    )
+
+
+def per_day_window(symbol, indicator, curr_date, look_back_days):
+    """The previous implementation: one full indicator computation per trading day."""
+    price_file = os.path.join(
+        get_config()["data_dir"],
+        f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
+    )
+    data = pd.read_csv(price_file)
+    dates_in_df = pd.to_datetime(data["Date"], utc=True).astype(str).str[:10]
+
+    curr_date = datetime.strptime(curr_date, "%Y-%m-%d")
+    before = curr_date - relativedelta(days=look_back_days)
+    ind_string = ""
+    while curr_date >= before:
+        if curr_date.strftime("%Y-%m-%d") in dates_in_df.values:
+            value = interface.get_stockstats_indicator(
+                symbol, indicator, curr_date.strftime("%Y-%m-%d"), False
+            )
+            ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {value}\n"
+        curr_date = curr_date - relativedelta(days=1)
+    return ind_string
+
+
+def time_call(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--look-back-days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--curr-date", default="2024-06-03")
+    args = parser.parse_args()
+
+    symbol = "BENCH"
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_price_file(data_dir, symbol)
+        set_config({"data_dir": data_dir})
+
+        print(f"{'indicator':<14}{'per-day (s)':>14}{'window (s)':>14}{'speedup':>10}")
+        for indicator in INDICATORS:
+            old = time_call(
+                lambda: per_day_window(symbol, indicator, args.curr_date, args.look_back_days),
+                args.repeat,
+            )
+            new = time_call(
+                lambda: interface.get_stock_stats_indicators_window(
+                    symbol, indicator, args.curr_date, args.look_back_days, False
+                ),
+                args.repeat,
+            )
+            print(f"{indicator:<14}{old:>14.4f}{new:>14.4f}{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Micro-benchmark for the insider sentiment/transaction report builders.
+
+Compares the previous list-membership dedup with repeated string
+concatenation against build_unique_entries_report on synthetic Form 4
+filings, for a growing number of filings. The new builder should grow
+linearly; the old one grows quadratically.
+
+Usage:
+    python -m benchmarks.bench_insider_reports [--sizes 1000 2000 4000 8000]
+"""
+
+import argparse
+import random
+import time
+
+from tradingagents.dataflows.interface import build_unique_entries_report
+
+
+def format_transaction(entry):
+    return f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
+
+
+def synthetic_filings(n_filings, seed=0):
+    """Filings spread over dates, with ~20% exact duplicates as finnhub returns them."""
+    rng = random.Random(seed)
+    data = {}
+    for i in range(n_filings):
+        date = f"2024-{1 + (i // 28) % 12:02d}-{1 + i % 28:02d}"
+        if i and rng.random() < 0.2:
+            source = rng.choice(data[rng.choice(list(data))])
+            entry = dict(source)
+        else:
+            entry = {
+                "name": f"Insider {rng.randint(0, 50)}",
+                "share": rng.randint(1, 10**6),
+                "change": rng.randint(-10**5, 10**5),
+                "filingDate": date,
+                "transactionDate": date,
+                "transactionCode": rng.choice("SPMAGF"),
+                "transactionPrice": round(rng.uniform(10, 500), 2),
+                "symbol": "BENCH",
+                "isDerivative": False,
+                "currency": "USD",
+                "id": f"{i:08x}",
+            }
+        data.setdefault(date, []).append(entry)
+    return data
+
+
+def list_dedup_report(data, format_entry):
+    """The previous implementation."""
+    result_str = ""
+    seen_dicts = []
+    for date, senti_list in data.items():
+        for entry in senti_list:
+            if entry not in seen_dicts:
+                result_str += format_entry(entry)
+                seen_dicts.append(entry)
+    return result_str
+
+
+def time_call(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 4000, 8000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'filings':>8}{'list dedup (s)':>16}{'hashed (s)':>12}{'speedup':>10}")
+    for size in args.sizes:
+        data = synthetic_filings(size)
+        assert list_dedup_report(data, format_transaction) == build_unique_entries_report(
+            data, format_transaction
+        )
+        old = time_call(lambda: list_dedup_report(data, format_transaction), args.repeat)
+        new = time_call(
+            lambda: build_unique_entries_report(data, format_transaction), args.repeat
+        )
+        print(f"{size:>8}{old:>16.4f}{new:>12.4f}{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
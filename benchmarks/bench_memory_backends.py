@@ -0,0 +1,85 @@
+"""
+Benchmark of the FinancialSituationMemory vector stores.
+
+Stores random embeddings in every available backend and reports the startup
+time (first construction, including importing the backend's dependencies),
+the insert time, the time to reopen the persisted store as a restarted
+process would, and single and batched query latencies.
+
+Usage:
+    python -m benchmarks.bench_memory_backends [--size 5000] [--dim 1536] [--queries 200]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from tradingagents.agents.utils.memory_backends import MEMORY_BACKENDS
+
+
+def bench_backend(backend_name, size, dim, queries, n_results):
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((size, dim), dtype=np.float32)
+    query_embeddings = rng.standard_normal((queries, dim), dtype=np.float32)
+    ids = [f"{index:08d}" for index in range(size)]
+    texts = [f"situation {index}" for index in range(size)]
+    backend_class = MEMORY_BACKENDS[backend_name]
+
+    with tempfile.TemporaryDirectory() as directory:
+        # first construction includes importing the backend's dependencies
+        start = time.perf_counter()
+        backend = backend_class("bench", "bench", directory)
+        startup = time.perf_counter() - start
+        start = time.perf_counter()
+        backend.upsert(ids, texts, texts, embeddings)
+        insert = time.perf_counter() - start
+
+        # what a restarted process pays to get the stored memories back
+        del backend
+        start = time.perf_counter()
+        backend = backend_class("bench", "bench", directory)
+        reopen = time.perf_counter() - start
+
+        latencies = []
+        for embedding in query_embeddings:
+            start = time.perf_counter()
+            backend.query([embedding], n_results)
+            latencies.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        backend.query(query_embeddings, n_results)
+        batched = time.perf_counter() - start
+        del backend
+
+    print(
+        f"{backend_name:>6}: startup {startup * 1000:8.1f} ms, "
+        f"insert {size} {insert * 1000:8.1f} ms, "
+        f"reopen {reopen * 1000:8.1f} ms, "
+        f"query p50 {statistics.median(latencies) * 1000:7.3f} ms, "
+        f"p95 {np.percentile(latencies, 95) * 1000:7.3f} ms, "
+        f"{queries} batched {batched * 1000:7.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=5000, help="stored situations")
+    parser.add_argument("--dim", type=int, default=1536, help="embedding dimension")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--n-results", type=int, default=2)
+    parser.add_argument(
+        "--backends", nargs="+", default=list(MEMORY_BACKENDS), choices=list(MEMORY_BACKENDS)
+    )
+    args = parser.parse_args()
+
+    for backend_name in args.backends:
+        try:
+            bench_backend(backend_name, args.size, args.dim, args.queries, args.n_results)
+        except ImportError as e:
+            print(f"{backend_name:>6}: skipped ({e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Deterministic stand-ins for the LLM and embedding providers.
+
+FakeChatModel answers like the agents expect without any network access:
+bound to tools it first requests a scripted set of tool calls for the ticker
+and date in its prompt, then writes a report from the tool results; without
+tools it writes an argument ending in a final transaction proposal. The
+response only depends on the prompt, so repeated runs do the same work.
+"""
+
+import asyncio
+import hashlib
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import numpy as np
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, SystemMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+EMBEDDING_DIM = 64
+DECISIONS = ("BUY", "HOLD", "SELL")
+INDICATORS = ("close_50_sma", "macd", "rsi")
+
+_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+# the analyst prompts end with the ticker they look at
+_TICKER = re.compile(r"([A-Z][A-Z0-9.\-]*)\s*$")
+
+
+def scripted_tool_args(name: str, ticker: str, curr_date: str) -> List[Dict[str, Any]]:
+    """Arguments of the calls an analyst makes to the offline tool name."""
+    start = (datetime.strptime(curr_date, "%Y-%m-%d") - timedelta(days=30)).strftime("%Y-%m-%d")
+    script = {
+        "get_YFin_data": [{"symbol": ticker, "start_date": start, "end_date": curr_date}],
+        "get_stockstats_indicators_report": [
+            {"symbol": ticker, "indicator": indicator, "curr_date": curr_date, "look_back_days": 30}
+            for indicator in INDICATORS
+        ],
+        "get_reddit_stock_info": [{"ticker": ticker, "curr_date": curr_date}],
+        "get_finnhub_news": [{"ticker": ticker, "start_date": start, "end_date": curr_date}],
+        "get_reddit_news": [{"curr_date": curr_date}],
+        "get_finnhub_company_insider_sentiment": [{"ticker": ticker, "curr_date": curr_date}],
+        "get_finnhub_company_insider_transactions": [{"ticker": ticker, "curr_date": curr_date}],
+        "get_simfin_statements": [{"ticker": ticker, "freq": "quarterly", "curr_date": curr_date}],
+    }
+    # online tools (Google News, the LLM search tools) are never scripted
+    return script.get(name, [])
+
+
+def _text(message) -> str:
+    content = message.content
+    return content if isinstance(content, str) else " ".join(map(str, content))
+
+
+class FakeChatModel(BaseChatModel):
+    """Offline chat model; ``latency`` seconds per call, about ``response_chars`` per answer."""
+
+    model_name: str = "fake-chat"
+    latency: float = 0.0
+    response_chars: int = 2000
+    tool_names: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "response_chars": self.response_chars}
+
+    def bind_tools(self, tools, **kwargs):
+        return self.model_copy(update={"tool_names": [tool.name for tool in tools]})
+
+    def _tool_calls(self, messages) -> List[Dict[str, Any]]:
+        system = " ".join(_text(m) for m in messages if isinstance(m, SystemMessage))
+        prompt = " ".join(_text(m) for m in messages)
+        dates = _DATE.findall(system) or _DATE.findall(prompt)
+        ticker = _TICKER.search(system)
+        if not dates or ticker is None:
+            return []
+
+        return [
+            {"name": name, "args": args, "id": f"call_{name}_{index}"}
+            for name in self.tool_names
+            for index, args in enumerate(scripted_tool_args(name, ticker.group(1), dates[-1]))
+        ]
+
+    def _pad(self, text: str, digest: str) -> str:
+        filler = f"Observation {digest[:8]}: the synthetic data shows no surprises. "
+        repeat = max(0, self.response_chars - len(text)) // len(filler)
+        return text + filler * repeat
+
+    def _respond(self, messages) -> AIMessage:
+        prompt = "\n".join(_text(m) for m in messages)
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+        if self.tool_names and not isinstance(messages[-1], ToolMessage):
+            tool_calls = self._tool_calls(messages)
+            if tool_calls:
+                message = AIMessage(content="", tool_calls=tool_calls)
+                message.usage_metadata = {
+                    "input_tokens": len(prompt) // 4,
+                    "output_tokens": 20 * len(tool_calls),
+                    "total_tokens": len(prompt) // 4 + 20 * len(tool_calls),
+                }
+                return message
+
+        decision = DECISIONS[int(digest, 16) % len(DECISIONS)]
+        if self.tool_names:
+            results = [m for m in messages if isinstance(m, ToolMessage)]
+            rows = "".join(
+                f"| {m.name} | {len(_text(m))} chars |\n" for m in results
+            )
+            content = self._pad(
+                f"## Report\n\nBased on {len(results)} tool results.\n\n"
+                f"| Source | Size |\n|---|---|\n{rows}\n",
+                digest,
+            ) + f"\n\nRecommendation: **{decision}**"
+        else:
+            content = self._pad(f"Argument {digest[:12]}.\n\n", digest) + (
+                f"\n\nFINAL TRANSACTION PROPOSAL: **{decision}**"
+            )
+
+        message = AIMessage(content=content)
+        message.usage_metadata = {
+            "input_tokens": len(prompt) // 4,
+            "output_tokens": len(content) // 4,
+            "total_tokens": (len(prompt) + len(content)) // 4,
+        }
+        return message
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+
+def fake_embeddings(texts: List[str]) -> List[List[float]]:
+    """Normalized hashed bag of words; texts sharing words are similar."""
+    embeddings = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in re.findall(r"\w+", text.lower()):
+            bucket = int.from_bytes(hashlib.md5(word.encode("utf-8")).digest()[:4], "little")
+            embeddings[row, bucket % EMBEDDING_DIM] += 1.0
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    embeddings /= np.where(norms == 0, 1.0, norms)
+    return embeddings.tolist()
@@ -0,0 +1,200 @@
+"""
+Synthetic offline data for the benchmarks.
+
+build_fixtures writes deterministic price, Finnhub, SimFin and Reddit data in
+the exact layouts the offline dataflows read from ``data_dir``, so the whole
+pipeline can run without the real data set or any network access.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from tradingagents.dataflows.reddit_utils import ticker_to_company
+from tradingagents.dataflows.simfin_utils import SIMFIN_STATEMENTS, simfin_path
+
+# the offline price files always cover this range
+PRICE_START, PRICE_END = "2015-01-01", "2025-03-25"
+
+SIMFIN_ITEMS = {
+    "balance_sheet": ["Cash, Cash Equivalents & Short Term Investments", "Total Assets", "Total Liabilities", "Total Equity"],
+    "cashflow": ["Net Income/Starting Line", "Net Cash from Operating Activities", "Net Cash from Investing Activities", "Net Cash from Financing Activities"],
+    "income": ["Revenue", "Gross Profit", "Operating Income (Loss)", "Net Income"],
+}
+# the tools read at most 2 posts per day, spread over the subreddit files
+COMPANY_SUBREDDITS = ["stocks", "investing"]
+GLOBAL_SUBREDDITS = ["worldnews", "economics"]
+
+
+def company_name(ticker):
+    """The first search term of a ticker, what a post about it would mention."""
+    return ticker_to_company.get(ticker, ticker).split(" OR ")[0].strip()
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def write_prices(data_dir, ticker, rng):
+    price_dir = os.path.join(data_dir, "market_data", "price_data")
+    os.makedirs(price_dir, exist_ok=True)
+
+    dates = pd.bdate_range(PRICE_START, PRICE_END)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, len(dates))))
+    pd.DataFrame(
+        {
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Open": close * (1 + rng.normal(0, 0.003, len(dates))),
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": rng.integers(1_000_000, 50_000_000, len(dates)),
+        }
+    ).round(4).to_csv(
+        os.path.join(price_dir, f"{ticker}-YFin-data-{PRICE_START}-{PRICE_END}.csv"),
+        index=False,
+    )
+
+
+def write_finnhub(data_dir, ticker, days, rng):
+    finnhub_dir = os.path.join(data_dir, "finnhub_data")
+    name = company_name(ticker)
+
+    news = {
+        day: [
+            {
+                "headline": f"{name} headline {index} on {day}",
+                "summary": f"Synthetic summary {index} of {name} ({ticker}) news on {day}.",
+            }
+            for index in range(int(rng.integers(0, 4)))
+        ]
+        for day in days
+    }
+    _write_json(os.path.join(finnhub_dir, "news_data", f"{ticker}_data_formatted.json"), news)
+
+    # monthly sentiment, repeated on every day of the month like the real files
+    sentiment = {
+        day: [
+            {
+                "year": int(day[:4]),
+                "month": int(day[5:7]),
+                "change": int(rng.integers(-50_000, 50_000)),
+                "mspr": round(float(rng.uniform(-100, 100)), 2),
+            }
+        ]
+        for day in days
+    }
+    _write_json(os.path.join(finnhub_dir, "insider_senti", f"{ticker}_data_formatted.json"), sentiment)
+
+    transactions = {}
+    for day in days:
+        if rng.random() < 0.2:
+            change = int(rng.integers(-20_000, 20_000))
+            transactions[day] = [
+                {
+                    "name": f"Insider {int(rng.integers(1, 6))}",
+                    "share": int(rng.integers(10_000, 1_000_000)),
+                    "change": change,
+                    "filingDate": day,
+                    "transactionDate": day,
+                    "transactionPrice": round(float(rng.uniform(50, 250)), 2),
+                    "transactionCode": "S" if change < 0 else "P",
+                }
+            ]
+        else:
+            transactions[day] = []
+    _write_json(os.path.join(finnhub_dir, "insider_trans", f"{ticker}_data_formatted.json"), transactions)
+
+
+def write_simfin(data_dir, tickers, rng):
+    """One ;-separated file per statement and frequency holding every ticker."""
+    periods = {
+        "annual": [(year, "FY", f"{year}-12-31") for year in range(2015, 2025)],
+        "quarterly": [
+            (year, f"Q{quarter}", str(pd.Period(f"{year}Q{quarter}").end_time.date()))
+            for year in range(2015, 2025)
+            for quarter in range(1, 5)
+        ],
+    }
+    for statement in SIMFIN_STATEMENTS:
+        for freq, reports in periods.items():
+            rows = []
+            for simfin_id, ticker in enumerate(tickers, start=1):
+                for year, period, report_date in reports:
+                    publish_date = (pd.Timestamp(report_date) + pd.Timedelta(days=40)).date()
+                    row = {
+                        "Ticker": ticker,
+                        "SimFinId": simfin_id,
+                        "Currency": "USD",
+                        "Fiscal Year": year,
+                        "Fiscal Period": period,
+                        "Report Date": report_date,
+                        "Publish Date": str(publish_date),
+                        "Restated Date": str(publish_date),
+                    }
+                    for item in SIMFIN_ITEMS[statement]:
+                        row[item] = int(rng.integers(-1_000_000, 10_000_000)) * 1000
+                    rows.append(row)
+
+            path = simfin_path(data_dir, statement, freq)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            pd.DataFrame(rows).to_csv(path, sep=";", index=False)
+
+
+def _write_posts(path, posts):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for post in posts:
+            f.write(json.dumps(post) + "\n")
+
+
+def _post(subreddit, day, title, selftext, rng):
+    created = datetime.strptime(day, "%Y-%m-%d").replace(hour=12, tzinfo=timezone.utc)
+    return {
+        "created_utc": int(created.timestamp()),
+        "title": title,
+        "selftext": selftext,
+        "url": f"https://www.reddit.com/r/{subreddit}/{day}/{title.replace(' ', '_')}",
+        "ups": int(rng.integers(0, 5000)),
+    }
+
+
+def write_reddit(data_dir, tickers, days, rng, posts_per_day=3):
+    reddit_dir = os.path.join(data_dir, "reddit_data")
+    for subreddit in COMPANY_SUBREDDITS:
+        posts = [
+            _post(subreddit, day, f"{company_name(ticker)} {subreddit} thread {index}", f"Talking about {ticker} on {day}.", rng)
+            for day in days
+            for ticker in tickers
+            for index in range(posts_per_day)
+        ]
+        _write_posts(os.path.join(reddit_dir, "company_news", f"{subreddit}.jsonl"), posts)
+    for subreddit in GLOBAL_SUBREDDITS:
+        posts = [
+            _post(subreddit, day, f"{subreddit} story {index} of {day}", "" if index % 2 else f"Markets on {day}.", rng)
+            for day in days
+            for index in range(posts_per_day)
+        ]
+        _write_posts(os.path.join(reddit_dir, "global_news", f"{subreddit}.jsonl"), posts)
+
+
+def build_fixtures(data_dir, tickers=("AAPL",), start="2024-01-01", end=PRICE_END, seed=0):
+    """
+    Write the synthetic data set for tickers to data_dir. Prices cover the
+    whole offline range, news, insider data and Reddit posts every day from
+    start to end. The same seed always writes the same data.
+    """
+    rng = np.random.default_rng(seed)
+    days = [day.strftime("%Y-%m-%d") for day in pd.date_range(start, end)]
+    for ticker in tickers:
+        write_prices(data_dir, ticker, rng)
+        write_finnhub(data_dir, ticker, days, rng)
+    write_simfin(data_dir, list(tickers), rng)
+    write_reddit(data_dir, list(tickers), days, rng)
+    return data_dir
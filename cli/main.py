@@ -1,5 +1,6 @@
 from typing import Optional
 import datetime
+import json
 import typer
 from pathlib import Path
 from functools import wraps
@@ -21,6 +22,8 @@ from rich.align import Align
 from rich.rule import Rule
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.batch import BatchJob, BatchRunner, load_jobs
+from tradingagents.graph.profiling import RunProfiler
 from tradingagents.default_config import DEFAULT_CONFIG
 from cli.models import AnalystType
 from cli.utils import *
@@ -516,6 +519,32 @@ def get_analysis_date():
             )
 
 
+def display_run_profile(profile):
+    """Display the wall time, LLM calls and tokens of every graph node."""
+    table = Table(
+        title=f"Run profile ({profile['wall_time']:.1f}s)", box=box.SIMPLE_HEAD
+    )
+    table.add_column("Node")
+    table.add_column("Time", justify="right")
+    table.add_column("LLM calls", justify="right")
+    table.add_column("Tokens in/out", justify="right")
+    table.add_column("Cache hits", justify="right")
+    table.add_column("Cost", justify="right")
+    nodes = sorted(
+        profile["nodes"].items(), key=lambda item: -item[1].get("wall_time", 0)
+    )
+    for node, stats in nodes:
+        table.add_row(
+            node,
+            f"{stats.get('wall_time', 0):.1f}s",
+            str(stats.get("llm_calls", 0)),
+            f"{stats.get('prompt_tokens', 0)}/{stats.get('completion_tokens', 0)}",
+            str(stats.get("cache_hits", 0)),
+            f"${stats.get('cost', 0):.4f}",
+        )
+    console.print(table)
+
+
 def display_complete_report(final_state):
     """Display the complete analysis report with team-based panels."""
     console.print("\n[bold green]Complete Analysis Report[/bold green]\n")
@@ -836,11 +865,15 @@ def run_analysis():
         )
         update_display(layout, spinner_text)
 
-        # Initialize state and get graph args
-        init_agent_state = graph.propagator.create_initial_state(
+        # Initialize state and get graph args; with a checkpointer an
+        # interrupted run of the same ticker and date is resumed
+        init_agent_state, args = graph.prepare_run(
             selections["ticker"], selections["analysis_date"]
         )
-        args = graph.propagator.get_graph_args()
+        profiler = None
+        if config.get("run_profile", True):
+            profiler = RunProfiler(config.get("llm_prices"))
+            args["config"]["callbacks"] = [profiler]
 
         # Stream the analysis
         trace = []
@@ -1076,6 +1109,7 @@ def run_analysis():
 
         # Get final state and decision
         final_state = trace[-1]
+        graph.finish_thread(args)
         decision = graph.process_signal(final_state["final_trade_decision"])
 
         # Update all agent statuses to completed
@@ -1094,13 +1128,120 @@ def run_analysis():
         # Display the complete final report
         display_complete_report(final_state)
 
+        # Save and display where the time and tokens went
+        if profiler is not None:
+            profile = profiler.profile()
+            with open(results_dir / "run_profile.json", "w") as f:
+                json.dump(profile, f, indent=4, ensure_ascii=False)
+            display_run_profile(profile)
+
         update_display(layout)
 
 
+@app.callback(invoke_without_command=True)
+def main(ctx: typer.Context):
+    # keep `python -m cli.main` starting the interactive analysis
+    if ctx.invoked_subcommand is None:
+        run_analysis()
+
+
 @app.command()
 def analyze():
     run_analysis()
 
 
+@app.command()
+def batch(
+    jobs_file: Optional[Path] = typer.Option(
+        None, "--jobs", help="File with one TICKER[,YYYY-MM-DD] per line"
+    ),
+    tickers: Optional[str] = typer.Option(
+        None, "--tickers", help="Comma-separated tickers, e.g. NVDA,AAPL,MSFT"
+    ),
+    date: str = typer.Option(
+        datetime.datetime.now().strftime("%Y-%m-%d"),
+        "--date",
+        help="Analysis date for jobs without one (YYYY-MM-DD)",
+    ),
+    analysts: str = typer.Option(
+        ",".join(analyst.value for analyst in AnalystType),
+        "--analysts",
+        help="Comma-separated analysts: market, social, news, fundamentals",
+    ),
+    workers: int = typer.Option(
+        DEFAULT_CONFIG["batch_max_workers"], "--workers", help="Concurrent jobs"
+    ),
+    research_depth: int = typer.Option(1, "--depth", help="Debate rounds"),
+    llm_provider: str = typer.Option(DEFAULT_CONFIG["llm_provider"], "--llm-provider"),
+    backend_url: str = typer.Option(DEFAULT_CONFIG["backend_url"], "--backend-url"),
+    quick_think_llm: str = typer.Option(DEFAULT_CONFIG["quick_think_llm"], "--quick-llm"),
+    deep_think_llm: str = typer.Option(DEFAULT_CONFIG["deep_think_llm"], "--deep-llm"),
+    parallel_analysts: bool = typer.Option(
+        False, "--parallel-analysts", help="Run the analysts of a job concurrently"
+    ),
+    output: Optional[Path] = typer.Option(
+        None, "--output", help="JSONL file for the results (default: results_dir)"
+    ),
+):
+    """Analyze a list of (ticker, date) jobs with a pool of workers."""
+    if jobs_file is not None:
+        jobs = load_jobs(str(jobs_file), default_date=date)
+    elif tickers:
+        jobs = [
+            BatchJob(ticker.strip().upper(), date)
+            for ticker in tickers.split(",")
+            if ticker.strip()
+        ]
+    else:
+        raise typer.BadParameter("Pass either --jobs or --tickers")
+
+    config = DEFAULT_CONFIG.copy()
+    config["max_debate_rounds"] = research_depth
+    config["max_risk_discuss_rounds"] = research_depth
+    config["quick_think_llm"] = quick_think_llm
+    config["deep_think_llm"] = deep_think_llm
+    config["backend_url"] = backend_url
+    config["llm_provider"] = llm_provider.lower()
+    config["parallel_analysts"] = parallel_analysts
+
+    graph = TradingAgentsGraph(
+        [analyst.strip() for analyst in analysts.split(",")], config=config
+    )
+
+    if output is None:
+        output = Path(config["results_dir"]) / f"batch_{date}.jsonl"
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    console.print(
+        f"Running {len(jobs)} job(s) with {workers} worker(s), results in {output}"
+    )
+
+    decisions = {}
+    with open(output, "a") as f:
+        for done, result in enumerate(BatchRunner(graph, workers).run(jobs), 1):
+            f.write(json.dumps(result.to_record(), ensure_ascii=False) + "\n")
+            f.flush()
+
+            if result.error is not None:
+                status = "[red]ERROR[/red]"
+                decisions["ERROR"] = decisions.get("ERROR", 0) + 1
+            else:
+                status = f"[bold]{result.decision.strip()}[/bold]"
+                decisions[result.decision.strip()] = (
+                    decisions.get(result.decision.strip(), 0) + 1
+                )
+            console.print(
+                f"[{done}/{len(jobs)}] {result.job.ticker} {result.job.trade_date}: "
+                f"{status} ({result.elapsed:.1f}s)"
+            )
+
+    summary = Table(title="Batch summary", box=box.SIMPLE)
+    summary.add_column("Decision")
+    summary.add_column("Jobs", justify="right")
+    for decision, count in sorted(decisions.items()):
+        summary.add_row(decision, str(count))
+    console.print(summary)
+
+
 if __name__ == "__main__":
     app()
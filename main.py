@@ -21,5 +21,10 @@ ta = TradingAgentsGraph(debug=True, config=config)
 _, decision = ta.propagate("NVDA", "2025-07-03")
 print(decision)
 
+# Where the time went; every run is also appended to
+# eval_results/NVDA/TradingAgentsStrategy_logs/run_profiles.jsonl
+for node, stats in ta.last_profile["nodes"].items():
+    print(f"{node}: {stats.get('wall_time', 0):.1f}s, {stats.get('llm_calls', 0)} LLM calls")
+
 # Memorize mistakes and reflect
 # ta.reflect_and_remember(1000) # parameter is the position returns
@@ -0,0 +1,29 @@
+import json
+import os
+import tempfile
+import unittest
+
+from tradingagents.graph.backtest import Backtester
+
+
+class BacktestJournalTest(unittest.TestCase):
+    def test_torn_journal_line_is_cut(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "journal.jsonl")
+            backtester = Backtester(
+                None, ["AAPL"], "2024-01-02", "2024-01-31", journal_path=path
+            )
+            backtester._append_journal({"type": "decision", "ticker": "AAPL"})
+            # a crash during the second append
+            with open(path, "a") as f:
+                f.write('{"type": "refl')
+
+            self.assertEqual(len(backtester._read_journal()), 1)
+            backtester._append_journal({"type": "decision", "ticker": "MSFT"})
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual([record["ticker"] for record in records], ["AAPL", "MSFT"])
+
+
+if __name__ == "__main__":
+    unittest.main()
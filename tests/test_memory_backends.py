@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from tradingagents.agents.utils.memory_backends import NumpyMemoryBackend
+
+
+def embedding(index, dim=4):
+    return np.eye(dim)[index].tolist()
+
+
+class NumpyMemoryBackendRecoveryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.backend = self.open()
+        self.backend.upsert(
+            ["a", "b"], ["sit A", "sit B"], ["rec A", "rec B"], [embedding(0), embedding(1)]
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open(self):
+        return NumpyMemoryBackend("test", "fake", self.tmp.name)
+
+    def path(self, suffix):
+        return os.path.join(self.tmp.name, f"test{suffix}")
+
+    def test_orphaned_vector_is_dropped(self):
+        # a crash after the vector append, before the row append
+        with open(self.path(".f32"), "ab") as f:
+            f.write(np.asarray([embedding(0)], dtype=np.float32).tobytes())
+
+        self.open().upsert(["c"], ["sit C"], ["rec C"], [embedding(2)])
+        backend = self.open()
+        self.assertEqual(backend.count(), 3)
+        self.assertEqual(backend.query([embedding(2)], 1)[0][0][0], "sit C")
+
+    def test_torn_row_is_dropped(self):
+        with open(self.path(".jsonl"), "ab") as f:
+            f.write(b'{"id": "c", "situ')
+
+        backend = self.open()
+        self.assertEqual(backend.count(), 2)
+        backend.upsert(["c"], ["sit C"], ["rec C"], [embedding(2)])
+        self.assertEqual(self.open().query([embedding(2)], 1)[0][0][0], "sit C")
+
+    def test_failed_upsert_can_be_retried(self):
+        with self.assertRaises(ValueError):
+            self.backend.upsert(["c"], ["sit C"], ["rec C"], [[1.0, 0.0]])
+
+        self.backend.upsert(["c"], ["sit C"], ["rec C"], [embedding(2)])
+        self.assertEqual(self.backend.count(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
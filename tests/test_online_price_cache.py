@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from tradingagents.dataflows.online_price_cache import (
+    IncrementalPriceCache,
+    LocalPriceDownloader,
+)
+from tradingagents.dataflows.price_store import read_price_file, resolve_price_file
+
+
+def write_prices(price_dir, symbol, start, end):
+    dates = pd.bdate_range(start, end)
+    close = np.linspace(100, 200, len(dates))
+    pd.DataFrame(
+        {
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Open": close,
+            "High": close,
+            "Low": close,
+            "Close": close,
+            "Volume": 1_000_000,
+        }
+    ).to_csv(os.path.join(price_dir, f"{symbol}-YFin-data-{start}-{end}.csv"), index=False)
+    return len(dates)
+
+
+class FlakyDownloader(LocalPriceDownloader):
+    """Returns no bars for the first ``failures`` calls, like yf.download on a network error."""
+
+    def __init__(self, price_dir, failures):
+        super().__init__(price_dir)
+        self.failures = failures
+
+    def __call__(self, symbol, start=None, end=None, **kwargs):
+        if self.failures > 0:
+            self.failures -= 1
+            self.calls.append((symbol, start, end))
+            return pd.DataFrame()
+        return super().__call__(symbol, start, end, **kwargs)
+
+
+class IncrementalPriceCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.price_dir = os.path.join(self.tmp.name, "prices")
+        os.makedirs(self.price_dir)
+        self.bars = write_prices(self.price_dir, "TEST", "2015-01-01", "2025-03-19")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_failed_cold_start_is_retried_in_full(self):
+        downloader = FlakyDownloader(self.price_dir, failures=1)
+        cache = IncrementalPriceCache(os.path.join(self.tmp.name, "cache"), downloader)
+
+        path = cache.update("TEST", today="2025-03-20")
+        self.assertFalse(os.path.exists(cache._meta_path("TEST")))
+        self.assertFalse(os.path.exists(resolve_price_file(path)))
+
+        cache.update("TEST", today="2025-03-21")
+        # the second call asks for the full history again, not just the last day
+        self.assertEqual(downloader.calls[-1][1:], ("2010-03-21", "2025-03-21"))
+        self.assertEqual(len(read_price_file(resolve_price_file(path))), self.bars)
+
+    def test_empty_incremental_range_is_retried_once_a_day(self):
+        downloader = FlakyDownloader(self.price_dir, failures=0)
+        cache = IncrementalPriceCache(os.path.join(self.tmp.name, "cache"), downloader)
+        path = cache.update("TEST", today="2025-03-17")
+
+        downloader.failures = 1
+        cache.update("TEST", today="2025-03-20")
+        cache.update("TEST", today="2025-03-20")
+        self.assertEqual(len(downloader.calls), 2)
+        self.assertEqual(cache._read_meta("TEST")["end"], "2025-03-17")
+
+        cache.update("TEST", today="2025-03-21")
+        self.assertEqual(downloader.calls[-1][1:], ("2025-03-17", "2025-03-21"))
+        self.assertEqual(cache._read_meta("TEST")["end"], "2025-03-21")
+        self.assertEqual(len(read_price_file(resolve_price_file(path))), self.bars)
+
+    def test_weekend_is_downloaded_once(self):
+        downloader = FlakyDownloader(self.price_dir, failures=0)
+        cache = IncrementalPriceCache(os.path.join(self.tmp.name, "cache"), downloader)
+        cache.update("TEST", today="2025-03-14")
+
+        # Saturday fetches Friday's bar, Sunday and Monday have nothing new
+        for today in ["2025-03-15", "2025-03-15", "2025-03-16", "2025-03-16", "2025-03-17"]:
+            cache.update("TEST", today=today)
+        self.assertEqual(downloader.calls[1:], [("TEST", "2025-03-14", "2025-03-15")])
+        self.assertEqual(cache._read_meta("TEST")["end"], "2025-03-17")
+
+    def test_history_without_bars_is_empty(self):
+        cache = IncrementalPriceCache(
+            os.path.join(self.tmp.name, "cache"), FlakyDownloader(self.price_dir, failures=1)
+        )
+        self.assertTrue(cache.get_history("TEST").frame.empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+from tradingagents.graph.state_log import StateLog
+
+
+class StateLogRecoveryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def check_torn_index_line(self, path):
+        log = StateLog(path)
+        log.append("2024-01-02", {"decision": "BUY"})
+        log.append("2024-01-03", {"decision": "SELL"})
+        # a crash while the second index line was written
+        with open(log.index_path, "r+b") as f:
+            f.truncate(os.path.getsize(log.index_path) - 5)
+
+        log = StateLog(path)
+        self.assertEqual(list(log), ["2024-01-02"])
+        log.append("2024-01-04", {"decision": "HOLD"})
+
+        log = StateLog(path)
+        self.assertEqual(sorted(log), ["2024-01-02", "2024-01-03", "2024-01-04"])
+        self.assertEqual(log["2024-01-03"], {"decision": "SELL"})
+        self.assertEqual(log["2024-01-04"], {"decision": "HOLD"})
+
+    def test_torn_index_line(self):
+        self.check_torn_index_line(os.path.join(self.tmp.name, "states.jsonl"))
+
+    def test_torn_index_line_compressed(self):
+        self.check_torn_index_line(os.path.join(self.tmp.name, "states.jsonl.gz"))
+
+    def test_torn_record(self):
+        path = os.path.join(self.tmp.name, "states.jsonl")
+        log = StateLog(path)
+        log.append("2024-01-02", {"decision": "BUY"})
+        with open(path, "ab") as f:
+            f.write(b'{"date": "2024-01-03", "sta')
+
+        log = StateLog(path)
+        log.append("2024-01-04", {"decision": "HOLD"})
+        self.assertEqual(sorted(StateLog(path)), ["2024-01-02", "2024-01-04"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,12 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
+import asyncio
 import time
 import json
 
 
 def create_fundamentals_analyst(llm, toolkit):
-    def fundamentals_analyst_node(state):
+    def fundamentals_analyst_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state["company_of_interest"]
@@ -18,6 +20,7 @@ def create_fundamentals_analyst(llm, toolkit):
                 toolkit.get_simfin_balance_sheet,
                 toolkit.get_simfin_cashflow,
                 toolkit.get_simfin_income_stmt,
+                toolkit.get_simfin_statements,
                 toolkit.summarize_text, # Add summarize_text tool
             ]
 
@@ -50,8 +53,9 @@ def create_fundamentals_analyst(llm, toolkit):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        return chain
 
+    def fundamentals_analyst_update(state, result):
         report = ""
 
         if len(result.tool_calls) == 0:
@@ -61,11 +65,20 @@ def create_fundamentals_analyst(llm, toolkit):
                 report = result.content
         
         # Summarize the report before returning
-        summarized_report = toolkit.summarize_text(report) # Summarize to 1500 characters
+        summarized_report = toolkit.summarize_report(report)
 
         return {
             "messages": [result],
             "fundamentals_report": summarized_report,
         }
 
-    return fundamentals_analyst_node
+    def fundamentals_analyst_node(state):
+        result = fundamentals_analyst_chain(state).invoke(state["messages"])
+        return fundamentals_analyst_update(state, result)
+
+    async def afundamentals_analyst_node(state):
+        result = await fundamentals_analyst_chain(state).ainvoke(state["messages"])
+        # summarizing the report is a blocking call
+        return await asyncio.to_thread(fundamentals_analyst_update, state, result)
+
+    return RunnableLambda(fundamentals_analyst_node, afunc=afundamentals_analyst_node)
@@ -1,11 +1,13 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
+import asyncio
 import time
 import json
 
 
 def create_market_analyst(llm, toolkit):
 
-    def market_analyst_node(state):
+    def market_analyst_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state["company_of_interest"]
@@ -76,8 +78,9 @@ MACD 相关：
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        return chain
 
+    def market_analyst_update(state, result):
         report = ""
 
         if len(result.tool_calls) == 0:
@@ -87,11 +90,20 @@ MACD 相关：
                 report = result.content
        
         # Summarize the report before returning
-        summarized_report = toolkit.summarize_text(report) # Summarize to 1500 characters
+        summarized_report = toolkit.summarize_report(report)
 
         return {
             "messages": [result],
             "market_report": summarized_report,
         }
 
-    return market_analyst_node
+    def market_analyst_node(state):
+        result = market_analyst_chain(state).invoke(state["messages"])
+        return market_analyst_update(state, result)
+
+    async def amarket_analyst_node(state):
+        result = await market_analyst_chain(state).ainvoke(state["messages"])
+        # summarizing the report is a blocking call
+        return await asyncio.to_thread(market_analyst_update, state, result)
+
+    return RunnableLambda(market_analyst_node, afunc=amarket_analyst_node)
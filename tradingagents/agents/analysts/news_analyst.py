@@ -1,10 +1,12 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
+import asyncio
 import time
 import json
 
 
 def create_news_analyst(llm, toolkit):
-    def news_analyst_node(state):
+    def news_analyst_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
 
@@ -46,8 +48,10 @@ def create_news_analyst(llm, toolkit):
         prompt = prompt.partial(ticker=ticker)
 
         chain = prompt | llm.bind_tools(tools)
-        result = chain.invoke(state["messages"])
 
+        return chain
+
+    def news_analyst_update(state, result):
         report = ""
 
         if len(result.tool_calls) == 0:
@@ -57,7 +61,7 @@ def create_news_analyst(llm, toolkit):
                 report = result.content
         
         # Summarize the report before returning
-        summarized_report = toolkit.summarize_text(report) # Summarize to 1500 characters
+        summarized_report = toolkit.summarize_report(report)
 
         return {
             "messages": [result],
@@ -69,4 +73,13 @@ def create_news_analyst(llm, toolkit):
             "news_report": report,
         }
 
-    return news_analyst_node
+    def news_analyst_node(state):
+        result = news_analyst_chain(state).invoke(state["messages"])
+        return news_analyst_update(state, result)
+
+    async def anews_analyst_node(state):
+        result = await news_analyst_chain(state).ainvoke(state["messages"])
+        # summarizing the report is a blocking call
+        return await asyncio.to_thread(news_analyst_update, state, result)
+
+    return RunnableLambda(news_analyst_node, afunc=anews_analyst_node)
@@ -1,10 +1,12 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
+import asyncio
 import time
 import json
 
 
 def create_social_media_analyst(llm, toolkit):
-    def social_media_analyst_node(state):
+    def social_media_analyst_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state["company_of_interest"]
@@ -46,8 +48,9 @@ def create_social_media_analyst(llm, toolkit):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        return chain
 
+    def social_media_analyst_update(state, result):
         report = ""
 
         if len(result.tool_calls) == 0:
@@ -57,7 +60,7 @@ def create_social_media_analyst(llm, toolkit):
                 report = result.content
         
         # Summarize the report before returning
-        summarized_report = toolkit.summarize_text(report) # Summarize to 1500 characters
+        summarized_report = toolkit.summarize_report(report)
 
         return {
             "messages": [result],
@@ -69,4 +72,13 @@ def create_social_media_analyst(llm, toolkit):
             "sentiment_report": report,
         }
 
-    return social_media_analyst_node
+    def social_media_analyst_node(state):
+        result = social_media_analyst_chain(state).invoke(state["messages"])
+        return social_media_analyst_update(state, result)
+
+    async def asocial_media_analyst_node(state):
+        result = await social_media_analyst_chain(state).ainvoke(state["messages"])
+        # summarizing the report is a blocking call
+        return await asyncio.to_thread(social_media_analyst_update, state, result)
+
+    return RunnableLambda(social_media_analyst_node, afunc=asocial_media_analyst_node)
@@ -1,9 +1,11 @@
+from langchain_core.runnables import RunnableLambda
+import asyncio
 import time
 import json
 
 
 def create_research_manager(llm, memory):
-    def research_manager_node(state) -> dict:
+    def research_manager_prompt(state):
         history = state["investment_debate_state"].get("history", "")
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
@@ -40,7 +42,11 @@ Here are your past reflections on mistakes:
 Here is the debate:
 Debate History:
 {history}"""
-        response = llm.invoke(prompt)
+
+        return prompt
+
+    def research_manager_update(state, response):
+        investment_debate_state = state["investment_debate_state"]
 
         new_investment_debate_state = {
             "judge_decision": response.content,
@@ -56,4 +62,12 @@ Debate History:
             "investment_plan": response.content,
         }
 
-    return research_manager_node
+    def research_manager_node(state) -> dict:
+        return research_manager_update(state, llm.invoke(research_manager_prompt(state)))
+
+    async def aresearch_manager_node(state) -> dict:
+        # the memory lookup embeds the situation with a blocking call
+        prompt = await asyncio.to_thread(research_manager_prompt, state)
+        return research_manager_update(state, await llm.ainvoke(prompt))
+
+    return RunnableLambda(research_manager_node, afunc=aresearch_manager_node)
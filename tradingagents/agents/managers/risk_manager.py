@@ -1,9 +1,11 @@
+from langchain_core.runnables import RunnableLambda
+import asyncio
 import time
 import json
 
 
 def create_risk_manager(llm, memory):
-    def risk_manager_node(state) -> dict:
+    def risk_manager_prompt(state):
 
         company_name = state["company_of_interest"]
 
@@ -33,6 +35,7 @@ Guidelines for Decision-Making:
 Deliverables:
 - A clear and actionable recommendation: Buy, Sell, or Hold.
 - Detailed reasoning anchored in the debate and past reflections.
+- End your response with "FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL**" to confirm your recommendation.
 
 ---
 
@@ -43,7 +46,10 @@ Deliverables:
 
 Focus on actionable insights and continuous improvement. Build on past lessons, critically evaluate all perspectives, and ensure each decision advances better outcomes."""
 
-        response = llm.invoke(prompt)
+        return prompt
+
+    def risk_manager_update(state, response):
+        risk_debate_state = state["risk_debate_state"]
 
         new_risk_debate_state = {
             "judge_decision": response.content,
@@ -63,4 +69,12 @@ Focus on actionable insights and continuous improvement. Build on past lessons,
             "final_trade_decision": response.content,
         }
 
-    return risk_manager_node
+    def risk_manager_node(state) -> dict:
+        return risk_manager_update(state, llm.invoke(risk_manager_prompt(state)))
+
+    async def arisk_manager_node(state) -> dict:
+        # the memory lookup embeds the situation with a blocking call
+        prompt = await asyncio.to_thread(risk_manager_prompt, state)
+        return risk_manager_update(state, await llm.ainvoke(prompt))
+
+    return RunnableLambda(risk_manager_node, afunc=arisk_manager_node)
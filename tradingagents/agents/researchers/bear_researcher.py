@@ -1,10 +1,12 @@
 from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+import asyncio
 import time
 import json
 
 
 def create_bear_researcher(llm, memory):
-    def bear_node(state) -> dict:
+    def bear_prompt(state):
         investment_debate_state = state["investment_debate_state"]
         history = investment_debate_state.get("history", "")
         bear_history = investment_debate_state.get("bear_history", "")
@@ -48,7 +50,12 @@ def create_bear_researcher(llm, memory):
 利用这些信息提出令人信服的看跌论点，反驳看涨方的说法，并参与动态辩论，展示投资该股票的风险和弱点。你还必须处理思考并从过去的经验教训和错误中学习。请用中文输出所有报告内容。
 """
 
-        response = llm.invoke(prompt)
+        return prompt
+
+    def bear_update(state, response):
+        investment_debate_state = state["investment_debate_state"]
+        history = investment_debate_state.get("history", "")
+        bear_history = investment_debate_state.get("bear_history", "")
 
         argument = f"Bear Analyst: {response.content}"
 
@@ -62,4 +69,12 @@ def create_bear_researcher(llm, memory):
 
         return {"investment_debate_state": new_investment_debate_state}
 
-    return bear_node
+    def bear_node(state) -> dict:
+        return bear_update(state, llm.invoke(bear_prompt(state)))
+
+    async def abear_node(state) -> dict:
+        # the memory lookup embeds the situation with a blocking call
+        prompt = await asyncio.to_thread(bear_prompt, state)
+        return bear_update(state, await llm.ainvoke(prompt))
+
+    return RunnableLambda(bear_node, afunc=abear_node)
@@ -1,10 +1,12 @@
 from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+import asyncio
 import time
 import json
 
 
 def create_bull_researcher(llm, memory):
-    def bull_node(state) -> dict:
+    def bull_prompt(state):
         investment_debate_state = state["investment_debate_state"]
         history = investment_debate_state.get("history", "")
         bull_history = investment_debate_state.get("bull_history", "")
@@ -46,7 +48,12 @@ def create_bull_researcher(llm, memory):
 利用这些信息提出令人信服的看涨论点，反驳看跌方的担忧，并参与动态辩论，展示看涨立场的优势。你还必须处理思考并从过去的经验教训和错误中学习。请用中文输出所有报告内容。
 """
 
-        response = llm.invoke(prompt)
+        return prompt
+
+    def bull_update(state, response):
+        investment_debate_state = state["investment_debate_state"]
+        history = investment_debate_state.get("history", "")
+        bull_history = investment_debate_state.get("bull_history", "")
 
         argument = f"Bull Analyst: {response.content}"
 
@@ -60,4 +67,12 @@ def create_bull_researcher(llm, memory):
 
         return {"investment_debate_state": new_investment_debate_state}
 
-    return bull_node
+    def bull_node(state) -> dict:
+        return bull_update(state, llm.invoke(bull_prompt(state)))
+
+    async def abull_node(state) -> dict:
+        # the memory lookup embeds the situation with a blocking call
+        prompt = await asyncio.to_thread(bull_prompt, state)
+        return bull_update(state, await llm.ainvoke(prompt))
+
+    return RunnableLambda(bull_node, afunc=abull_node)
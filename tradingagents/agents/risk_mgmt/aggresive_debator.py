@@ -1,9 +1,11 @@
+from langchain_core.runnables import RunnableLambda
+import asyncio
 import time
 import json
 
 
 def create_risky_debator(llm):
-    def risky_node(state) -> dict:
+    def risky_prompt(state):
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
         risky_history = risk_debate_state.get("risky_history", "")
@@ -32,7 +34,12 @@ def create_risky_debator(llm):
 
 积极参与，解决提出的任何具体担忧，驳斥他们逻辑中的弱点，并主张冒险的好处，以超越市场规范。保持专注于辩论和说服，而不仅仅是呈现数据。挑战每一个反驳点，以强调为什么高风险方法是最佳选择。请用中文以对话形式输出，无需任何特殊格式。"""
 
-        response = llm.invoke(prompt)
+        return prompt
+
+    def risky_update(state, response):
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        risky_history = risk_debate_state.get("risky_history", "")
 
         argument = f"Risky Analyst: {response.content}"
 
@@ -52,4 +59,11 @@ def create_risky_debator(llm):
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return risky_node
+    def risky_node(state) -> dict:
+        return risky_update(state, llm.invoke(risky_prompt(state)))
+
+    async def arisky_node(state) -> dict:
+        prompt = risky_prompt(state)
+        return risky_update(state, await llm.ainvoke(prompt))
+
+    return RunnableLambda(risky_node, afunc=arisky_node)
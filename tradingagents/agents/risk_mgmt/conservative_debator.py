@@ -1,10 +1,12 @@
 from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+import asyncio
 import time
 import json
 
 
 def create_safe_debator(llm):
-    def safe_node(state) -> dict:
+    def safe_prompt(state):
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
         safe_history = risk_debate_state.get("safe_history", "")
@@ -33,7 +35,12 @@ def create_safe_debator(llm):
 
 通过质疑他们的乐观情绪并强调他们可能忽略的潜在缺点来参与。回应他们的每一个反驳点，以展示为什么保守立场最终是公司资产最安全的路径。专注于辩论和批判他们的论点，以证明低风险策略相对于他们的方法的优势。请用中文以对话形式输出，无需任何特殊格式。"""
 
-        response = llm.invoke(prompt)
+        return prompt
+
+    def safe_update(state, response):
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        safe_history = risk_debate_state.get("safe_history", "")
 
         argument = f"Safe Analyst: {response.content}"
 
@@ -55,4 +62,11 @@ def create_safe_debator(llm):
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return safe_node
+    def safe_node(state) -> dict:
+        return safe_update(state, llm.invoke(safe_prompt(state)))
+
+    async def asafe_node(state) -> dict:
+        prompt = safe_prompt(state)
+        return safe_update(state, await llm.ainvoke(prompt))
+
+    return RunnableLambda(safe_node, afunc=asafe_node)
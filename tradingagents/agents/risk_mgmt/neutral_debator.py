@@ -1,9 +1,11 @@
+from langchain_core.runnables import RunnableLambda
+import asyncio
 import time
 import json
 
 
 def create_neutral_debator(llm):
-    def neutral_node(state) -> dict:
+    def neutral_prompt(state):
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
         neutral_history = risk_debate_state.get("neutral_history", "")
@@ -32,7 +34,12 @@ def create_neutral_debator(llm):
 
 通过批判性地分析双方，解决激进和保守论点中的弱点，积极参与，以倡导更平衡的方法。挑战他们的每一个观点，以说明为什么中等风险策略可能提供两全其美的最佳选择，在提供增长潜力的同时防范极端波动。专注于辩论而不是简单地呈现数据，旨在表明平衡的观点可以带来最可靠的结果。请用中文以对话形式输出，无需任何特殊格式。"""
 
-        response = llm.invoke(prompt)
+        return prompt
+
+    def neutral_update(state, response):
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        neutral_history = risk_debate_state.get("neutral_history", "")
 
         argument = f"Neutral Analyst: {response.content}"
 
@@ -52,4 +59,11 @@ def create_neutral_debator(llm):
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return neutral_node
+    def neutral_node(state) -> dict:
+        return neutral_update(state, llm.invoke(neutral_prompt(state)))
+
+    async def aneutral_node(state) -> dict:
+        prompt = neutral_prompt(state)
+        return neutral_update(state, await llm.ainvoke(prompt))
+
+    return RunnableLambda(neutral_node, afunc=aneutral_node)
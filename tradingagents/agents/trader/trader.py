@@ -1,10 +1,12 @@
+from langchain_core.runnables import RunnableLambda
+import asyncio
 import functools
 import time
 import json
 
 
 def create_trader(llm, memory):
-    def trader_node(state, name):
+    def trader_messages(state):
         company_name = state["company_of_interest"]
         investment_plan = state["investment_plan"]
         market_research_report = state["market_report"]
@@ -32,12 +34,24 @@ def create_trader(llm, memory):
             context,
         ]
 
-        result = llm.invoke(messages)
+        return messages
 
+    def trader_update(state, result, name):
         return {
             "messages": [result],
             "trader_investment_plan": result.content,
             "sender": name,
         }
 
-    return functools.partial(trader_node, name="Trader")
+    def trader_node(state, name):
+        return trader_update(state, llm.invoke(trader_messages(state)), name)
+
+    async def atrader_node(state, name):
+        # the memory lookup embeds the situation with a blocking call
+        messages = await asyncio.to_thread(trader_messages, state)
+        return trader_update(state, await llm.ainvoke(messages), name)
+
+    return RunnableLambda(
+        functools.partial(trader_node, name="Trader"),
+        afunc=functools.partial(atrader_node, name="Trader"),
+    )
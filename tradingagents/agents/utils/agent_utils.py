@@ -10,8 +10,8 @@ import pandas as pd
 import os
 from dateutil.relativedelta import relativedelta
 from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
 import tradingagents.dataflows.interface as interface
+from tradingagents.agents.utils.summarizer import ReportSummarizer, llm_summary
 from tradingagents.default_config import DEFAULT_CONFIG
 from langchain_core.messages import HumanMessage
 
@@ -48,6 +48,14 @@ class Toolkit:
     def __init__(self, config=None):
         if config:
             self.update_config(config)
+        self.report_summarizer = ReportSummarizer(
+            self._config.get("report_summary_strategy", "extractive"),
+            self._config.get("report_summary_max_length", 1500),
+        )
+
+    def summarize_report(self, report: str) -> str:
+        """Shorten an analyst's final report (see report_summary_* in the config)."""
+        return self.report_summarizer.summarize(report)
 
     @staticmethod
     @tool
@@ -342,6 +350,37 @@ class Toolkit:
 
         return data_income_stmt
 
+    @staticmethod
+    @tool
+    def get_simfin_statements(
+        ticker: Annotated[str, "ticker symbol"],
+        freq: Annotated[
+            str,
+            "reporting frequency of the company's financial history: annual/quarterly",
+        ],
+        curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+        statements: Annotated[
+            List[str],
+            "statements to fetch, any of: balance_sheet, cashflow, income",
+        ] = ["balance_sheet", "cashflow", "income"],
+    ):
+        """
+        Retrieve several of the most recent financial statements of a company in one call
+        Args:
+            ticker (str): ticker symbol of the company
+            freq (str): reporting frequency of the company's financial history: annual / quarterly
+            curr_date (str): current date you are trading at, yyyy-mm-dd
+            statements (List[str]): statements to fetch, any of: balance_sheet, cashflow, income
+        Returns:
+                str: a report of the company's most recent requested statements
+        """
+
+        data_statements = interface.get_simfin_statements(
+            ticker, freq, curr_date, statements
+        )
+
+        return data_statements
+
     @staticmethod
     @tool
     def get_google_news(
@@ -433,51 +472,8 @@ class Toolkit:
         Returns:
             str: The summarized text.
         """
-        config = Toolkit._config  # Access class-level config
-        llm_provider = config["llm_provider"].lower()
-        backend_url = config["backend_url"]
-        quick_think_llm = config["quick_think_llm"]
-        llm_timeout = config.get("llm_timeout")
-        proxies = config.get("proxies")
-
-        prompt_text = f"Summarize the following text concisely, keeping it under {max_length} characters:\n\n{text}"
-
-        if llm_provider == "google":
-            client = ChatGoogleGenerativeAI(model=quick_think_llm, timeout=llm_timeout)
-            response = client.invoke(prompt_text)
-            summary = response.content
-        elif llm_provider == "openai" or llm_provider == "ollama" or llm_provider == "openrouter":
-            if proxies:
-                client = OpenAI(base_url=backend_url, http_client=httpx.Client(proxies=proxies))
-            else:
-                client = OpenAI(base_url=backend_url)
-            
-            response = client.responses.create(
-                model=quick_think_llm,
-                input=[
-                    {
-                        "role": "system",
-                        "content": [
-                            {
-                                "type": "input_text",
-                                "text": prompt_text,
-                            }
-                        ],
-                    }
-                ],
-                text={"format": {"type": "text"}},
-                reasoning={},
-                temperature=0.7,
-                max_output_tokens=max_length, # Use max_length for output tokens
-                top_p=1,
-                store=True,
-            )
-            summary = response.output[1].content[0].text
-        else:
-            raise ValueError(f"Unsupported LLM provider for summarization: {llm_provider}")
-        
-        # Ensure the summary does not exceed max_length
-        if len(summary) > max_length:
-            summary = summary[:max_length] + "..."
-            
-        return summary
+        # nothing to do for text that already fits
+        if len(text) <= max_length:
+            return text
+
+        return llm_summary(text, max_length)
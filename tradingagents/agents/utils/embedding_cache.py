@@ -0,0 +1,129 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from tradingagents.dataflows.config import get_config
+
+
+class EmbeddingCache:
+    """
+    Process-wide cache of embeddings keyed by a hash of (model, text).
+
+    The researchers, managers, trader and reflector all embed the same
+    situation text in every run; with the cache only the first of them pays
+    for the request. Embeddings live in an in-memory LRU of ``max_entries``
+    float32 vectors and, when ``path`` is set, in a SQLite file that keeps
+    them across processes.
+    """
+
+    def __init__(self, max_entries: int = 4096, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._conn = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings "
+                    "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+                )
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """The cached embedding of every text, None where there is none."""
+        results = []
+        with self._lock:
+            for text in texts:
+                key = self.key(model, text)
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                elif self._conn is not None:
+                    row = self._conn.execute(
+                        "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None:
+                        vector = np.frombuffer(row[0], dtype=np.float32)
+                        self._remember(key, vector)
+                        self.disk_hits += 1
+
+                if vector is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    results.append(vector.tolist())
+        return results
+
+    def put_many(
+        self, model: str, texts: Sequence[str], embeddings: Sequence[Sequence[float]]
+    ) -> None:
+        with self._lock:
+            rows = []
+            for text, embedding in zip(texts, embeddings):
+                key = self.key(model, text)
+                vector = np.asarray(embedding, dtype=np.float32)
+                self._remember(key, vector)
+                rows.append((key, vector.tobytes()))
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings VALUES (?, ?)", rows
+                    )
+
+    def clear(self) -> None:
+        """Drop the in-memory tier; the disk tier is kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Return the process-wide embedding cache, creating it from the config."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                config = get_config()
+                _embedding_cache = EmbeddingCache(
+                    config.get("embedding_cache_max_entries", 4096),
+                    config.get("embedding_cache_path"),
+                )
+    return _embedding_cache
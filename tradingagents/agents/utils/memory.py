@@ -1,19 +1,43 @@
-import chromadb
-from chromadb.config import Settings
-from openai import OpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
-import httpx
+import hashlib
+import json
+import time
+
+from langchain_core.callbacks import dispatch_custom_event
+
+from tradingagents.dataflows.clients import get_client_registry
+from tradingagents.agents.utils.embedding_cache import get_embedding_cache
+from tradingagents.agents.utils.memory_backends import create_memory_backend
+
+# the OpenAI embeddings endpoint accepts at most this many inputs per request
+EMBEDDING_BATCH_SIZE = 2048
+
+# custom callback event sent for every get_embeddings call inside a graph run
+EMBEDDING_EVENT = "embeddings"
+
+
+def _situation_id(situation, recommendation):
+    # content-addressed, so adding the same memory twice (e.g. replaying a
+    # backtest journal into a persistent memory) does not duplicate it
+    return hashlib.sha256(
+        json.dumps([situation, recommendation], ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
 
 
 class FinancialSituationMemory:
-    def __init__(self, name, config):
+    def __init__(self, name, config, embedding_func=None):
+        """embedding_func(texts) -> embeddings replaces the provider's embedding
+        client, e.g. for offline runs; its __name__ identifies the model."""
         self.config = config
         self.llm_provider = config.get("llm_provider", "openai").lower()
         self.backend_url = config.get("backend_url")
         self.proxies = config.get("proxies")
         self.llm_timeout = config.get("llm_timeout")
 
-        if self.llm_provider == "google":
+        if embedding_func is not None:
+            self.embedding_model = getattr(embedding_func, "__name__", "custom")
+            self.client = None
+            self.get_embeddings_func = embedding_func
+        elif self.llm_provider == "google":
             self.embedding_model = "gemini-embedding-exp-03-07"
             # For Google embeddings, we use the direct google.generativeai client
             import google.generativeai as genai
@@ -21,87 +45,164 @@ class FinancialSituationMemory:
             # If proxies are set, rely on environment variables for genai to pick them up
             # as genai client doesn't directly take httpx.Client or proxies parameter.
             self.client = genai # Assign the genai module as the client
-            self.get_embedding_func = self._get_google_embedding
+            self.get_embeddings_func = self._get_google_embeddings
         else: # Default to OpenAI or other compatible
             if self.backend_url == "http://localhost:11434/v1":
                 self.embedding_model = "nomic-embed-text"
             else:
                 self.embedding_model = "text-embedding-3-small"
             
-            if self.proxies:
-                self.client = OpenAI(base_url=self.backend_url, http_client=httpx.Client(proxies=self.proxies))
-            else:
-                self.client = OpenAI(base_url=self.backend_url)
-            self.get_embedding_func = self._get_openai_embedding
-            
-        self.chroma_client = chromadb.Client(Settings(allow_reset=True))
-        self.situation_collection = self.chroma_client.create_collection(name=name)
+            self.client = get_client_registry().openai_client(
+                self.llm_provider, self.backend_url, self.proxies, self.llm_timeout
+            )
+            self.get_embeddings_func = self._get_openai_embeddings
 
-    def _get_openai_embedding(self, text):
-        """Get OpenAI embedding for a text"""
-        response = self.client.embeddings.create(
-            model=self.embedding_model, input=text
-        )
-        return response.data[0].embedding
+        # vector store (see memory_backends), persistent when memory_dir is set
+        self.backend = create_memory_backend(name, config, self.embedding_model)
 
-    def _get_google_embedding(self, text):
-        """Get Google embedding for a text"""
+    def _get_openai_embeddings(self, texts):
+        """Get OpenAI embeddings for texts, batched into as few requests as possible"""
+        embeddings = []
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            response = self.client.embeddings.create(
+                model=self.embedding_model,
+                input=texts[start : start + EMBEDDING_BATCH_SIZE],
+            )
+            embeddings.extend(item.embedding for item in response.data)
+        return embeddings
+
+    def _get_google_embeddings(self, texts):
+        """Get Google embeddings for texts in one request"""
         # Use google.generativeai.embed_content directly
         response = self.client.embed_content(
             model=self.embedding_model,
-            content=text,
+            content=texts,
             task_type="RETRIEVAL_DOCUMENT"
         )
         return response['embedding']
 
+    def get_embeddings(self, texts):
+        """Get embeddings for a list of texts, requesting only those not in the embedding cache"""
+        texts = list(texts)
+        if not texts:
+            return []
+
+        cache = get_embedding_cache()
+        model = f"{self.llm_provider}:{self.backend_url}:{self.embedding_model}"
+        embeddings = cache.get_many(model, texts)
+
+        missing = list(
+            dict.fromkeys(
+                text for text, embedding in zip(texts, embeddings) if embedding is None
+            )
+        )
+        started = time.perf_counter()
+        if missing:
+            fresh = dict(zip(missing, self.get_embeddings_func(missing)))
+            cache.put_many(model, missing, [fresh[text] for text in missing])
+            embeddings = [
+                fresh[text] if embedding is None else embedding
+                for text, embedding in zip(texts, embeddings)
+            ]
+
+        try:
+            dispatch_custom_event(
+                EMBEDDING_EVENT,
+                {
+                    "texts": len(texts),
+                    "requested": len(missing),
+                    "seconds": time.perf_counter() - started,
+                },
+            )
+        except RuntimeError:
+            pass  # not inside a graph run, nobody is listening
+        return embeddings
+
     def get_embedding(self, text):
         """Get embedding for a text using the selected client"""
-        return self.get_embedding_func(text)
+        return self.get_embeddings([text])[0]
 
-    def add_situations(self, situations_and_advice):
-        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
+    def add_situations(self, situations_and_advice, embeddings=None):
+        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec).
+        The situations are embedded in one batch unless their embeddings are given."""
 
-        situations = []
-        advice = []
-        ids = []
-        embeddings = []
+        if not situations_and_advice:
+            return
 
-        offset = self.situation_collection.count()
+        situations = [situation for situation, _ in situations_and_advice]
+        advice = [recommendation for _, recommendation in situations_and_advice]
+        if embeddings is None:
+            embeddings = self.get_embeddings(situations)
 
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
-            situations.append(situation)
-            advice.append(recommendation)
-            ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+        self.backend.upsert(
+            [_situation_id(sit, rec) for sit, rec in situations_and_advice],
+            situations,
+            advice,
+            embeddings,
+        )
+
+    def export_memories(self, path):
+        """Write every memory with its embedding as one JSON line to path. Returns the count."""
+        situations, recommendations, embeddings = self.backend.records()
+        with open(path, "w", encoding="utf-8") as f:
+            for situation, recommendation, embedding in zip(
+                situations, recommendations, embeddings
+            ):
+                f.write(
+                    json.dumps(
+                        {
+                            "situation": situation,
+                            "recommendation": recommendation,
+                            "embedding_model": self.embedding_model,
+                            "embedding": [float(value) for value in embedding],
+                        },
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                )
+        return len(situations)
+
+    def import_memories(self, path):
+        """Add the memories of an export file. Stored embeddings of the same model
+        are reused, the others are embedded in one batch. Returns the count."""
+        with open(path, "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+
+        reusable, missing = [], []
+        for record in records:
+            if record.get("embedding") and record.get("embedding_model") == self.embedding_model:
+                reusable.append(record)
+            else:
+                missing.append(record)
 
-        self.situation_collection.add(
-            documents=situations,
-            metadatas=[{"recommendation": rec} for rec in advice],
-            embeddings=embeddings,
-            ids=ids,
+        self.add_situations(
+            [(record["situation"], record["recommendation"]) for record in reusable],
+            embeddings=[record["embedding"] for record in reusable],
+        )
+        self.add_situations(
+            [(record["situation"], record["recommendation"]) for record in missing]
         )
+        return len(records)
 
     def get_memories(self, current_situation, n_matches=1):
         """Find matching recommendations using OpenAI embeddings"""
-        query_embedding = self.get_embedding(current_situation)
+        return self.get_memories_batch([current_situation], n_matches)[0]
 
-        results = self.situation_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_matches,
-            include=["metadatas", "documents", "distances"],
-        )
+    def get_memories_batch(self, current_situations, n_matches=1):
+        """get_memories for several situations, embedded and queried together"""
+        query_embeddings = self.get_embeddings(current_situations)
 
-        matched_results = []
-        for i in range(len(results["documents"][0])):
-            matched_results.append(
+        return [
+            [
                 {
-                    "matched_situation": results["documents"][0][i],
-                    "recommendation": results["metadatas"][0][i]["recommendation"],
-                    "similarity_score": 1 - results["distances"][0][i],
+                    "matched_situation": situation,
+                    "recommendation": recommendation,
+                    "similarity_score": score,
                 }
-            )
-
-        return matched_results
+                for situation, recommendation, score in matches
+            ]
+            for matches in self.backend.query(query_embeddings, n_matches)
+        ]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,288 @@
+"""
+Vector stores behind FinancialSituationMemory.
+
+NumpyMemoryBackend (the default) keeps the normalized embeddings of one
+memory in a contiguous float32 matrix and answers queries with one matrix
+product and an argpartition top-k. With a directory it persists append-only
+files that are memory-mapped on load. ChromaMemoryBackend keeps the previous
+chromadb-based store and needs chromadb installed.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# (matched situation, recommendation, similarity score)
+Match = Tuple[str, str, float]
+
+
+class MemoryBackend:
+    """Store of (situation, recommendation, embedding) rows under content ids."""
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        situations: Sequence[str],
+        recommendations: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+    ) -> None:
+        raise NotImplementedError
+
+    def query(
+        self, embeddings: Sequence[Sequence[float]], n_results: int
+    ) -> List[List[Match]]:
+        """The n_results best matches of every query embedding, best first."""
+        raise NotImplementedError
+
+    def records(self) -> Tuple[List[str], List[str], List[List[float]]]:
+        """Every stored (situations, recommendations, embeddings)."""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+
+def _check_embedding_model(name, directory, stored_model, embedding_model):
+    if stored_model is not None and stored_model != embedding_model:
+        raise ValueError(
+            f"Memory {name} in {directory} was embedded with {stored_model}, "
+            f"not {embedding_model}"
+        )
+
+
+class NumpyMemoryBackend(MemoryBackend):
+    """
+    In-process index of normalized float32 embeddings; similarity is cosine.
+
+    Ids are content hashes, so an id that is already stored is skipped and
+    the files under ``directory`` can be append-only:
+    ``<name>.jsonl`` (one row per line), ``<name>.f32`` (raw vectors) and
+    ``<name>.meta.json`` (embedding model and dimension).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        embedding_model: str,
+        directory: Optional[str] = None,
+    ):
+        self.name = name
+        self.embedding_model = embedding_model
+        self.directory = directory
+        self._ids: Dict[str, int] = {}
+        self._situations: List[str] = []
+        self._recommendations: List[str] = []
+        self._vectors: Optional[np.ndarray] = None  # capacity x dim, first count() rows used
+        self._lock = threading.Lock()
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load()
+
+    def _path(self, suffix: str) -> str:
+        return os.path.join(self.directory, f"{self.name}{suffix}")
+
+    def _load(self) -> None:
+        if not os.path.exists(self._path(".meta.json")):
+            return
+
+        with open(self._path(".meta.json"), "r") as f:
+            meta = json.load(f)
+        _check_embedding_model(
+            self.name, self.directory, meta["embedding_model"], self.embedding_model
+        )
+
+        rows, row_ends = [], [0]
+        with open(self._path(".jsonl"), "a+b") as f:
+            f.seek(0)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn by a crash during the append
+                rows.append(json.loads(line))
+                row_ends.append(f.tell())
+        # a crash between or during the appends may leave one side longer; cut
+        # both to the rows they share so later appends stay aligned
+        dim = meta["dim"]
+        with open(self._path(".f32"), "a+b") as f:
+            count = min(len(rows), f.seek(0, os.SEEK_END) // (4 * dim))
+            f.truncate(4 * dim * count)
+        with open(self._path(".jsonl"), "r+b") as f:
+            f.truncate(row_ends[count])
+        if count == 0:
+            return
+        vectors = np.memmap(self._path(".f32"), dtype=np.float32, mode="r")
+        self._vectors = vectors.reshape(count, dim)
+
+        for row in rows[:count]:
+            self._ids[row["id"]] = len(self._situations)
+            self._situations.append(row["situation"])
+            self._recommendations.append(row["recommendation"])
+
+    def _append(self, count: int, vectors: np.ndarray) -> None:
+        if self._vectors is None:
+            self._vectors = np.empty((max(len(vectors), 64), vectors.shape[1]), np.float32)
+        elif count + len(vectors) > len(self._vectors) or not self._vectors.flags.writeable:
+            # grow geometrically; a memory-mapped matrix is copied on first write
+            capacity = max(2 * len(self._vectors), count + len(vectors))
+            grown = np.empty((capacity, self._vectors.shape[1]), np.float32)
+            grown[:count] = self._vectors[:count]
+            self._vectors = grown
+        self._vectors[count : count + len(vectors)] = vectors
+
+    def upsert(self, ids, situations, recommendations, embeddings) -> None:
+        with self._lock:
+            new, seen = [], set()
+            for index, memory_id in enumerate(ids):
+                if memory_id not in self._ids and memory_id not in seen:
+                    seen.add(memory_id)
+                    new.append(index)
+            if not new:
+                return
+
+            vectors = np.asarray(embeddings, dtype=np.float32)[new]
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1, norms)
+            self._append(len(self._situations), vectors)
+
+            rows = []
+            for index in new:
+                self._ids[ids[index]] = len(self._situations)
+                self._situations.append(situations[index])
+                self._recommendations.append(recommendations[index])
+                rows.append(
+                    {
+                        "id": ids[index],
+                        "situation": situations[index],
+                        "recommendation": recommendations[index],
+                    }
+                )
+
+            if self.directory:
+                if not os.path.exists(self._path(".meta.json")):
+                    with open(self._path(".meta.json"), "w") as f:
+                        json.dump(
+                            {"embedding_model": self.embedding_model, "dim": vectors.shape[1]},
+                            f,
+                        )
+                with open(self._path(".f32"), "ab") as f:
+                    f.write(vectors.tobytes())
+                with open(self._path(".jsonl"), "a", encoding="utf-8") as f:
+                    for row in rows:
+                        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def query(self, embeddings, n_results) -> List[List[Match]]:
+        with self._lock:
+            count = len(self._situations)
+            if count == 0:
+                return [[] for _ in embeddings]
+            matrix = self._vectors[:count]
+
+        queries = np.asarray(embeddings, dtype=np.float32)
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        # (queries x count) cosine similarities in one product
+        scores = queries @ matrix.T
+
+        k = min(n_results, count)
+        if k < count:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(count), (len(queries), count))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+
+        return [
+            [
+                (self._situations[row], self._recommendations[row], float(scores[query, row]))
+                for row in top[query]
+            ]
+            for query in range(len(queries))
+        ]
+
+    def records(self):
+        with self._lock:
+            count = len(self._situations)
+            vectors = [] if count == 0 else self._vectors[:count].tolist()
+            return list(self._situations), list(self._recommendations), vectors
+
+    def count(self) -> int:
+        return len(self._situations)
+
+
+class ChromaMemoryBackend(MemoryBackend):
+    """chromadb collection; persistent with a directory, in-process otherwise."""
+
+    def __init__(
+        self,
+        name: str,
+        embedding_model: str,
+        directory: Optional[str] = None,
+    ):
+        import chromadb
+        from chromadb.config import Settings
+
+        if directory:
+            client = chromadb.PersistentClient(
+                path=directory, settings=Settings(allow_reset=True)
+            )
+            self.collection = client.get_or_create_collection(
+                name=name, metadata={"embedding_model": embedding_model}
+            )
+            _check_embedding_model(
+                name,
+                directory,
+                (self.collection.metadata or {}).get("embedding_model"),
+                embedding_model,
+            )
+        else:
+            client = chromadb.Client(Settings(allow_reset=True))
+            self.collection = client.create_collection(name=name)
+
+    def upsert(self, ids, situations, recommendations, embeddings) -> None:
+        self.collection.upsert(
+            documents=list(situations),
+            metadatas=[{"recommendation": rec} for rec in recommendations],
+            embeddings=[list(embedding) for embedding in embeddings],
+            ids=list(ids),
+        )
+
+    def query(self, embeddings, n_results) -> List[List[Match]]:
+        results = self.collection.query(
+            query_embeddings=[list(embedding) for embedding in embeddings],
+            n_results=n_results,
+            include=["metadatas", "documents", "distances"],
+        )
+        return [
+            [
+                (document, metadata["recommendation"], 1 - distance)
+                for document, metadata, distance in zip(documents, metadatas, distances)
+            ]
+            for documents, metadatas, distances in zip(
+                results["documents"], results["metadatas"], results["distances"]
+            )
+        ]
+
+    def records(self):
+        records = self.collection.get(include=["documents", "metadatas", "embeddings"])
+        return (
+            list(records["documents"]),
+            [metadata["recommendation"] for metadata in records["metadatas"]],
+            [[float(value) for value in embedding] for embedding in records["embeddings"]],
+        )
+
+    def count(self) -> int:
+        return self.collection.count()
+
+
+MEMORY_BACKENDS = {"numpy": NumpyMemoryBackend, "chroma": ChromaMemoryBackend}
+
+
+def create_memory_backend(name: str, config: Dict, embedding_model: str) -> MemoryBackend:
+    """The backend named by config["memory_backend"], persistent under config["memory_dir"]."""
+    backend = config.get("memory_backend", "numpy")
+    if backend not in MEMORY_BACKENDS:
+        raise ValueError(f"Unsupported memory backend: {backend}")
+    return MEMORY_BACKENDS[backend](name, embedding_model, config.get("memory_dir"))
@@ -0,0 +1,223 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Annotated, List, Optional
+
+from tradingagents.dataflows.clients import get_client_registry
+from tradingagents.dataflows.config import get_config
+from tradingagents.dataflows.llm_cache import memoize
+
+SUMMARY_STRATEGIES = ("extractive", "llm", "auto")
+
+_HEADER = re.compile(r"^\s{0,3}#{1,6}\s")
+# split after CJK / western sentence ends; a "." only counts before whitespace
+# so that numbers like 3.5 stay whole
+_SENTENCE_END = re.compile(r"(?<=[。！？!?])|(?<=\.)(?=\s)")
+
+
+@memoize("summarize_text")
+def llm_summary(
+    text: Annotated[str, "The text to summarize"],
+    max_length: Annotated[int, "Maximum length of the summary in characters"] = 1500,
+) -> str:
+    """Summarize text with the configured quick thinking LLM."""
+    config = get_config()
+    llm_provider = config["llm_provider"].lower()
+    backend_url = config["backend_url"]
+    quick_think_llm = config["quick_think_llm"]
+    llm_timeout = config.get("llm_timeout")
+    proxies = config.get("proxies")
+
+    prompt_text = f"Summarize the following text concisely, keeping it under {max_length} characters:\n\n{text}"
+
+    if llm_provider == "google":
+        client = get_client_registry().google_chat(quick_think_llm, llm_timeout)
+        response = client.invoke(prompt_text)
+        summary = response.content
+    elif llm_provider == "openai" or llm_provider == "ollama" or llm_provider == "openrouter":
+        client = get_client_registry().openai_client(
+            llm_provider, backend_url, proxies, llm_timeout
+        )
+
+        response = client.responses.create(
+            model=quick_think_llm,
+            input=[
+                {
+                    "role": "system",
+                    "content": [
+                        {
+                            "type": "input_text",
+                            "text": prompt_text,
+                        }
+                    ],
+                }
+            ],
+            text={"format": {"type": "text"}},
+            reasoning={},
+            temperature=0.7,
+            max_output_tokens=max_length, # Use max_length for output tokens
+            top_p=1,
+            store=True,
+        )
+        summary = response.output[1].content[0].text
+    else:
+        raise ValueError(f"Unsupported LLM provider for summarization: {llm_provider}")
+
+    # Ensure the summary does not exceed max_length
+    if len(summary) > max_length:
+        summary = summary[:max_length] + "..."
+
+    return summary
+
+
+def _separator_length(previous: str) -> int:
+    # CJK sentences follow each other directly, western ones after a space
+    return 0 if previous[-1] in "。！？" else 1
+
+
+def _join_sentences(sentences: List[str]) -> str:
+    text = sentences[0]
+    for previous, sentence in zip(sentences, sentences[1:]):
+        text += " " * _separator_length(previous) + sentence
+    return text
+
+
+def _split_blocks(text: str) -> List[list]:
+    """[kind, payload] blocks: ("header", line), ("text", sentences), ("table", lines)."""
+    lines = text.splitlines()
+    blocks = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line.lstrip().startswith("|"):
+            j = i
+            while j < len(lines) and lines[j].lstrip().startswith("|"):
+                j += 1
+            blocks.append(["table", "\n".join(lines[i:j])])
+            i = j
+            continue
+
+        if _HEADER.match(line):
+            blocks.append(["header", line.strip()])
+        elif line.strip():
+            sentences = [s.strip() for s in _SENTENCE_END.split(line) if s.strip()]
+            if blocks and blocks[-1][0] == "text":
+                blocks[-1][1].extend(sentences)
+            else:
+                blocks.append(["text", sentences])
+        i += 1
+    return blocks
+
+
+def extractive_summary(
+    text: Annotated[str, "Markdown report to shorten"],
+    max_length: Annotated[int, "Maximum length of the summary in characters"],
+) -> Optional[str]:
+    """
+    Shorten a Markdown report without an LLM. Section headers and the final
+    Markdown table are always kept; the remaining budget is filled with the
+    leading sentences of every section, taken round-robin so that each
+    section is represented. Returns None when the headers and table alone do
+    not fit in max_length.
+    """
+    blocks = _split_blocks(text)
+    tables = [index for index, (kind, _) in enumerate(blocks) if kind == "table"]
+    last_table = tables[-1] if tables else None
+    # earlier tables are dropped, only the key-points table at the end is kept
+    blocks = [
+        block
+        for index, block in enumerate(blocks)
+        if block[0] != "table" or index == last_table
+    ]
+
+    required = [payload for kind, payload in blocks if kind != "text"]
+    # parts are joined by "\n\n"; a section's first sentence pays for its own
+    budget = (
+        max_length
+        - sum(len(part) for part in required)
+        - 2 * max(len(required) - 1, 0)
+    )
+    if budget < 0:
+        return None
+
+    # round-robin over the sections, each keeping a prefix of its sentences
+    chosen = [[] for _ in blocks]
+    open_sections = [index for index, (kind, _) in enumerate(blocks) if kind == "text"]
+    rank = 0
+    while open_sections:
+        for index in list(open_sections):
+            sentences = blocks[index][1]
+            if rank >= len(sentences):
+                open_sections.remove(index)
+                continue
+            cost = len(sentences[rank]) + (
+                _separator_length(chosen[index][-1]) if chosen[index] else 2
+            )
+            if cost > budget:
+                open_sections.remove(index)
+                continue
+            chosen[index].append(sentences[rank])
+            budget -= cost
+        rank += 1
+
+    parts = []
+    for (kind, payload), sentences in zip(blocks, chosen):
+        if kind != "text":
+            parts.append(payload)
+        elif sentences:
+            parts.append(_join_sentences(sentences))
+    return "\n\n".join(parts)
+
+
+class ReportSummarizer:
+    """
+    Shortens analyst reports to ``max_length`` characters.
+
+    Reports already within the budget are returned unchanged. Otherwise the
+    strategy decides: "extractive" never calls an LLM, "llm" always does, and
+    "auto" is extractive unless the headers and table alone exceed the budget.
+    Results are cached by a hash of the report.
+    """
+
+    def __init__(
+        self,
+        strategy: str = "extractive",
+        max_length: int = 1500,
+        max_entries: int = 1024,
+    ):
+        if strategy not in SUMMARY_STRATEGIES:
+            raise ValueError(
+                f"Unknown summary strategy {strategy!r}, expected one of {SUMMARY_STRATEGIES}"
+            )
+        self.strategy = strategy
+        self.max_length = max_length
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _summarize(self, text: str) -> str:
+        if self.strategy != "llm":
+            summary = extractive_summary(text, self.max_length)
+            if summary is not None:
+                return summary
+            if self.strategy == "extractive":
+                return text[: self.max_length] + "..."
+        return llm_summary(text, self.max_length)
+
+    def summarize(self, text: Annotated[str, "report to shorten"]) -> str:
+        if len(text) <= self.max_length:
+            return text
+
+        key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        summary = self._summarize(text)
+        with self._lock:
+            self._cache[key] = summary
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return summary
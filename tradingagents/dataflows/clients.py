@@ -0,0 +1,148 @@
+"""
+Process-wide registry of pooled LLM and HTTP clients.
+
+Building an ``OpenAI`` client or a ``ChatGoogleGenerativeAI`` per tool call
+pays connection setup and TLS handshakes on every call. The registry builds
+one client per (provider, base_url, proxies, timeout) instead and every
+OpenAI-compatible client sharing the same proxies also shares one
+connection-pooled ``httpx.Client``, which keeps connections alive between
+calls; async calls of the chat models share a pooled ``httpx.AsyncClient``
+the same way. The tools, the memory embeddings and the graph's chat models
+all get their clients here.
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .config import get_config
+
+
+def _proxies_key(proxies: Optional[Dict[str, str]]):
+    return tuple(sorted(proxies.items())) if proxies else None
+
+
+class ClientRegistry:
+    """Creates clients on first use and hands out the same instance afterwards."""
+
+    def __init__(self, max_connections: int = 20, max_keepalive_connections: int = 10):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._clients: Dict[tuple, Any] = {}
+        # worker threads of batch runs and of asyncio.to_thread ask concurrently;
+        # reentrant because an OpenAI client is built around the HTTP client
+        self._lock = threading.RLock()
+
+    def _get(self, key: tuple, factory):
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = factory()
+                    self._clients[key] = client
+        return client
+
+    def _mounts(self, proxies: Optional[Dict[str, str]], transport_class):
+        if not proxies:
+            return None
+        return {
+            (pattern if "://" in pattern else f"{pattern}://"): transport_class(
+                proxy=url, limits=self.limits
+            )
+            for pattern, url in proxies.items()
+        }
+
+    def http_client(self, proxies: Optional[Dict[str, str]] = None) -> httpx.Client:
+        """Pooled HTTP client, routed through ``proxies`` ({"http": url, "https": url}
+        or httpx mount patterns such as {"https://": url})."""
+        return self._get(
+            ("http", _proxies_key(proxies)),
+            lambda: httpx.Client(
+                limits=self.limits, mounts=self._mounts(proxies, httpx.HTTPTransport)
+            ),
+        )
+
+    def async_http_client(
+        self, proxies: Optional[Dict[str, str]] = None
+    ) -> httpx.AsyncClient:
+        """Pooled async HTTP client with the same proxy routing as http_client."""
+        return self._get(
+            ("async_http", _proxies_key(proxies)),
+            lambda: httpx.AsyncClient(
+                limits=self.limits, mounts=self._mounts(proxies, httpx.AsyncHTTPTransport)
+            ),
+        )
+
+    def openai_client(
+        self,
+        provider: str,
+        base_url: Optional[str],
+        proxies: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ):
+        """OpenAI-compatible client (openai, ollama, openrouter) over the pooled HTTP client."""
+        from openai import OpenAI
+
+        def factory():
+            kwargs = {"base_url": base_url, "http_client": self.http_client(proxies)}
+            if timeout is not None:
+                kwargs["timeout"] = timeout
+            return OpenAI(**kwargs)
+
+        key = ("openai", provider, base_url, _proxies_key(proxies), timeout)
+        return self._get(key, factory)
+
+    def google_chat(self, model: str, timeout: Optional[float] = None):
+        """Shared ChatGoogleGenerativeAI for one model."""
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        return self._get(
+            ("google", model, timeout),
+            lambda: ChatGoogleGenerativeAI(model=model, timeout=timeout),
+        )
+
+    def _take_all(self):
+        with self._lock:
+            clients = list(self._clients.items())
+            self._clients.clear()
+        return clients
+
+    def close(self) -> None:
+        """Close the pooled HTTP clients and forget every client. From inside
+        an event loop use aclose instead."""
+        for key, client in self._take_all():
+            if key[0] == "http":
+                client.close()
+            elif key[0] == "async_http":
+                asyncio.run(client.aclose())
+
+    async def aclose(self) -> None:
+        """Async version of close."""
+        for key, client in self._take_all():
+            if key[0] == "http":
+                client.close()
+            elif key[0] == "async_http":
+                await client.aclose()
+
+
+_client_registry: Optional[ClientRegistry] = None
+_client_registry_lock = threading.Lock()
+
+
+def get_client_registry() -> ClientRegistry:
+    """Return the process-wide client registry, creating it from the config."""
+    global _client_registry
+    if _client_registry is None:
+        with _client_registry_lock:
+            if _client_registry is None:
+                config = get_config()
+                _client_registry = ClientRegistry(
+                    config.get("http_max_connections", 20),
+                    config.get("http_max_keepalive_connections", 10),
+                )
+    return _client_registry
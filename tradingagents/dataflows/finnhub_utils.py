@@ -1,5 +1,145 @@
+import argparse
 import json
 import os
+import sqlite3
+from contextlib import closing
+
+FINNHUB_INDEX_FILE = "finnhub_index.sqlite"
+FINNHUB_PERIODS = ("annual", "quarterly")
+
+
+def _data_path(ticker, data_type, data_dir, period=None):
+    if period:
+        return os.path.join(
+            data_dir,
+            "finnhub_data",
+            data_type,
+            f"{ticker}_{period}_data_formatted.json",
+        )
+    return os.path.join(
+        data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
+    )
+
+
+class FinnhubStore:
+    """
+    SQLite index over the formatted finnhub JSON files.
+
+    Every non-empty date entry of a JSON file becomes one row keyed by
+    (ticker, data_type, period, date), so a date-range query is an index range
+    scan instead of a full json.load. The source file's mtime is recorded so
+    stale entries are never served.
+    """
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, "finnhub_data", FINNHUB_INDEX_FILE)
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                ticker TEXT NOT NULL,
+                data_type TEXT NOT NULL,
+                period TEXT NOT NULL,
+                date TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                payload TEXT NOT NULL
+            )"""
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_by_date "
+            "ON entries (ticker, data_type, period, date)"
+        )
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS sources (
+                ticker TEXT NOT NULL,
+                data_type TEXT NOT NULL,
+                period TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                PRIMARY KEY (ticker, data_type, period)
+            )"""
+        )
+        return conn
+
+    def import_file(self, ticker, data_type, period=None):
+        """(Re)index one formatted JSON file. Returns the number of dates indexed."""
+        data_path = _data_path(ticker, data_type, self.data_dir, period)
+        with open(data_path, "r") as f:
+            data = json.load(f)
+        mtime = os.path.getmtime(data_path)
+        period = period or ""
+
+        rows = [
+            (ticker, data_type, period, date, seq, json.dumps(value))
+            for seq, (date, value) in enumerate(data.items())
+            if len(value) > 0
+        ]
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "DELETE FROM entries WHERE ticker = ? AND data_type = ? AND period = ?",
+                (ticker, data_type, period),
+            )
+            conn.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)", rows)
+            conn.execute(
+                "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+                (ticker, data_type, period, mtime),
+            )
+        return len(rows)
+
+    def import_all(self):
+        """Index every formatted JSON file under finnhub_data. Returns the number of files."""
+        finnhub_dir = os.path.join(self.data_dir, "finnhub_data")
+        imported = 0
+        for data_type in sorted(os.listdir(finnhub_dir)):
+            type_dir = os.path.join(finnhub_dir, data_type)
+            if not os.path.isdir(type_dir):
+                continue
+
+            for file_name in sorted(os.listdir(type_dir)):
+                if not file_name.endswith("_data_formatted.json"):
+                    continue
+
+                ticker = file_name[: -len("_data_formatted.json")]
+                period = None
+                for candidate in FINNHUB_PERIODS:
+                    if ticker.endswith(f"_{candidate}"):
+                        ticker, period = ticker[: -len(candidate) - 1], candidate
+
+                self.import_file(ticker, data_type, period)
+                imported += 1
+        return imported
+
+    def get_data_in_range(self, ticker, start_date, end_date, data_type, period=None):
+        """
+        Same result as reading the JSON file, or None when the file is not
+        indexed or has changed since it was indexed.
+        """
+        period = period or ""
+        with closing(sqlite3.connect(self.path)) as conn:
+            source = conn.execute(
+                "SELECT mtime FROM sources WHERE ticker = ? AND data_type = ? AND period = ?",
+                (ticker, data_type, period),
+            ).fetchone()
+            if source is None:
+                return None
+
+            data_path = _data_path(ticker, data_type, self.data_dir, period or None)
+            if os.path.exists(data_path) and os.path.getmtime(data_path) != source[0]:
+                return None
+
+            rows = conn.execute(
+                "SELECT date, payload FROM entries "
+                "WHERE ticker = ? AND data_type = ? AND period = ? AND date BETWEEN ? AND ? "
+                "ORDER BY seq",
+                (ticker, data_type, period, start_date, end_date),
+            ).fetchall()
+
+        return {date: json.loads(payload) for date, payload in rows}
 
 
 def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=None):
@@ -13,20 +153,17 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
         period (str): Default to none, if there is a period specified, should be annual or quarterly.
     """
 
-    if period:
-        data_path = os.path.join(
-            data_dir,
-            "finnhub_data",
-            data_type,
-            f"{ticker}_{period}_data_formatted.json",
-        )
-    else:
-        data_path = os.path.join(
-            data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
+    # answer from the index when it has been built (see FinnhubStore)
+    store = FinnhubStore(data_dir)
+    if store.exists():
+        filtered_data = store.get_data_in_range(
+            ticker, start_date, end_date, data_type, period
         )
+        if filtered_data is not None:
+            return filtered_data
 
-    data = open(data_path, "r")
-    data = json.load(data)
+    with open(_data_path(ticker, data_type, data_dir, period), "r") as f:
+        data = json.load(f)
 
     # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
     filtered_data = {}
@@ -34,3 +171,18 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
         if start_date <= key <= end_date and len(value) > 0:
             filtered_data[key] = value
     return filtered_data
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the finnhub index from the formatted JSON files."
+    )
+    parser.add_argument("data_dir", help="data directory containing finnhub_data/")
+    args = parser.parse_args()
+
+    imported = FinnhubStore(args.data_dir).import_all()
+    print(f"Indexed {imported} finnhub file(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,27 @@
-from typing import Annotated, Dict
-from .reddit_utils import fetch_top_from_category
+from typing import Annotated, Callable, Dict, List
+from .reddit_utils import fetch_top_from_category, fetch_top_from_category_range
 from .yfin_utils import *
 from .stockstats_utils import *
 from .googlenews_utils import *
 from .finnhub_utils import get_data_in_range
+from .simfin_utils import get_simfin_store
+from .price_cache import load_price_frame
+from .online_price_cache import get_online_price_cache
+from .llm_cache import memoize
+from .clients import get_client_registry
 from dateutil.relativedelta import relativedelta
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
 import os
 import pandas as pd
-from tqdm import tqdm
 import yfinance as yf
-from openai import OpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
-from .config import get_config, set_config, DATA_DIR
+from .config import get_config, set_config
+
+
+def _data_dir() -> str:
+    # read on every call: set_config may change data_dir after this module is imported
+    return get_config()["data_dir"]
 
 
 def get_finnhub_news(
@@ -41,7 +48,7 @@ def get_finnhub_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    result = get_data_in_range(ticker, before, curr_date, "news_data", DATA_DIR)
+    result = get_data_in_range(ticker, before, curr_date, "news_data", _data_dir())
 
     if len(result) == 0:
         return ""
@@ -59,6 +66,37 @@ def get_finnhub_news(
     return f"## {ticker} News, from {before} to {curr_date}:\n" + str(combined_result)
 
 
+def _entry_key(value):
+    """Hashable key of a JSON value; equal values (as compared with ==) get equal keys."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _entry_key(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return ("__list__",) + tuple(_entry_key(item) for item in value)
+    return value
+
+
+def build_unique_entries_report(
+    data: Annotated[Dict[str, list], "finnhub entries per date"],
+    format_entry: Annotated[Callable[[dict], str], "renders one entry"],
+) -> str:
+    """
+    Render every distinct entry once, in order of first appearance.
+
+    Entries are deduplicated through a set of canonical keys and the parts are
+    joined once, so the cost is linear in the number of entries.
+    """
+    seen = set()
+    parts = []
+    for entries in data.values():
+        for entry in entries:
+            key = _entry_key(entry)
+            if key in seen:
+                continue
+            seen.add(key)
+            parts.append(format_entry(entry))
+    return "".join(parts)
+
+
 def get_finnhub_company_insider_sentiment(
     ticker: Annotated[str, "ticker symbol for the company"],
     curr_date: Annotated[
@@ -80,18 +118,15 @@ def get_finnhub_company_insider_sentiment(
     before = date_obj - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    data = get_data_in_range(ticker, before, curr_date, "insider_senti", DATA_DIR)
+    data = get_data_in_range(ticker, before, curr_date, "insider_senti", _data_dir())
 
     if len(data) == 0:
         return ""
 
-    result_str = ""
-    seen_dicts = []
-    for date, senti_list in data.items():
-        for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
-                seen_dicts.append(entry)
+    result_str = build_unique_entries_report(
+        data,
+        lambda entry: f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n",
+    )
 
     return (
         f"## {ticker} Insider Sentiment Data for {before} to {curr_date}:\n"
@@ -121,19 +156,15 @@ def get_finnhub_company_insider_transactions(
     before = date_obj - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    data = get_data_in_range(ticker, before, curr_date, "insider_trans", DATA_DIR)
+    data = get_data_in_range(ticker, before, curr_date, "insider_trans", _data_dir())
 
     if len(data) == 0:
         return ""
 
-    result_str = ""
-
-    seen_dicts = []
-    for date, senti_list in data.items():
-        for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
-                seen_dicts.append(entry)
+    result_str = build_unique_entries_report(
+        data,
+        lambda entry: f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n",
+    )
 
     return (
         f"## {ticker} insider transactions from {before} to {curr_date}:\n"
@@ -142,54 +173,55 @@ def get_finnhub_company_insider_transactions(
     )
 
 
-def get_simfin_balance_sheet(
+SIMFIN_REPORTS = {
+    # statement -> (title, description appended to the report)
+    "balance_sheet": (
+        "balance sheet",
+        "\n\nThis includes metadata like reporting dates and currency, share details, and a breakdown of assets, liabilities, and equity. Assets are grouped as current (liquid items like cash and receivables) and noncurrent (long-term investments and property). Liabilities are split between short-term obligations and long-term debts, while equity reflects shareholder funds such as paid-in capital and retained earnings. Together, these components ensure that total assets equal the sum of liabilities and equity.",
+    ),
+    "cashflow": (
+        "cash flow statement",
+        "\n\nThis includes metadata like reporting dates and currency, share details, and a breakdown of cash movements. Operating activities show cash generated from core business operations, including net income adjustments for non-cash items and working capital changes. Investing activities cover asset acquisitions/disposals and investments. Financing activities include debt transactions, equity issuances/repurchases, and dividend payments. The net change in cash represents the overall increase or decrease in the company's cash position during the reporting period.",
+    ),
+    "income": (
+        "income statement",
+        "\n\nThis includes metadata like reporting dates and currency, share details, and a comprehensive breakdown of the company's financial performance. Starting with Revenue, it shows Cost of Revenue and resulting Gross Profit. Operating Expenses are detailed, including SG&A, R&D, and Depreciation. The statement then shows Operating Income, followed by non-operating items and Interest Expense, leading to Pretax Income. After accounting for Income Tax and any Extraordinary items, it concludes with Net Income, representing the company's bottom-line profit or loss for the period.",
+    ),
+}
+
+
+def get_simfin_statement(
     ticker: Annotated[str, "ticker symbol"],
     freq: Annotated[
         str,
         "reporting frequency of the company's financial history: annual / quarterly",
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+    statement: Annotated[str, "balance_sheet, cashflow or income"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "balance_sheet",
-        "companies",
-        "us",
-        f"us-balance-{freq}.csv",
-    )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+    title, description = SIMFIN_REPORTS[statement]
 
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Get the most recent statement published on or before the current date
+    latest_statement = get_simfin_store().latest(
+        _data_dir(), statement, ticker, freq, curr_date
+    )
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
-        print("No balance sheet available before the given current date.")
+    if latest_statement is None:
+        print(f"No {title} available before the given current date.")
         return ""
 
-    # Get the most recent balance sheet by selecting the row with the latest Publish Date
-    latest_balance_sheet = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
-    latest_balance_sheet = latest_balance_sheet.drop("SimFinId")
+    latest_statement = latest_statement.drop("SimFinId")
 
     return (
-        f"## {freq} balance sheet for {ticker} released on {str(latest_balance_sheet['Publish Date'])[0:10]}: \n"
-        + str(latest_balance_sheet)
-        + "\n\nThis includes metadata like reporting dates and currency, share details, and a breakdown of assets, liabilities, and equity. Assets are grouped as current (liquid items like cash and receivables) and noncurrent (long-term investments and property). Liabilities are split between short-term obligations and long-term debts, while equity reflects shareholder funds such as paid-in capital and retained earnings. Together, these components ensure that total assets equal the sum of liabilities and equity."
+        f"## {freq} {title} for {ticker} released on {str(latest_statement['Publish Date'])[0:10]}: \n"
+        + str(latest_statement)
+        + description
     )
 
 
-def get_simfin_cashflow(
+def get_simfin_balance_sheet(
     ticker: Annotated[str, "ticker symbol"],
     freq: Annotated[
         str,
@@ -197,43 +229,18 @@ def get_simfin_cashflow(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "cash_flow",
-        "companies",
-        "us",
-        f"us-cashflow-{freq}.csv",
-    )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+    return get_simfin_statement(ticker, freq, curr_date, "balance_sheet")
 
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
 
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
-
-    # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
-        print("No cash flow statement available before the given current date.")
-        return ""
-
-    # Get the most recent cash flow statement by selecting the row with the latest Publish Date
-    latest_cash_flow = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
-    # drop the SimFinID column
-    latest_cash_flow = latest_cash_flow.drop("SimFinId")
-
-    return (
-        f"## {freq} cash flow statement for {ticker} released on {str(latest_cash_flow['Publish Date'])[0:10]}: \n"
-        + str(latest_cash_flow)
-        + "\n\nThis includes metadata like reporting dates and currency, share details, and a breakdown of cash movements. Operating activities show cash generated from core business operations, including net income adjustments for non-cash items and working capital changes. Investing activities cover asset acquisitions/disposals and investments. Financing activities include debt transactions, equity issuances/repurchases, and dividend payments. The net change in cash represents the overall increase or decrease in the company's cash position during the reporting period."
-    )
+def get_simfin_cashflow(
+    ticker: Annotated[str, "ticker symbol"],
+    freq: Annotated[
+        str,
+        "reporting frequency of the company's financial history: annual / quarterly",
+    ],
+    curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+):
+    return get_simfin_statement(ticker, freq, curr_date, "cashflow")
 
 
 def get_simfin_income_statements(
@@ -244,43 +251,26 @@ def get_simfin_income_statements(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "income_statements",
-        "companies",
-        "us",
-        f"us-income-{freq}.csv",
-    )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
-
-    # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
-        print("No income statement available before the given current date.")
-        return ""
-
-    # Get the most recent income statement by selecting the row with the latest Publish Date
-    latest_income = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
+    return get_simfin_statement(ticker, freq, curr_date, "income")
 
-    # drop the SimFinID column
-    latest_income = latest_income.drop("SimFinId")
 
-    return (
-        f"## {freq} income statement for {ticker} released on {str(latest_income['Publish Date'])[0:10]}: \n"
-        + str(latest_income)
-        + "\n\nThis includes metadata like reporting dates and currency, share details, and a comprehensive breakdown of the company's financial performance. Starting with Revenue, it shows Cost of Revenue and resulting Gross Profit. Operating Expenses are detailed, including SG&A, R&D, and Depreciation. The statement then shows Operating Income, followed by non-operating items and Interest Expense, leading to Pretax Income. After accounting for Income Tax and any Extraordinary items, it concludes with Net Income, representing the company's bottom-line profit or loss for the period."
-    )
+def get_simfin_statements(
+    ticker: Annotated[str, "ticker symbol"],
+    freq: Annotated[
+        str,
+        "reporting frequency of the company's financial history: annual / quarterly",
+    ],
+    curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+    statements: Annotated[
+        List[str], "statements to fetch: balance_sheet, cashflow and/or income"
+    ] = ("balance_sheet", "cashflow", "income"),
+):
+    """Several of the latest statements of a company as one report."""
+    reports = [
+        get_simfin_statement(ticker, freq, curr_date, statement)
+        for statement in statements
+    ]
+    return "\n\n".join(report for report in reports if report)
 
 
 def get_google_news(
@@ -331,22 +321,18 @@ def get_reddit_global_news(
     # iterate from start_date to end_date
     curr_date = datetime.strptime(before, "%Y-%m-%d")
 
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(desc=f"Getting Global News on {start_date}", total=total_iterations)
+    # a single pass over the corpus for the whole lookback window
+    posts_per_date = fetch_top_from_category_range(
+        "global_news",
+        before,
+        start_date.strftime("%Y-%m-%d"),
+        max_limit_per_day,
+        data_path=os.path.join(_data_dir(), "reddit_data"),
+    )
 
     while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "global_news",
-            curr_date_str,
-            max_limit_per_day,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
+        posts.extend(posts_per_date.get(curr_date.strftime("%Y-%m-%d"), []))
         curr_date += relativedelta(days=1)
-        pbar.update(1)
-
-    pbar.close()
 
     if len(posts) == 0:
         return ""
@@ -385,28 +371,20 @@ def get_reddit_company_news(
     # iterate from start_date to end_date
     curr_date = datetime.strptime(before, "%Y-%m-%d")
 
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(
-        desc=f"Getting Company News for {ticker} on {start_date}",
-        total=total_iterations,
+    # a single pass over the corpus for the whole lookback window
+    posts_per_date = fetch_top_from_category_range(
+        "company_news",
+        before,
+        start_date.strftime("%Y-%m-%d"),
+        max_limit_per_day,
+        ticker,
+        data_path=os.path.join(_data_dir(), "reddit_data"),
     )
 
     while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "company_news",
-            curr_date_str,
-            max_limit_per_day,
-            ticker,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
+        posts.extend(posts_per_date.get(curr_date.strftime("%Y-%m-%d"), []))
         curr_date += relativedelta(days=1)
 
-        pbar.update(1)
-
-    pbar.close()
-
     if len(posts) == 0:
         return ""
 
@@ -512,39 +490,42 @@ def get_stock_stats_indicators_window(
     curr_date = datetime.strptime(curr_date, "%Y-%m-%d")
     before = curr_date - relativedelta(days=look_back_days)
 
-    if not online:
-        # read from YFin data
-        data = pd.read_csv(
-            os.path.join(
-                DATA_DIR,
-                f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-            )
+    # load the price history and compute the indicator once for the whole window
+    try:
+        window_values = StockstatsUtils.get_stock_stats_window(
+            symbol,
+            indicator,
+            before.strftime("%Y-%m-%d"),
+            end_date,
+            os.path.join(_data_dir(), "market_data", "price_data"),
+            online=online,
         )
-        data["Date"] = pd.to_datetime(data["Date"], utc=True)
-        dates_in_df = data["Date"].astype(str).str[:10]
-
-        ind_string = ""
-        while curr_date >= before:
-            # only do the trading dates
-            if curr_date.strftime("%Y-%m-%d") in dates_in_df.values:
-                indicator_value = get_stockstats_indicator(
-                    symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-                )
+    except Exception as e:
+        if not online:
+            raise
+        print(
+            f"Error getting stockstats indicator data for indicator {indicator} from {before.strftime('%Y-%m-%d')} to {end_date}: {e}"
+        )
+        window_values = None
 
-                ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
+    ind_string = ""
+    while curr_date >= before:
+        curr_date_str = curr_date.strftime("%Y-%m-%d")
 
+        if window_values is None:
+            indicator_value = ""
+        elif curr_date_str in window_values.index:
+            indicator_value = str(window_values[curr_date_str])
+        elif not online:
+            # only do the trading dates
             curr_date = curr_date - relativedelta(days=1)
-    else:
-        # online gathering
-        ind_string = ""
-        while curr_date >= before:
-            indicator_value = get_stockstats_indicator(
-                symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-            )
+            continue
+        else:
+            indicator_value = "N/A: Not a trading day (weekend or holiday)"
 
-            ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
+        ind_string += f"{curr_date_str}: {indicator_value}\n"
 
-            curr_date = curr_date - relativedelta(days=1)
+        curr_date = curr_date - relativedelta(days=1)
 
     result_str = (
         f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
@@ -573,7 +554,7 @@ def get_stockstats_indicator(
             symbol,
             indicator,
             curr_date,
-            os.path.join(DATA_DIR, "market_data", "price_data"),
+            os.path.join(_data_dir(), "market_data", "price_data"),
             online=online,
         )
     except Exception as e:
@@ -595,24 +576,18 @@ def get_YFin_data_window(
     before = date_obj - relativedelta(days=look_back_days)
     start_date = before.strftime("%Y-%m-%d")
 
-    # read in data
-    data = pd.read_csv(
+    # read in data (parsed once per process through the price cache)
+    price_frame = load_price_frame(
+        symbol,
+        "offline",
         os.path.join(
-            DATA_DIR,
+            _data_dir(),
             f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
+        ),
     )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
-
     # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= curr_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
+    filtered_data = price_frame.window(start_date, curr_date)
 
     # Set pandas display options to show the full DataFrame
     with pd.option_context(
@@ -635,11 +610,8 @@ def get_YFin_data_online(
     datetime.strptime(start_date, "%Y-%m-%d")
     datetime.strptime(end_date, "%Y-%m-%d")
 
-    # Create ticker object
-    ticker = yf.Ticker(symbol.upper())
-
-    # Fetch historical data for the specified date range
-    data = ticker.history(start=start_date, end=end_date)
+    # Serve the date range from the incrementally updated price history
+    data = get_online_price_cache().get_range(symbol.upper(), start_date, end_date)
 
     # Check if data is empty
     if data.empty:
@@ -647,9 +619,13 @@ def get_YFin_data_online(
             f"No data found for symbol '{symbol}' between {start_date} and {end_date}"
         )
 
-    # Remove timezone info from index for cleaner output
-    if data.index.tz is not None:
-        data.index = data.index.tz_localize(None)
+    data = data.set_index("Date")
+    ohlcv_columns = [
+        col for col in ["Open", "High", "Low", "Close", "Volume"] if col in data.columns
+    ]
+    data = data[
+        ohlcv_columns + [col for col in data.columns if col not in ohlcv_columns]
+    ].copy()
 
     # Round numerical values to 2 decimal places for cleaner display
     numeric_columns = ["Open", "High", "Low", "Close", "Adj Close"]
@@ -673,12 +649,14 @@ def get_YFin_data(
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     end_date: Annotated[str, "End date in yyyy-mm-dd format"],
 ) -> str:
-    # read in data
-    data = pd.read_csv(
+    # read in data (parsed once per process through the price cache)
+    price_frame = load_price_frame(
+        symbol,
+        "offline",
         os.path.join(
-            DATA_DIR,
+            _data_dir(),
             f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
+        ),
     )
 
     if end_date > "2025-03-25":
@@ -686,16 +664,8 @@ def get_YFin_data(
             f"Get_YFin_Data: {end_date} is outside of the data range of 2015-01-01 to 2025-03-25"
         )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
-
     # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= end_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
+    filtered_data = price_frame.window(start_date, end_date)
 
     # remove the index from the dataframe
     filtered_data = filtered_data.reset_index(drop=True)
@@ -703,6 +673,7 @@ def get_YFin_data(
     return filtered_data
 
 
+@memoize("get_stock_news_llm")
 def get_stock_news_llm(ticker, curr_date):
     config = get_config()
     llm_provider = config["llm_provider"].lower()
@@ -714,7 +685,7 @@ def get_stock_news_llm(ticker, curr_date):
     prompt_text = f"Can you search Social Media for {ticker} from 7 days before {curr_date} to {curr_date}? Make sure you only get the data posted during that period."
 
     if llm_provider == "google":
-        client = ChatGoogleGenerativeAI(model=quick_think_llm, timeout=llm_timeout)
+        client = get_client_registry().google_chat(quick_think_llm, llm_timeout)
         # Google Generative AI does not have a direct "responses.create" with tools like OpenAI
         # For web search, it typically relies on integrated search capabilities or external tools.
         # Assuming the underlying LangChain integration handles the tool calling.
@@ -722,10 +693,9 @@ def get_stock_news_llm(ticker, curr_date):
         response = client.invoke(prompt_text)
         return response.content
     elif llm_provider == "openai" or llm_provider == "ollama" or llm_provider == "openrouter":
-        if proxies:
-            client = OpenAI(base_url=backend_url, http_client=httpx.Client(proxies=proxies))
-        else:
-            client = OpenAI(base_url=backend_url)
+        client = get_client_registry().openai_client(
+            llm_provider, backend_url, proxies, llm_timeout
+        )
         
         response = client.responses.create(
             model=quick_think_llm,
@@ -759,6 +729,7 @@ def get_stock_news_llm(ticker, curr_date):
         raise ValueError(f"Unsupported LLM provider for news search: {llm_provider}")
 
 
+@memoize("get_global_news_llm")
 def get_global_news_llm(curr_date):
     config = get_config()
     llm_provider = config["llm_provider"].lower()
@@ -770,14 +741,13 @@ def get_global_news_llm(curr_date):
     prompt_text = f"Can you search global or macroeconomics news from 7 days before {curr_date} to {curr_date} that would be informative for trading purposes? Make sure you only get the data posted during that period."
 
     if llm_provider == "google":
-        client = ChatGoogleGenerativeAI(model=quick_think_llm, timeout=llm_timeout)
+        client = get_client_registry().google_chat(quick_think_llm, llm_timeout)
         response = client.invoke(prompt_text)
         return response.content
     elif llm_provider == "openai" or llm_provider == "ollama" or llm_provider == "openrouter":
-        if proxies:
-            client = OpenAI(base_url=backend_url, http_client=httpx.Client(proxies=proxies))
-        else:
-            client = OpenAI(base_url=backend_url)
+        client = get_client_registry().openai_client(
+            llm_provider, backend_url, proxies, llm_timeout
+        )
 
         response = client.responses.create(
             model=quick_think_llm,
@@ -811,6 +781,7 @@ def get_global_news_llm(curr_date):
         raise ValueError(f"Unsupported LLM provider for global news search: {llm_provider}")
 
 
+@memoize("get_fundamentals_llm")
 def get_fundamentals_llm(ticker, curr_date):
     config = get_config()
     llm_provider = config["llm_provider"].lower()
@@ -822,14 +793,13 @@ def get_fundamentals_llm(ticker, curr_date):
     prompt_text = f"请根据你对 {ticker} 公司的了解，提供一份关于其基本面的概述或讨论。请用中文输出。请确保只提供截至 {curr_date} 的信息，不要提及未来数据。"
 
     if llm_provider == "google":
-        client = ChatGoogleGenerativeAI(model=quick_think_llm, timeout=llm_timeout)
+        client = get_client_registry().google_chat(quick_think_llm, llm_timeout)
         response = client.invoke(prompt_text)
         return response.content
     elif llm_provider == "openai" or llm_provider == "ollama" or llm_provider == "openrouter":
-        if proxies:
-            client = OpenAI(base_url=backend_url, http_client=httpx.Client(proxies=proxies))
-        else:
-            client = OpenAI(base_url=backend_url)
+        client = get_client_registry().openai_client(
+            llm_provider, backend_url, proxies, llm_timeout
+        )
 
         response = client.responses.create(
             model=quick_think_llm,
@@ -0,0 +1,416 @@
+"""
+Content-addressed cache of LLM responses.
+
+``LLMResponseCache`` is a LangChain ``BaseCache`` that TradingAgentsGraph sets
+as the ``cache`` of its quick and deep thinking models. LangChain looks it up
+with the serialized messages and a string describing the model, its
+parameters and any bound tools; the cache key is a hash of both. Calls that
+do not go through a LangChain chat model (the web-search tools and
+``summarize_text``) are cached through ``memoize``.
+
+Modes:
+    read_write  serve hits, call the model and store on a miss (default)
+    record      always call the model and overwrite the stored response
+    replay      never call the model; a miss raises LLMCacheMiss, so a run
+                recorded once can be re-run deterministically offline
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+from .config import get_config
+
+LLM_CACHE_MODES = ("read_write", "record", "replay")
+
+
+class LLMCacheMiss(KeyError):
+    """Raised in replay mode when a call has no recorded response."""
+
+
+class MemoryBackend:
+    """In-process LRU of at most ``max_entries`` responses."""
+
+    def __init__(self, max_entries: Optional[int] = 10000):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: str, stored_at: float, ttl: Optional[float]) -> None:
+        with self._lock:
+            self._entries[key] = (value, stored_at)
+            self._entries.move_to_end(key)
+            while self.max_entries and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """
+    On-disk cache shared by every process using the same file. Once it holds
+    more than ``max_entries`` responses the least recently used ones go.
+    """
+
+    def __init__(self, path: str, max_entries: Optional[int] = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self.evictions = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # one connection shared by the worker threads, serialized by the lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_by_access ON responses (accessed_at)"
+            )
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+            return row
+
+    def set(self, key: str, value: str, stored_at: float, ttl: Optional[float]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, value, stored_at, stored_at),
+            )
+            if self.max_entries:
+                excess = (
+                    self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                    - self.max_entries
+                )
+                if excess > 0:
+                    self._conn.execute(
+                        "DELETE FROM responses WHERE key IN "
+                        "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                        (excess,),
+                    )
+                    self.evictions += excess
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class RedisBackend:
+    """
+    Cache shared through Redis. Entries expire after the TTL on the server;
+    the size limit is left to the server's ``maxmemory-policy``.
+    """
+
+    def __init__(self, url: str, prefix: str = "tradingagents:llm:"):
+        import redis
+
+        self.prefix = prefix
+        self.evictions = 0
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        raw = self._client.get(self.prefix + key)
+        if raw is None:
+            return None
+        value, stored_at = json.loads(raw)
+        return value, stored_at
+
+    def set(self, key: str, value: str, stored_at: float, ttl: Optional[float]) -> None:
+        self._client.set(
+            self.prefix + key,
+            json.dumps([value, stored_at]),
+            ex=int(ttl) if ttl else None,
+        )
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        keys = list(self._client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self._client.delete(*keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._client.scan_iter(match=self.prefix + "*"))
+
+
+# message fields that are bookkeeping rather than conversation: ids are random
+# (LangGraph gives every message in the state a uuid) and the metadata differs
+# between a live response and the same response served from the cache
+_VOLATILE_MESSAGE_FIELDS = ("id", "response_metadata", "usage_metadata")
+
+
+def _normalize_prompt(prompt: str) -> str:
+    try:
+        serialized = json.loads(prompt)
+    except ValueError:
+        return prompt
+
+    def strip_volatile(node):
+        if isinstance(node, dict):
+            if "lc" in node and isinstance(node.get("kwargs"), dict):
+                for field in _VOLATILE_MESSAGE_FIELDS:
+                    node["kwargs"].pop(field, None)
+            for value in node.values():
+                strip_volatile(value)
+        elif isinstance(node, list):
+            for value in node:
+                strip_volatile(value)
+
+    strip_volatile(serialized)
+    return json.dumps(serialized, sort_keys=True, ensure_ascii=False)
+
+
+def _dump_generations(generations: RETURN_VAL_TYPE) -> str:
+    return json.dumps(
+        [
+            {
+                "message": message_to_dict(generation.message),
+                "generation_info": generation.generation_info,
+            }
+            if isinstance(generation, ChatGeneration)
+            else {
+                "text": generation.text,
+                "generation_info": generation.generation_info,
+            }
+            for generation in generations
+        ],
+        ensure_ascii=False,
+    )
+
+
+def _load_generations(value: str) -> RETURN_VAL_TYPE:
+    generations = []
+    for item in json.loads(value):
+        if "message" in item:
+            message = messages_from_dict([item["message"]])[0]
+            generations.append(
+                ChatGeneration(message=message, generation_info=item["generation_info"])
+            )
+        else:
+            generations.append(
+                Generation(text=item["text"], generation_info=item["generation_info"])
+            )
+    return generations
+
+
+class LLMResponseCache(BaseCache):
+    """LangChain cache over a MemoryBackend, SQLiteBackend or RedisBackend."""
+
+    def __init__(self, backend, ttl: Optional[float] = None, mode: str = "read_write"):
+        if mode not in LLM_CACHE_MODES:
+            raise ValueError(
+                f"Unknown LLM cache mode {mode!r}, expected one of {LLM_CACHE_MODES}"
+            )
+        self.backend = backend
+        self.ttl = ttl
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(prompt: str, llm_string: str) -> str:
+        """Hash of the model description (model, parameters, tools) and the messages."""
+        digest = hashlib.sha256()
+        digest.update(llm_string.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(_normalize_prompt(prompt).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _get(self, key: str, description: str) -> Optional[str]:
+        entry = None
+        if self.mode != "record":
+            entry = self.backend.get(key)
+            # a recording is replayed as is, however old it is
+            if (
+                entry is not None
+                and self.ttl is not None
+                and self.mode != "replay"
+                and time.time() - entry[1] > self.ttl
+            ):
+                self.backend.delete(key)
+                entry = None
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if entry is None and self.mode == "replay":
+            raise LLMCacheMiss(f"No recorded response for {description} ({key})")
+        return None if entry is None else entry[0]
+
+    def _set(self, key: str, value: str) -> None:
+        self.backend.set(key, value, time.time(), self.ttl)
+        with self._lock:
+            self.writes += 1
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        value = self._get(self.key(prompt, llm_string), "LLM call")
+        return None if value is None else _load_generations(value)
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self._set(self.key(prompt, llm_string), _dump_generations(return_val))
+
+    def clear(self, **kwargs: Any) -> None:
+        self.backend.clear()
+
+    def call(
+        self,
+        namespace: str,
+        func: Callable,
+        args: tuple,
+        kwargs: dict,
+        params: Any = None,
+    ):
+        """
+        Cached ``func(*args, **kwargs)`` for calls that bypass LangChain's cache.
+        The result must be JSON-serializable.
+        """
+        request = json.dumps(
+            [namespace, params, list(args), kwargs],
+            sort_keys=True,
+            default=str,
+            ensure_ascii=False,
+        )
+        key = hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+        value = self._get(key, namespace)
+        if value is not None:
+            return json.loads(value)
+
+        result = func(*args, **kwargs)
+        self._set(key, json.dumps(result, ensure_ascii=False))
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "mode": self.mode,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.backend.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def create_llm_cache(config: Dict[str, Any]) -> Optional[LLMResponseCache]:
+    """Build the cache described by the ``llm_cache*`` settings, None when disabled."""
+    backend_name = config.get("llm_cache")
+    if not backend_name:
+        return None
+
+    max_entries = config.get("llm_cache_max_entries")
+    if backend_name == "memory":
+        backend = MemoryBackend(max_entries)
+    elif backend_name == "sqlite":
+        path = config.get("llm_cache_path") or os.path.join(
+            config["data_cache_dir"], "llm_cache.sqlite"
+        )
+        backend = SQLiteBackend(path, max_entries)
+    elif backend_name == "redis":
+        backend = RedisBackend(
+            config.get("llm_cache_redis_url", "redis://localhost:6379/0")
+        )
+    else:
+        raise ValueError(f"Unsupported LLM cache backend: {backend_name}")
+
+    return LLMResponseCache(
+        backend,
+        ttl=config.get("llm_cache_ttl"),
+        mode=config.get("llm_cache_mode", "read_write"),
+    )
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def set_llm_response_cache(cache: Optional[LLMResponseCache]) -> None:
+    """Install the process-wide cache used by ``memoize``; None disables it."""
+    global _llm_cache
+    _llm_cache = cache
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    return _llm_cache
+
+
+def memoize(
+    namespace: str,
+    config_keys: Sequence[str] = ("llm_provider", "backend_url", "quick_think_llm"),
+):
+    """
+    Cache a function that calls an LLM outside of LangChain's chat models.
+    The key covers the arguments and the ``config_keys`` settings, which name
+    the model the function will call.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = _llm_cache
+            if cache is None:
+                return func(*args, **kwargs)
+            config = get_config()
+            params = {key: config.get(key) for key in config_keys}
+            return cache.call(namespace, func, args, kwargs, params)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,281 @@
+import glob
+import json
+import os
+import threading
+from typing import Annotated, Callable, Dict, List, Optional
+
+import pandas as pd
+import yfinance as yf
+
+from .config import get_config
+from .price_cache import PriceFrame, get_price_cache, load_price_frame
+from .price_store import read_price_file, resolve_price_file, store_price_file
+
+
+# corporate actions, as in Ticker.history; zero on days without one
+ACTION_COLUMNS = ["Dividends", "Stock Splits"]
+
+
+def _read_history_csv(path: str) -> pd.DataFrame:
+    data = pd.read_csv(path)
+    data["Date"] = pd.to_datetime(data["Date"])
+    return data
+
+
+def _empty_history() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Date": pd.Series(dtype="datetime64[ns]"),
+            **{
+                column: pd.Series(dtype="float64")
+                for column in ["Close", "High", "Low", "Open", "Volume"] + ACTION_COLUMNS
+            },
+        }
+    )
+
+
+def _has_business_day(start: str, end: str) -> bool:
+    """Whether [start, end) holds a weekday, i.e. may hold bars."""
+    last_day = pd.Timestamp(end) - pd.Timedelta(days=1)
+    return len(pd.bdate_range(start, last_day)) > 0
+
+
+def _widen(meta: Optional[Dict], start: str, end: str) -> Dict:
+    if meta is None:
+        return {"start": start, "end": end}
+    return {**meta, "start": min(start, meta["start"]), "end": max(end, meta["end"])}
+
+
+class IncrementalPriceCache:
+    """
+    One canonical daily price history per symbol, extended incrementally.
+
+    The first request for a symbol downloads ``history_years`` of bars. Later
+    requests only download the days after the last fetched range or, for older
+    start dates, the days before it, and merge them into the stored history
+    with an atomic rewrite.
+
+    A sidecar ``.meta.json`` file records the [start, end) range that has been
+    fetched so far. A range only counts as fetched when its download returned
+    bars or when it holds no weekday: yf.download returns an empty frame
+    instead of raising on network and rate-limit errors, so an empty range is
+    requested again, at most once per day. A cold start without any bars
+    stores nothing at all and is retried on the next call.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Annotated[str, "directory holding the cached price histories"],
+        downloader: Optional[Callable[..., pd.DataFrame]] = None,
+        history_years: Annotated[int, "years of history fetched on a cold start"] = 15,
+    ):
+        self.cache_dir = cache_dir
+        # same call signature as yf.download, see LocalPriceDownloader for a stub
+        self.downloader = downloader or yf.download
+        self.history_years = history_years
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def history_path(self, symbol: Annotated[str, "ticker symbol"]) -> str:
+        """CSV path of a symbol's history (a columnar copy may shadow it)."""
+        return os.path.join(self.cache_dir, f"{symbol}-YFin-data.csv")
+
+    def _meta_path(self, symbol: str) -> str:
+        return os.path.join(self.cache_dir, f"{symbol}-YFin-data.meta.json")
+
+    def _lock_for(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def _read_meta(self, symbol: str) -> Optional[Dict[str, str]]:
+        try:
+            with open(self._meta_path(symbol), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_meta(self, symbol: str, meta: Dict[str, str]) -> None:
+        tmp_path = f"{self._meta_path(symbol)}.tmp-{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path(symbol))
+
+    def _download(self, symbol: str, start: str, end: str) -> pd.DataFrame:
+        data = self.downloader(
+            symbol,
+            start=start,
+            end=end,
+            multi_level_index=False,
+            progress=False,
+            auto_adjust=True,
+            actions=True,
+        )
+        if data is None or data.empty:
+            return pd.DataFrame()
+
+        data = data.reset_index()
+        data["Date"] = pd.to_datetime(data["Date"]).dt.tz_localize(None)
+        return data
+
+    def update(
+        self,
+        symbol: Annotated[str, "ticker symbol"],
+        start_date: Annotated[
+            Optional[str], "earliest date that must be covered, yyyy-mm-dd"
+        ] = None,
+        today: Annotated[Optional[str], "override of today's date, yyyy-mm-dd"] = None,
+    ) -> str:
+        """
+        Bring a symbol's cached history up to date and return its path.
+
+        Only today's bar is excluded, as it may still be incomplete.
+        """
+        today = pd.Timestamp(today or pd.Timestamp.today()).strftime("%Y-%m-%d")
+        default_start = (
+            pd.Timestamp(today) - pd.DateOffset(years=self.history_years)
+        ).strftime("%Y-%m-%d")
+        start_date = min(start_date or default_start, default_start)
+
+        with self._lock_for(symbol):
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self.history_path(symbol)
+            meta = self._read_meta(symbol)
+            stored_path = resolve_price_file(path)
+
+            cold_start = meta is None or not os.path.exists(stored_path)
+            if cold_start:
+                ranges = [(start_date, today)]
+                meta = None
+                tried_today = []
+            else:
+                ranges = []
+                if start_date < meta["start"]:
+                    ranges.append((start_date, meta["start"]))
+                if meta["end"] < today:
+                    ranges.append((meta["end"], today))
+                empty = meta.get("empty", {})
+                tried_today = empty["ranges"] if empty.get("date") == today else []
+
+            new_meta = meta
+            chunks = []
+            empty_ranges = []
+            for start, end in ranges:
+                if not _has_business_day(start, end):
+                    # a weekend holds no bars, nothing to download
+                    new_meta = _widen(new_meta, start, end)
+                    continue
+                if [start, end] in tried_today:
+                    continue
+                chunk = self._download(symbol, start, end)
+                if chunk.empty:
+                    # a holiday and a failed download look the same, try again tomorrow
+                    empty_ranges.append([start, end])
+                    continue
+                chunks.append(chunk)
+                new_meta = _widen(new_meta, start, end)
+
+            if empty_ranges and not cold_start:
+                new_meta = {
+                    **new_meta,
+                    "empty": {"date": today, "ranges": tried_today + empty_ranges},
+                }
+
+            if not chunks:
+                # nothing new; after a cold start nothing is stored at all, so
+                # the next call requests the full range again
+                if new_meta != meta:
+                    self._write_meta(symbol, new_meta)
+                return path
+            meta = new_meta
+
+            history = None if cold_start else read_price_file(stored_path)
+            if history is not None:
+                history["Date"] = pd.to_datetime(history["Date"])
+
+            merged = pd.concat(
+                ([history] if history is not None else []) + chunks,
+                ignore_index=True,
+            )
+            for column in ACTION_COLUMNS:
+                if column in merged.columns:
+                    # histories stored before actions were downloaded
+                    merged[column] = merged[column].fillna(0.0)
+            merged = (
+                merged.drop_duplicates(subset="Date", keep="last")
+                .sort_values("Date")
+                .reset_index(drop=True)
+            )
+            store_price_file(merged, path)
+            get_price_cache().invalidate(symbol, "online")
+            self._write_meta(symbol, meta)
+            return path
+
+    def get_history(
+        self,
+        symbol: Annotated[str, "ticker symbol"],
+        start_date: Annotated[
+            Optional[str], "earliest date that must be covered, yyyy-mm-dd"
+        ] = None,
+    ) -> PriceFrame:
+        """The full cached history of a symbol, updated first if needed."""
+        path = self.update(symbol, start_date)
+        if not os.path.exists(resolve_price_file(path)):
+            # no bars could be downloaded yet
+            return PriceFrame(_empty_history())
+        return load_price_frame(symbol, "online", path, _read_history_csv)
+
+    def get_range(
+        self,
+        symbol: Annotated[str, "ticker symbol"],
+        start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+        end_date: Annotated[str, "End date in yyyy-mm-dd format (exclusive)"],
+    ) -> pd.DataFrame:
+        """Bars in [start_date, end_date), like yf.download / Ticker.history."""
+        price_frame = self.get_history(symbol, start_date)
+        last_day = (pd.Timestamp(end_date) - pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+        return price_frame.window(start_date, last_day)
+
+
+class LocalPriceDownloader:
+    """
+    Offline stand-in for yf.download that serves bars from local price files.
+
+    Any ``{symbol}-YFin-data*.csv`` file in ``price_dir`` is used. Every call is
+    recorded in ``calls`` so incremental behaviour can be checked.
+    """
+
+    def __init__(self, price_dir: Annotated[str, "directory of offline price files"]):
+        self.price_dir = price_dir
+        self.calls: List[tuple] = []
+
+    def __call__(self, symbol, start=None, end=None, **kwargs) -> pd.DataFrame:
+        self.calls.append((symbol, start, end))
+
+        files = sorted(glob.glob(os.path.join(self.price_dir, f"{symbol}-YFin-data*.csv")))
+        if not files:
+            return pd.DataFrame()
+
+        data = pd.read_csv(files[0])
+        dates = pd.to_datetime(data["Date"].astype(str).str[:10])
+        data = data.drop(columns=["Date", "Adj Close"], errors="ignore")
+        data.index = pd.DatetimeIndex(dates, name="Date")
+
+        if start is not None:
+            data = data[data.index >= pd.Timestamp(start)]
+        if end is not None:
+            data = data[data.index < pd.Timestamp(end)]
+        return data
+
+
+_online_price_cache: Optional[IncrementalPriceCache] = None
+_online_price_cache_lock = threading.Lock()
+
+
+def get_online_price_cache() -> IncrementalPriceCache:
+    """Return the process-wide online price cache under ``data_cache_dir``."""
+    global _online_price_cache
+    cache_dir = get_config()["data_cache_dir"]
+    with _online_price_cache_lock:
+        if _online_price_cache is None or _online_price_cache.cache_dir != cache_dir:
+            _online_price_cache = IncrementalPriceCache(cache_dir)
+        return _online_price_cache
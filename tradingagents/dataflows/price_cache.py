@@ -0,0 +1,155 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Annotated, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .price_store import COLUMNAR_SUFFIX, read_columnar, resolve_price_file
+
+
+class PriceFrame:
+    """A parsed daily price history together with the trading date of each row.
+
+    The frame is shared between all callers through the cache, so it must be
+    treated as read-only: filter or copy it before adding columns.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        # YYYY-MM-DD of every row, parsed once instead of on every tool call
+        if pd.api.types.is_datetime64_dtype(frame["Date"]):
+            self.dates = (
+                frame["Date"].to_numpy().astype("datetime64[D]").astype("U10")
+            )
+        else:
+            self.dates = frame["Date"].astype(str).str[:10].to_numpy(dtype="U10")
+        self.is_sorted = bool(np.all(self.dates[:-1] <= self.dates[1:]))
+        self.nbytes = int(frame.memory_usage(deep=True).sum()) + self.dates.nbytes
+
+    def window(
+        self,
+        start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+        end_date: Annotated[str, "End date in yyyy-mm-dd format (inclusive)"],
+    ) -> pd.DataFrame:
+        """Rows whose date falls in [start_date, end_date], in file order."""
+        if self.is_sorted:
+            lo = np.searchsorted(self.dates, start_date, side="left")
+            hi = np.searchsorted(self.dates, end_date, side="right")
+            return self.frame.iloc[lo:hi]
+
+        return self.frame[(self.dates >= start_date) & (self.dates <= end_date)]
+
+
+class PriceFrameCache:
+    """Process-wide LRU cache of parsed price files keyed by (symbol, source).
+
+    Entries are bounded by their total in-memory size and are reloaded when the
+    backing file's path or modification time changes.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        # loads happen under the lock so that each file is read exactly once
+        # even when several tool calls ask for it concurrently
+        self._lock = threading.RLock()
+
+    def get(
+        self,
+        symbol: Annotated[str, "ticker symbol of the company"],
+        source: Annotated[str, "where the file comes from, e.g. offline or online"],
+        path: Annotated[str, "path of the price file on disk"],
+        loader: Optional[Callable[[str], pd.DataFrame]] = None,
+    ) -> PriceFrame:
+        """Return the cached PriceFrame for a price file, loading it on a miss."""
+        path = os.path.normpath(path)
+        mtime = os.path.getmtime(path)
+        key = (symbol, source)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == path and entry[1] == mtime:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+
+            self.misses += 1
+            if entry is not None:
+                self._remove(key)
+
+            price_frame = PriceFrame((loader or pd.read_csv)(path))
+            self._entries[key] = (path, mtime, price_frame)
+            self.total_bytes += price_frame.nbytes
+            self._evict()
+            return price_frame
+
+    def invalidate(self, symbol: str, source: str) -> None:
+        """Drop the entry of a symbol, e.g. after rewriting its file."""
+        with self._lock:
+            if (symbol, source) in self._entries:
+                self._remove((symbol, source))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "total_bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _remove(self, key) -> None:
+        _, _, price_frame = self._entries.pop(key)
+        self.total_bytes -= price_frame.nbytes
+
+    def _evict(self) -> None:
+        # always keep the most recent entry, even if it alone exceeds the budget
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+
+_price_cache: Optional[PriceFrameCache] = None
+_price_cache_lock = threading.Lock()
+
+
+def get_price_cache() -> PriceFrameCache:
+    """Return the process-wide price cache, creating it from the config."""
+    global _price_cache
+    if _price_cache is None:
+        with _price_cache_lock:
+            if _price_cache is None:
+                _price_cache = PriceFrameCache(get_config()["price_cache_max_bytes"])
+    return _price_cache
+
+
+def load_price_frame(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    source: Annotated[str, "where the file comes from, e.g. offline or online"],
+    path: Annotated[str, "path of the CSV price file on disk"],
+    loader: Optional[Callable[[str], pd.DataFrame]] = None,
+) -> PriceFrame:
+    """
+    Load a price file through the process-wide cache.
+
+    A columnar copy of the file (see price_store) is used instead of the CSV
+    whenever it exists; ``loader`` only applies to CSV files.
+    """
+    path = resolve_price_file(path)
+    if path.endswith(COLUMNAR_SUFFIX):
+        loader = read_columnar
+    return get_price_cache().get(symbol, source, path, loader)
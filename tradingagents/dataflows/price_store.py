@@ -0,0 +1,142 @@
+"""
+Columnar on-disk store for daily price histories.
+
+Price files are kept next to their CSV counterparts as uncompressed Feather
+(Arrow IPC) files with a typed ``Date`` column, so they can be memory-mapped
+instead of parsed. pyarrow is optional: without it every reader keeps using
+the CSV files.
+
+Convert an existing offline price directory with:
+
+    python -m tradingagents.dataflows.price_store <DATA_DIR>/market_data/price_data
+"""
+
+import argparse
+import importlib.util
+import os
+from typing import Annotated, List
+
+import pandas as pd
+
+COLUMNAR_SUFFIX = ".feather"
+
+
+def columnar_available() -> bool:
+    """Whether pyarrow is installed, i.e. columnar files can be read and written."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def columnar_path(path: Annotated[str, "path of a CSV price file"]) -> str:
+    """Path of the columnar file that shadows a CSV price file."""
+    root, _ = os.path.splitext(path)
+    return root + COLUMNAR_SUFFIX
+
+
+def resolve_price_file(path: Annotated[str, "path of a CSV price file"]) -> str:
+    """Prefer the columnar copy of a price file when it exists and can be read."""
+    columnar = columnar_path(path)
+    if columnar != path and os.path.exists(columnar) and columnar_available():
+        return columnar
+    return path
+
+
+def price_file_exists(path: Annotated[str, "path of a CSV price file"]) -> bool:
+    return os.path.exists(path) or os.path.exists(resolve_price_file(path))
+
+
+def read_columnar(path: Annotated[str, "path of a columnar price file"]) -> pd.DataFrame:
+    """Read a columnar price file through a memory map."""
+    from pyarrow import feather
+
+    return feather.read_table(path, memory_map=True).to_pandas()
+
+
+def write_columnar(
+    data: Annotated[pd.DataFrame, "daily price history with a Date column"],
+    path: Annotated[str, "destination columnar file"],
+) -> None:
+    """Atomically write a price history as a columnar file with a typed Date column."""
+    from pyarrow import feather
+
+    data = data.reset_index(drop=True).copy()
+    # daily bars: keep the exchange-local calendar date as a naive timestamp
+    data["Date"] = pd.to_datetime(data["Date"].astype(str).str[:10])
+
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    # uncompressed so that readers can memory-map the columns directly
+    feather.write_feather(data, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+
+
+def read_price_file(path: Annotated[str, "path of a CSV or columnar price file"]) -> pd.DataFrame:
+    if path.endswith(COLUMNAR_SUFFIX):
+        return read_columnar(path)
+    return pd.read_csv(path)
+
+
+def store_price_file(
+    data: Annotated[pd.DataFrame, "daily price history with a Date column"],
+    path: Annotated[str, "path of the CSV price file"],
+) -> str:
+    """Atomically persist downloaded prices, as a columnar file when pyarrow is available.
+
+    Returns:
+        str: the path that was written
+    """
+    if columnar_available():
+        write_columnar(data, columnar_path(path))
+        return columnar_path(path)
+
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    data.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def convert_price_dir(
+    price_dir: Annotated[str, "directory holding *.csv price files"],
+    overwrite: Annotated[bool, "re-convert files that already have a columnar copy"] = False,
+) -> List[str]:
+    """Convert every CSV price file in a directory to a columnar file next to it.
+
+    Returns:
+        List[str]: the columnar files that were written
+    """
+    if not columnar_available():
+        raise ImportError(
+            "pyarrow is required for the columnar price store: pip install pyarrow"
+        )
+
+    written = []
+    for file_name in sorted(os.listdir(price_dir)):
+        if not file_name.endswith(".csv"):
+            continue
+
+        csv_path = os.path.join(price_dir, file_name)
+        target = columnar_path(csv_path)
+        if not overwrite and os.path.exists(target):
+            continue
+
+        write_columnar(pd.read_csv(csv_path), target)
+        written.append(target)
+
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert CSV price files to the columnar price store."
+    )
+    parser.add_argument("price_dirs", nargs="+", help="directories with *.csv price files")
+    parser.add_argument(
+        "--overwrite", action="store_true", help="re-convert existing columnar files"
+    )
+    args = parser.parse_args()
+
+    for price_dir in args.price_dirs:
+        written = convert_price_dir(price_dir, overwrite=args.overwrite)
+        print(f"{price_dir}: converted {len(written)} file(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
+import argparse
+import heapq
 import requests
+import sqlite3
 import time
 import json
 from datetime import datetime, timedelta
-from contextlib import contextmanager
+from contextlib import closing, contextmanager
+from functools import lru_cache
 from typing import Annotated
 import os
 import re
@@ -49,87 +53,380 @@ ticker_to_company = {
 }
 
 
-def fetch_top_from_category(
+REDDIT_INDEX_FILE = "reddit_index.sqlite"
+
+
+def _company_search_terms(query):
+    if "OR" in ticker_to_company[query]:
+        search_terms = ticker_to_company[query].split(" OR ")
+    else:
+        search_terms = [ticker_to_company[query]]
+
+    search_terms.append(query)
+    return search_terms
+
+
+@lru_cache(maxsize=None)
+def _company_pattern(query):
+    """One precompiled case-insensitive alternation of all search terms of a ticker."""
+    return re.compile(
+        "|".join(f"(?:{term})" for term in _company_search_terms(query)),
+        re.IGNORECASE,
+    )
+
+
+def _mentions_company(parsed_line, query):
+    """Whether the title or the content of a post mentions the company (query)."""
+    pattern = _company_pattern(query)
+    return bool(
+        pattern.search(parsed_line["title"])
+        or pattern.search(parsed_line["selftext"])
+    )
+
+
+def _post_date(parsed_line):
+    return datetime.utcfromtimestamp(parsed_line["created_utc"]).strftime("%Y-%m-%d")
+
+
+class RedditIndex:
+    """
+    Offline postings index over the reddit_data corpus.
+
+    For every (category, subreddit file, date) the index keeps the top
+    ``depth`` posts by upvotes, and for company categories it also keeps the
+    top ``depth`` posts per (ticker, date) among the posts mentioning the
+    company. Ranks follow the same stable upvote ordering as
+    fetch_top_from_category, so served results are identical. Each file's
+    mtime and size are recorded and a changed corpus is never served.
+    """
+
+    def __init__(self, data_path, depth=50):
+        self.data_path = data_path
+        self.depth = depth
+        self.path = os.path.join(data_path, REDDIT_INDEX_FILE)
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS files (
+                category TEXT NOT NULL,
+                file_name TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                depth INTEGER NOT NULL,
+                PRIMARY KEY (category, file_name)
+            )"""
+        )
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS posts (
+                category TEXT NOT NULL,
+                file_name TEXT NOT NULL,
+                date TEXT NOT NULL,
+                ticker TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                title TEXT,
+                content TEXT,
+                url TEXT,
+                upvotes INTEGER
+            )"""
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS posts_by_date ON posts (category, ticker, date, rank)"
+        )
+        return conn
+
+    def _top_posts(self, posts):
+        """posts: list of (upvotes, post) in file order -> top ``depth`` in rank order."""
+        # stable sort, like fetch_top_from_category
+        return sorted(posts, key=lambda x: x[0], reverse=True)[: self.depth]
+
+    def build_category(self, category):
+        """(Re)index every subreddit file of a category. Returns the number of files."""
+        category_dir = os.path.join(self.data_path, category)
+        is_company = "company" in category
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM posts WHERE category = ?", (category,))
+            conn.execute("DELETE FROM files WHERE category = ?", (category,))
+
+            indexed = 0
+            for data_file in sorted(os.listdir(category_dir)):
+                if not data_file.endswith(".jsonl"):
+                    continue
+
+                file_path = os.path.join(category_dir, data_file)
+                stat = os.stat(file_path)
+                by_date = {}
+                by_ticker_date = {}
+
+                with open(file_path, "rb") as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+
+                        parsed_line = json.loads(line)
+                        post_date = _post_date(parsed_line)
+                        post = (
+                            parsed_line["ups"],
+                            (
+                                parsed_line["title"],
+                                parsed_line["selftext"],
+                                parsed_line["url"],
+                                parsed_line["ups"],
+                            ),
+                        )
+                        by_date.setdefault(post_date, []).append(post)
+
+                        if is_company:
+                            for ticker in ticker_to_company:
+                                if _mentions_company(parsed_line, ticker):
+                                    by_ticker_date.setdefault(
+                                        (ticker, post_date), []
+                                    ).append(post)
+
+                postings = [("", date, posts) for date, posts in by_date.items()]
+                postings += [
+                    (ticker, date, posts)
+                    for (ticker, date), posts in by_ticker_date.items()
+                ]
+
+                rows = []
+                for ticker, date, posts in postings:
+                    for rank, (_, post) in enumerate(self._top_posts(posts)):
+                        rows.append((category, data_file, date, ticker, rank) + post)
+
+                conn.executemany(
+                    "INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                conn.execute(
+                    "INSERT INTO files VALUES (?, ?, ?, ?, ?)",
+                    (category, data_file, stat.st_mtime, stat.st_size, self.depth),
+                )
+                indexed += 1
+
+        return indexed
+
+    def build(self, categories=None):
+        """Index the given categories (default: every category directory)."""
+        if categories is None:
+            categories = sorted(
+                entry
+                for entry in os.listdir(self.data_path)
+                if os.path.isdir(os.path.join(self.data_path, entry))
+            )
+        return {category: self.build_category(category) for category in categories}
+
+    def _is_current(self, conn, category, data_files, limit_per_subreddit):
+        indexed = {
+            file_name: (mtime, size, depth)
+            for file_name, mtime, size, depth in conn.execute(
+                "SELECT file_name, mtime, size, depth FROM files WHERE category = ?",
+                (category,),
+            )
+        }
+        if set(indexed) != set(data_files):
+            return False
+
+        for data_file in data_files:
+            mtime, size, depth = indexed[data_file]
+            stat = os.stat(os.path.join(self.data_path, category, data_file))
+            if (stat.st_mtime, stat.st_size) != (mtime, size) or depth < limit_per_subreddit:
+                return False
+        return True
+
+    def fetch_range(self, category, start_date, end_date, limit_per_subreddit, query=None):
+        """
+        Top posts per subreddit file for each date in [start_date, end_date].
+
+        Returns:
+            dict: {date: {file_name: [post, ...]}}, or None when the index cannot
+            answer the query exactly (not built, stale, or too shallow).
+        """
+        ticker = query if ("company" in category and query) else ""
+        if ticker and ticker not in ticker_to_company:
+            return None
+
+        category_dir = os.path.join(self.data_path, category)
+        data_files = [f for f in os.listdir(category_dir) if f.endswith(".jsonl")]
+
+        with closing(sqlite3.connect(self.path)) as conn:
+            try:
+                if not self._is_current(conn, category, data_files, limit_per_subreddit):
+                    return None
+            except sqlite3.OperationalError:
+                return None
+
+            rows = conn.execute(
+                "SELECT date, file_name, title, content, url, upvotes FROM posts "
+                "WHERE category = ? AND ticker = ? AND date BETWEEN ? AND ? AND rank < ? "
+                "ORDER BY date, file_name, rank",
+                (category, ticker, start_date, end_date, limit_per_subreddit),
+            ).fetchall()
+
+        result = {}
+        for date, file_name, title, content, url, upvotes in rows:
+            result.setdefault(date, {}).setdefault(file_name, []).append(
+                {
+                    "title": title,
+                    "content": content,
+                    "url": url,
+                    "upvotes": upvotes,
+                    "posted_date": date,
+                }
+            )
+        return result
+
+
+def _top_k_push(heap, k, upvotes, seq, post):
+    """
+    Keep the k posts with the most upvotes in a min-heap. Among equal upvotes the
+    earlier post (lower seq) wins, matching a stable descending sort.
+    """
+    item = (upvotes, -seq, post)
+    if len(heap) < k:
+        heapq.heappush(heap, item)
+    elif item[:2] > heap[0][:2]:
+        heapq.heapreplace(heap, item)
+
+
+def fetch_top_from_category_range(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
     ],
-    date: Annotated[str, "Date to fetch top posts from."],
-    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date to fetch top posts from, yyyy-mm-dd."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
     query: Annotated[str, "Optional query to search for in the subreddit."] = None,
     data_path: Annotated[
         str,
         "Path to the data folder. Default is 'reddit_data'.",
     ] = "reddit_data",
 ):
-    base_path = data_path
+    """
+    fetch_top_from_category for every date in [start_date, end_date] at once.
 
-    all_content = []
+    Each subreddit file is streamed a single time for the whole range, keeping
+    a bounded top-k heap per date.
+
+    Returns:
+        dict: {date: posts}, where posts is exactly what
+        fetch_top_from_category(category, date, ...) returns. Dates without
+        posts are omitted.
+    """
+    base_path = data_path
+    data_files = os.listdir(os.path.join(base_path, category))
 
-    if max_limit < len(os.listdir(os.path.join(base_path, category))):
+    if max_limit < len(data_files):
         raise ValueError(
             "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
         )
 
-    limit_per_subreddit = max_limit // len(
-        os.listdir(os.path.join(base_path, category))
-    )
+    limit_per_subreddit = max_limit // len(data_files)
 
-    for data_file in os.listdir(os.path.join(base_path, category)):
-        # check if data_file is a .jsonl file
-        if not data_file.endswith(".jsonl"):
-            continue
+    posts_per_date = None
+    # answer from the postings index when it has been built (see RedditIndex)
+    index = RedditIndex(base_path)
+    if index.exists():
+        posts_per_date = index.fetch_range(
+            category, start_date, end_date, limit_per_subreddit, query
+        )
 
-        all_content_curr_subreddit = []
+    if posts_per_date is None:
+        posts_per_date = {}
+        match_company = "company" in category and query
 
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
+        for data_file in data_files:
+            # check if data_file is a .jsonl file
+            if not data_file.endswith(".jsonl"):
+                continue
 
-                parsed_line = json.loads(line)
+            heaps = {}
+            with open(os.path.join(base_path, category, data_file), "rb") as f:
+                for seq, line in enumerate(f):
+                    # skip empty lines
+                    if not line.strip():
+                        continue
 
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
-                    continue
+                    parsed_line = json.loads(line)
 
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
+                    # select only lines that are within the date range
+                    post_date = _post_date(parsed_line)
+                    if not start_date <= post_date <= end_date:
                         continue
 
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
-
-                all_content_curr_subreddit.append(post)
+                    # if is company_news, check that the title or the content has the company's name (query) mentioned
+                    if match_company and not _mentions_company(parsed_line, query):
+                        continue
 
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
+                    post = {
+                        "title": parsed_line["title"],
+                        "content": parsed_line["selftext"],
+                        "url": parsed_line["url"],
+                        "upvotes": parsed_line["ups"],
+                        "posted_date": post_date,
+                    }
+                    _top_k_push(
+                        heaps.setdefault(post_date, []),
+                        limit_per_subreddit,
+                        post["upvotes"],
+                        seq,
+                        post,
+                    )
 
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
+            for post_date, heap in heaps.items():
+                posts_per_date.setdefault(post_date, {})[data_file] = [
+                    post for _, _, post in sorted(heap, reverse=True)
+                ]
 
+    # subreddits in directory order for each date, like the per-day scan
+    all_content = {}
+    for post_date in sorted(posts_per_date):
+        posts_per_file = posts_per_date[post_date]
+        all_content[post_date] = [
+            post
+            for data_file in data_files
+            for post in posts_per_file.get(data_file, [])
+        ]
     return all_content
+
+
+def fetch_top_from_category(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    date: Annotated[str, "Date to fetch top posts from."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    return fetch_top_from_category_range(
+        category, date, date, max_limit, query, data_path
+    ).get(date, [])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the reddit postings index for fetch_top_from_category."
+    )
+    parser.add_argument("data_path", help="reddit_data directory")
+    parser.add_argument(
+        "--categories", nargs="*", help="categories to index (default: all)"
+    )
+    parser.add_argument(
+        "--depth", type=int, default=50, help="posts kept per subreddit and date"
+    )
+    args = parser.parse_args()
+
+    built = RedditIndex(args.data_path, depth=args.depth).build(args.categories)
+    for category, files in built.items():
+        print(f"{category}: indexed {files} file(s)")
+
+
+if __name__ == "__main__":
+    main()
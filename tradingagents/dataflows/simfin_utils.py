@@ -0,0 +1,225 @@
+"""
+Indexed store of the US-wide SimFin statement files.
+
+Every statement file is parsed once per process, stably sorted by
+(Ticker, Publish Date) and kept in memory, so "latest statement published on
+or before a date" is a binary search inside the ticker's row range instead of
+a full CSV read per call. With pyarrow installed the parsed and sorted tables
+can also be persisted next to the CSVs as columnar files:
+
+    python -m tradingagents.dataflows.simfin_utils <DATA_DIR>
+"""
+
+import argparse
+import os
+import threading
+from typing import Annotated, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .price_store import columnar_available, columnar_path
+
+# statement -> (directory under simfin_data_all, file prefix)
+SIMFIN_STATEMENTS = {
+    "balance_sheet": ("balance_sheet", "us-balance"),
+    "cashflow": ("cash_flow", "us-cashflow"),
+    "income": ("income_statements", "us-income"),
+}
+
+# original row labels are kept in the columnar file under this column
+_ROW_LABEL = "__row__"
+
+
+def simfin_path(
+    data_dir: Annotated[str, "data directory containing fundamental_data/"],
+    statement: Annotated[str, "balance_sheet, cashflow or income"],
+    freq: Annotated[str, "annual / quarterly"],
+) -> str:
+    directory, prefix = SIMFIN_STATEMENTS[statement]
+    return os.path.join(
+        data_dir,
+        "fundamental_data",
+        "simfin_data_all",
+        directory,
+        "companies",
+        "us",
+        f"{prefix}-{freq}.csv",
+    )
+
+
+def _read_statement_csv(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path, sep=";")
+
+    # Convert date strings to datetime objects and remove any time components
+    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+
+    # rows without a ticker or publish date can never be the latest statement
+    df = df[df["Ticker"].notna() & df["Publish Date"].notna()]
+    # stable, so rows published on the same day keep their file order
+    return df.sort_values(["Ticker", "Publish Date"], kind="mergesort")
+
+
+class SimFinTable:
+    """
+    One statement file sorted by (Ticker, Publish Date).
+
+    The rows keep their original index labels, so a selected statement prints
+    exactly like a row of the unsorted CSV.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self.publish_dates = frame["Publish Date"].to_numpy(dtype="datetime64[ns]")
+
+        # [lo, hi) row range of every ticker
+        tickers = frame["Ticker"].to_numpy()
+        boundaries = np.flatnonzero(tickers[1:] != tickers[:-1]) + 1
+        self.ranges: Dict[str, Tuple[int, int]] = {
+            tickers[lo]: (int(lo), int(hi))
+            for lo, hi in zip(np.r_[0, boundaries], np.r_[boundaries, len(tickers)])
+            if hi > lo
+        }
+
+    def latest(
+        self,
+        ticker: Annotated[str, "ticker symbol"],
+        curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+    ) -> Optional[pd.Series]:
+        """The statement with the latest Publish Date on or before curr_date, if any."""
+        if ticker not in self.ranges:
+            return None
+
+        lo, hi = self.ranges[ticker]
+        curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+        curr = np.datetime64(curr_date_dt.tz_convert(None), "ns")
+
+        dates = self.publish_dates[lo:hi]
+        pos = np.searchsorted(dates, curr, side="right") - 1
+        if pos < 0:
+            return None
+
+        # the first of several statements published on that day, like idxmax
+        pos = np.searchsorted(dates, dates[pos], side="left")
+        return self.frame.iloc[lo + pos]
+
+
+def _read_statement_columnar(path: str) -> pd.DataFrame:
+    from pyarrow import feather
+
+    frame = feather.read_table(path, memory_map=True).to_pandas()
+    frame.index = pd.Index(frame.pop(_ROW_LABEL).to_numpy())
+    return frame
+
+
+def write_statement_columnar(
+    csv_path: Annotated[str, "path of a SimFin statement CSV"],
+) -> str:
+    """Atomically persist the parsed and sorted statement file next to its CSV."""
+    from pyarrow import feather
+
+    frame = _read_statement_csv(csv_path)
+    frame.insert(0, _ROW_LABEL, frame.index.to_numpy())
+
+    path = columnar_path(csv_path)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    feather.write_feather(
+        frame.reset_index(drop=True), tmp_path, compression="uncompressed"
+    )
+    os.replace(tmp_path, path)
+    return path
+
+
+def _resolve_statement_file(csv_path: str) -> str:
+    columnar = columnar_path(csv_path)
+    if (
+        columnar_available()
+        and os.path.exists(columnar)
+        and os.path.getmtime(columnar) >= os.path.getmtime(csv_path)
+    ):
+        return columnar
+    return csv_path
+
+
+class SimFinStore:
+    """Process-wide cache of SimFinTables, reloaded when the backing file changes."""
+
+    def __init__(self):
+        self._tables: Dict[str, Tuple[str, float, SimFinTable]] = {}
+        # loads happen under the lock so that each file is parsed exactly once
+        self._lock = threading.Lock()
+
+    def table(
+        self,
+        data_dir: Annotated[str, "data directory containing fundamental_data/"],
+        statement: Annotated[str, "balance_sheet, cashflow or income"],
+        freq: Annotated[str, "annual / quarterly"],
+    ) -> SimFinTable:
+        csv_path = simfin_path(data_dir, statement, freq)
+        path = _resolve_statement_file(csv_path)
+        mtime = os.path.getmtime(path)
+
+        with self._lock:
+            entry = self._tables.get(csv_path)
+            if entry is not None and entry[0] == path and entry[1] == mtime:
+                return entry[2]
+
+            if path == csv_path:
+                frame = _read_statement_csv(path)
+            else:
+                frame = _read_statement_columnar(path)
+            table = SimFinTable(frame)
+            self._tables[csv_path] = (path, mtime, table)
+            return table
+
+    def latest(
+        self,
+        data_dir: Annotated[str, "data directory containing fundamental_data/"],
+        statement: Annotated[str, "balance_sheet, cashflow or income"],
+        ticker: Annotated[str, "ticker symbol"],
+        freq: Annotated[str, "annual / quarterly"],
+        curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+    ) -> Optional[pd.Series]:
+        return self.table(data_dir, statement, freq).latest(ticker, curr_date)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tables.clear()
+
+
+_simfin_store: Optional[SimFinStore] = None
+_simfin_store_lock = threading.Lock()
+
+
+def get_simfin_store() -> SimFinStore:
+    """Return the process-wide SimFin store."""
+    global _simfin_store
+    if _simfin_store is None:
+        with _simfin_store_lock:
+            if _simfin_store is None:
+                _simfin_store = SimFinStore()
+    return _simfin_store
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert the SimFin statement CSVs to sorted columnar files."
+    )
+    parser.add_argument("data_dir", help="data directory containing fundamental_data/")
+    args = parser.parse_args()
+
+    if not columnar_available():
+        raise ImportError(
+            "pyarrow is required for the columnar SimFin store: pip install pyarrow"
+        )
+
+    for statement in SIMFIN_STATEMENTS:
+        for freq in ["annual", "quarterly"]:
+            csv_path = simfin_path(args.data_dir, statement, freq)
+            if os.path.exists(csv_path):
+                print(write_statement_columnar(csv_path))
+
+
+if __name__ == "__main__":
+    main()
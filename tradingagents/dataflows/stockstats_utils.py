@@ -1,21 +1,15 @@
 import pandas as pd
-import yfinance as yf
 from stockstats import wrap
 from typing import Annotated
 import os
-from .config import get_config
+from .online_price_cache import get_online_price_cache
+from .price_cache import PriceFrame, load_price_frame
 
 
 class StockstatsUtils:
     @staticmethod
-    def get_stock_stats(
+    def load_price_frame(
         symbol: Annotated[str, "ticker symbol for the company"],
-        indicator: Annotated[
-            str, "quantitative indicators based off of the stock data for the company"
-        ],
-        curr_date: Annotated[
-            str, "curr date for retrieving stock price data, YYYY-mm-dd"
-        ],
         data_dir: Annotated[
             str,
             "directory where the stock data is stored.",
@@ -24,64 +18,94 @@ class StockstatsUtils:
             bool,
             "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
         ] = False,
-    ):
-        df = None
-        data = None
-
+    ) -> PriceFrame:
+        """Load the daily price history used to compute indicators through the price cache."""
         if not online:
             try:
-                data = pd.read_csv(
+                return load_price_frame(
+                    symbol,
+                    "offline",
                     os.path.join(
                         data_dir,
                         f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                    )
+                    ),
                 )
-                df = wrap(data)
-            except FileNotFoundError:
-                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-        else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
+            except FileNotFoundError as e:
+                # still a FileNotFoundError, callers of the window lookup rely on it
+                raise FileNotFoundError(
+                    "Stockstats fail: Yahoo Finance data not fetched yet!"
+                ) from e
 
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
+        # one incrementally updated history per symbol under data_cache_dir
+        return get_online_price_cache().get_history(symbol)
 
-            # Get config and ensure cache directory exists
-            config = get_config()
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
-
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
-
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
-
-            df = wrap(data)
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
+    @staticmethod
+    def get_stock_stats(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        curr_date: Annotated[
+            str, "curr date for retrieving stock price data, YYYY-mm-dd"
+        ],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ):
+        price_frame = StockstatsUtils.load_price_frame(symbol, data_dir, online)
+        curr_date = pd.to_datetime(curr_date).strftime("%Y-%m-%d")
 
+        # wrap() copies the frame, so the cached prices are left untouched
+        df = wrap(price_frame.frame)
         df[indicator]  # trigger stockstats to calculate the indicator
-        matching_rows = df[df["Date"].str.startswith(curr_date)]
+        matching_rows = df[price_frame.dates == curr_date]
 
         if not matching_rows.empty:
             indicator_value = matching_rows[indicator].values[0]
             return indicator_value
         else:
             return "N/A: Not a trading day (weekend or holiday)"
+
+    @staticmethod
+    def get_stock_stats_window(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        start_date: Annotated[str, "first date of the window, YYYY-mm-dd"],
+        end_date: Annotated[str, "last date of the window (inclusive), YYYY-mm-dd"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> pd.Series:
+        """
+        Compute an indicator for every trading day in [start_date, end_date].
+
+        The price history is loaded and the indicator column is computed once
+        over the full history, so each value is identical to what
+        get_stock_stats returns for that day.
+
+        Returns:
+            pd.Series: indicator values indexed by YYYY-mm-dd date strings,
+            containing trading days only.
+        """
+        price_frame = StockstatsUtils.load_price_frame(symbol, data_dir, online)
+        dates = price_frame.dates
+
+        values = wrap(price_frame.frame)[indicator].to_numpy()
+
+        in_window = (dates >= start_date) & (dates <= end_date)
+        window = pd.Series(values[in_window], index=dates[in_window])
+
+        # keep the first row for a date, like the per-day lookup does
+        return window[~window.index.duplicated(keep="first")]
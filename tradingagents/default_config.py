@@ -21,10 +21,49 @@ DEFAULT_CONFIG = {
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    "parallel_analysts": False, # Run the selected analysts concurrently instead of one after another
+    "batch_max_workers": 4, # Concurrent (ticker, date) jobs in a batch run
+    # Analyst report summarization
+    "report_summary_strategy": "extractive", # "extractive" (no LLM call), "llm" or "auto" (extractive unless headers and table alone exceed the budget)
+    "report_summary_max_length": 1500, # Reports up to this many characters are kept as is
+    # Signal extraction
+    "signal_fast_path": True, # Read BUY/SELL/HOLD from the final decision directly, asking the LLM only when it is ambiguous
+    "signal_min_confidence": 0.8, # Confidence the fast path needs, 1.0 only trusts explicit final transaction proposals
     # LLM Timeout
     "llm_timeout": 1200, # Default to 20 minutes
+    # Memory settings
+    "memory_backend": "numpy", # "numpy" (in-process vector index) or "chroma" (requires chromadb)
+    "memory_dir": None, # Directory of the persistent agent memories, None keeps them in process memory only
+    "embedding_cache_max_entries": 4096, # In-memory LRU of embeddings shared by all memories
+    "embedding_cache_path": None, # SQLite file keeping embeddings across processes, None for memory only
+    # State log settings
+    "state_log_compression": None, # gzip level 1-9 of the per-ticker state log (full_states_log.jsonl.gz), None writes plain JSONL
+    # Checkpoint settings
+    "checkpointer": None, # None (disabled), "memory" or "sqlite" (requires langgraph-checkpoint-sqlite); lets interrupted runs resume
+    "checkpoint_path": None, # SQLite file, defaults to <data_cache_dir>/checkpoints.sqlite
+    "checkpoint_keep_finished": None, # Keep the checkpoints of finished runs for replay_from; None keeps them with "sqlite" and drops them with "memory", which would otherwise grow with every run
+    # Profiling settings
+    "run_profile": True, # Record per-node and per-tool time, tokens and cost of every run to run_profiles.jsonl next to the state log
+    "run_profile_spans": False, # Also log every node, LLM and tool call span to run_profiles.jsonl, not only the totals
+    "run_profile_otel": False, # Also export each run as OpenTelemetry spans (requires opentelemetry-api and a configured tracer provider)
+    "llm_prices": { # USD per 1M (prompt, completion) tokens, used for the cost in run profiles
+        "gpt-4o-mini": (0.15, 0.60),
+        "o4-mini": (1.10, 4.40),
+    },
     # Tool settings
     "online_tools": True,
+    # Data cache settings
+    "price_cache_max_bytes": 512 * 1024 * 1024, # In-memory budget for parsed price files
+    # LLM response cache settings
+    "llm_cache": None, # None (disabled), "memory", "sqlite" or "redis"
+    "llm_cache_mode": "read_write", # "read_write", "record" (always call the model) or "replay" (offline, a miss raises)
+    "llm_cache_ttl": None, # Seconds before a cached response expires, None to keep it forever
+    "llm_cache_max_entries": 10000, # LRU bound of the memory and sqlite backends
+    "llm_cache_path": None, # SQLite file, defaults to <data_cache_dir>/llm_cache.sqlite
+    "llm_cache_redis_url": "redis://localhost:6379/0",
     # Proxy settings
     "proxies": None, # Can be a dictionary like {"http": "http://proxy.example.com", "https": "http://proxy.example.com"}
+    # HTTP connection pool settings, shared by all LLM and embedding clients
+    "http_max_connections": 20,
+    "http_max_keepalive_connections": 10,
 }
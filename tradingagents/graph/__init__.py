@@ -6,6 +6,8 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .batch import BatchJob, BatchResult, BatchRunner
+from .backtest import Backtester, BacktestResult
 
 __all__ = [
     "TradingAgentsGraph",
@@ -14,4 +16,9 @@ __all__ = [
     "Propagator",
     "Reflector",
     "SignalProcessor",
+    "BatchJob",
+    "BatchResult",
+    "BatchRunner",
+    "Backtester",
+    "BacktestResult",
 ]
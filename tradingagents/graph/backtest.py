@@ -0,0 +1,278 @@
+# TradingAgents/graph/backtest.py
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import pandas as pd
+
+from tradingagents.dataflows.config import get_config
+from tradingagents.dataflows.stockstats_utils import StockstatsUtils
+
+# parts of the final state the reflector reads; journaled so runs can resume
+REFLECTION_STATE_KEYS = [
+    "company_of_interest",
+    "trade_date",
+    "market_report",
+    "sentiment_report",
+    "news_report",
+    "fundamentals_report",
+    "trader_investment_plan",
+    "final_trade_decision",
+]
+
+
+def signal_to_position(signal: str) -> int:
+    """BUY -> 1 (long), SELL -> -1 (short), anything else (HOLD) -> 0."""
+    signal = signal.upper()
+    if "BUY" in signal:
+        return 1
+    if "SELL" in signal:
+        return -1
+    return 0
+
+
+def _reflection_state(final_state: Dict[str, Any]) -> Dict[str, Any]:
+    state = {key: final_state[key] for key in REFLECTION_STATE_KEYS}
+    state["investment_debate_state"] = {
+        key: final_state["investment_debate_state"][key]
+        for key in ["bull_history", "bear_history", "judge_decision"]
+    }
+    state["risk_debate_state"] = {
+        "judge_decision": final_state["risk_debate_state"]["judge_decision"]
+    }
+    return state
+
+
+class Decision(NamedTuple):
+    ticker: str
+    trade_date: str
+    signal: str
+    position: int
+    state: Dict[str, Any]
+
+
+class BacktestResult(NamedTuple):
+    """
+    decisions: one row per (ticker, trade_date) with the signal, the position
+        and the forward return over the holding period.
+    equity_curve: equity of every ticker and of the equal-weighted portfolio,
+        starting at 1.0, holding each day's position until the next close.
+    """
+
+    decisions: pd.DataFrame
+    equity_curve: pd.DataFrame
+
+
+class Backtester:
+    """
+    Walk-forward backtest of a TradingAgentsGraph over a ticker universe.
+
+    Trading days come from the cached price data of each ticker. Days are
+    processed in order; on each day all tickers are propagated in parallel and
+    then, in ticker order, the decision taken ``holding_days`` trading days
+    earlier is reflected on with its now realized return. Memories are thus
+    only ever updated with information available on that day.
+
+    Every decision and reflection is appended to a JSONL journal; restarting
+    with the same journal skips completed work and replays the journaled
+    reflections into memory instead of calling the LLM again.
+    """
+
+    def __init__(
+        self,
+        graph,
+        tickers: List[str],
+        start_date: str,
+        end_date: str,
+        holding_days: int = 1,
+        journal_path: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        reflect: bool = True,
+    ):
+        self.graph = graph
+        self.tickers = list(tickers)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.holding_days = holding_days
+        self.journal_path = journal_path
+        self.max_workers = max_workers or min(
+            len(self.tickers), get_config().get("batch_max_workers", 4)
+        )
+        self.reflect = reflect
+        self._journal_lock = threading.Lock()
+
+    def _load_closes(self, ticker: str) -> pd.Series:
+        """Closing prices indexed by YYYY-MM-DD, from the cached price data."""
+        price_frame = StockstatsUtils.load_price_frame(
+            ticker,
+            os.path.join(get_config()["data_dir"], "market_data", "price_data"),
+            self.graph.config["online_tools"],
+        )
+        column = "Adj Close" if "Adj Close" in price_frame.frame.columns else "Close"
+        closes = pd.Series(
+            price_frame.frame[column].to_numpy(dtype=float), index=price_frame.dates
+        )
+        closes = closes[~closes.index.duplicated(keep="first")]
+        return closes.sort_index()
+
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        if self.journal_path is None or not os.path.exists(self.journal_path):
+            return []
+        records, end = [], 0
+        with open(self.journal_path, "r+b") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn by a crash during the append
+                if line.strip():
+                    records.append(json.loads(line))
+                end += len(line)
+            # cut the torn line, the next record would be appended to it
+            f.truncate(end)
+        return records
+
+    def _append_journal(self, record: Dict[str, Any]) -> None:
+        if self.journal_path is None:
+            return
+        with self._journal_lock:
+            with open(self.journal_path, "a") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _propagate(self, ticker: str, trade_date: str) -> Decision:
+        final_state, signal = self.graph.run(ticker, trade_date)
+        return Decision(
+            ticker,
+            trade_date,
+            signal,
+            signal_to_position(signal),
+            _reflection_state(final_state),
+        )
+
+    def run(self) -> BacktestResult:
+        closes = {ticker: self._load_closes(ticker) for ticker in self.tickers}
+        calendars = {ticker: list(series.index) for ticker, series in closes.items()}
+        positions = {
+            ticker: {day: index for index, day in enumerate(calendar)}
+            for ticker, calendar in calendars.items()
+        }
+        days = sorted(
+            {
+                day
+                for calendar in calendars.values()
+                for day in calendar
+                if self.start_date <= day <= self.end_date
+            }
+        )
+
+        # resume: completed decisions and reflections, memories replayed in order;
+        # memories are content-addressed, so replaying into a persistent memory
+        # that already holds them adds nothing
+        decisions: Dict[tuple, Decision] = {}
+        reflected = set()
+        for record in self._read_journal():
+            key = (record["ticker"], record["trade_date"])
+            if record["type"] == "decision":
+                decisions[key] = Decision(
+                    record["ticker"],
+                    record["trade_date"],
+                    record["signal"],
+                    record["position"],
+                    record["state"],
+                )
+            elif record["type"] == "reflection":
+                for memory_name, (situation, reflection) in record["memories"].items():
+                    getattr(self.graph, memory_name).add_situations(
+                        [(situation, reflection)]
+                    )
+                reflected.add(key)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for day in days:
+                trading = [t for t in self.tickers if day in positions[t]]
+
+                pending = [t for t in trading if (t, day) not in decisions]
+                for decision in executor.map(
+                    lambda ticker: self._propagate(ticker, day), pending
+                ):
+                    decisions[(decision.ticker, day)] = decision
+                    self._append_journal({"type": "decision", **decision._asdict()})
+
+                if not self.reflect:
+                    continue
+
+                # reflect on the decisions whose holding period ends today
+                for ticker in trading:
+                    index = positions[ticker][day] - self.holding_days
+                    if index < 0:
+                        continue
+                    decision_day = calendars[ticker][index]
+                    key = (ticker, decision_day)
+                    if key not in decisions or key in reflected:
+                        continue
+
+                    decision = decisions[key]
+                    returns = decision.position * (
+                        closes[ticker][day] / closes[ticker][decision_day] - 1
+                    )
+                    memories = self.graph.reflect_and_remember(
+                        returns, decision.state
+                    )
+                    reflected.add(key)
+                    self._append_journal(
+                        {
+                            "type": "reflection",
+                            "ticker": ticker,
+                            "trade_date": decision_day,
+                            "reflected_on": day,
+                            "returns": returns,
+                            "memories": memories,
+                        }
+                    )
+
+        return self._summarize(decisions, closes, calendars, positions)
+
+    def _summarize(self, decisions, closes, calendars, positions) -> BacktestResult:
+        rows = []
+        daily_returns = {}
+        for ticker in self.tickers:
+            calendar = calendars[ticker]
+            series = {}
+            for (decision_ticker, day), decision in decisions.items():
+                if decision_ticker != ticker or not self.start_date <= day <= self.end_date:
+                    continue
+                index = positions[ticker][day]
+
+                forward_return = None
+                if index + self.holding_days < len(calendar):
+                    exit_day = calendar[index + self.holding_days]
+                    forward_return = closes[ticker][exit_day] / closes[ticker][day] - 1
+
+                rows.append(
+                    {
+                        "ticker": ticker,
+                        "trade_date": day,
+                        "signal": decision.signal,
+                        "position": decision.position,
+                        "forward_return": forward_return,
+                    }
+                )
+
+                # the position is held from this close to the next one
+                if index + 1 < len(calendar):
+                    next_day = calendar[index + 1]
+                    series[next_day] = decision.position * (
+                        closes[ticker][next_day] / closes[ticker][day] - 1
+                    )
+            daily_returns[ticker] = pd.Series(series, dtype=float)
+
+        returns = pd.DataFrame(daily_returns).sort_index()
+        returns["portfolio"] = returns.mean(axis=1)
+        equity_curve = (1 + returns.fillna(0.0)).cumprod()
+
+        decisions_frame = pd.DataFrame(
+            rows,
+            columns=["ticker", "trade_date", "signal", "position", "forward_return"],
+        ).sort_values(["trade_date", "ticker"], ignore_index=True)
+        return BacktestResult(decisions_frame, equity_curve)
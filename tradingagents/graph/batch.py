@@ -0,0 +1,101 @@
+# TradingAgents/graph/batch.py
+
+import csv
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class BatchJob(NamedTuple):
+    """One (ticker, date) to analyze."""
+
+    ticker: str
+    trade_date: str
+
+
+class BatchResult(NamedTuple):
+    """Outcome of a BatchJob; ``error`` is set instead of the state on failure."""
+
+    job: BatchJob
+    decision: Optional[str]
+    final_state: Optional[Dict[str, Any]]
+    error: Optional[str]
+    elapsed: float
+
+    def to_record(self) -> Dict[str, Any]:
+        """A JSON-serializable summary of the result."""
+        record = {
+            "ticker": self.job.ticker,
+            "trade_date": self.job.trade_date,
+            "decision": self.decision,
+            "elapsed": round(self.elapsed, 3),
+        }
+        if self.error is not None:
+            record["error"] = self.error
+        else:
+            record["final_trade_decision"] = self.final_state["final_trade_decision"]
+        return record
+
+
+def load_jobs(path: str, default_date: Optional[str] = None) -> List[BatchJob]:
+    """
+    Read jobs from a file with one ``TICKER[,YYYY-MM-DD]`` per line.
+
+    Lines without a date use ``default_date``; blank lines and lines starting
+    with ``#`` are skipped.
+    """
+    jobs = []
+    with open(path, "r", newline="") as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip() or row[0].strip().startswith("#"):
+                continue
+
+            ticker = row[0].strip().upper()
+            trade_date = row[1].strip() if len(row) > 1 and row[1].strip() else default_date
+            if trade_date is None:
+                raise ValueError(f"No trade date for {ticker} in {path}")
+            jobs.append(BatchJob(ticker, trade_date))
+    return jobs
+
+
+class BatchRunner:
+    """
+    Runs many (ticker, date) jobs over one TradingAgentsGraph.
+
+    The graph, and with it the LLM clients, toolkit and data caches, is shared
+    by a pool of worker threads. Every job goes through
+    ``TradingAgentsGraph.run``, which keeps no per-run state on the instance.
+    """
+
+    def __init__(self, graph, max_workers: int = 4):
+        self.graph = graph
+        self.max_workers = max_workers
+
+    def _run_job(self, job: BatchJob) -> BatchResult:
+        start = time.perf_counter()
+        try:
+            final_state, decision = self.graph.run(job.ticker, job.trade_date)
+        except Exception:
+            # one failing ticker must not take the whole batch down
+            return BatchResult(
+                job, None, None, traceback.format_exc(), time.perf_counter() - start
+            )
+        return BatchResult(job, decision, final_state, None, time.perf_counter() - start)
+
+    def run(self, jobs: Iterable[Tuple[str, str]]) -> Iterator[BatchResult]:
+        """Run the jobs and yield their results in order of completion.
+
+        A (ticker, date) listed twice runs once: both runs would share its
+        checkpoint thread.
+        """
+        jobs = list(dict.fromkeys(BatchJob(*job) for job in jobs))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._run_job, job) for job in jobs]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                # the caller stopped early: drop the jobs that have not started
+                for future in futures:
+                    future.cancel()
@@ -0,0 +1,81 @@
+# TradingAgents/graph/checkpointing.py
+
+import asyncio
+import os
+import sqlite3
+from typing import Any, Dict, Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+CHECKPOINTERS = ("memory", "sqlite")
+
+
+def _threaded_sqlite_saver(path: str) -> BaseCheckpointSaver:
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    class ThreadedSqliteSaver(SqliteSaver):
+        """SqliteSaver whose async methods run the sync ones in a worker thread,
+        so that apropagate can share the same file as propagate."""
+
+        async def aget_tuple(self, config):
+            return await asyncio.to_thread(self.get_tuple, config)
+
+        async def alist(self, config, *, filter=None, before=None, limit=None):
+            checkpoints = await asyncio.to_thread(
+                lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+            )
+            for checkpoint in checkpoints:
+                yield checkpoint
+
+        async def aput(self, config, checkpoint, metadata, new_versions):
+            return await asyncio.to_thread(
+                self.put, config, checkpoint, metadata, new_versions
+            )
+
+        async def aput_writes(self, config, writes, task_id, task_path=""):
+            return await asyncio.to_thread(
+                self.put_writes, config, writes, task_id, task_path
+            )
+
+        async def adelete_thread(self, thread_id):
+            return await asyncio.to_thread(self.delete_thread, thread_id)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # batch runs write checkpoints from several threads; SqliteSaver serializes them
+    return ThreadedSqliteSaver(sqlite3.connect(path, check_same_thread=False))
+
+
+def create_checkpointer(config: Dict[str, Any]) -> Optional[BaseCheckpointSaver]:
+    """
+    Build the graph checkpointer described by the ``checkpointer`` settings,
+    None when disabled. "memory" keeps the checkpoints in the process, which
+    suits interactive sessions; backtests and batch runs should use "sqlite",
+    which keeps them on disk and needs langgraph-checkpoint-sqlite.
+    """
+    name = config.get("checkpointer")
+    if not name:
+        return None
+
+    if name == "memory":
+        from langgraph.checkpoint.memory import MemorySaver
+
+        return MemorySaver()
+    if name == "sqlite":
+        path = config.get("checkpoint_path") or os.path.join(
+            config["data_cache_dir"], "checkpoints.sqlite"
+        )
+        return _threaded_sqlite_saver(path)
+    raise ValueError(f"Unsupported checkpointer: {name}, expected one of {CHECKPOINTERS}")
+
+
+def keep_finished_threads(config: Dict[str, Any]) -> bool:
+    """
+    Whether the checkpoints of a run are kept after it finished, so that
+    replay_from can fork it later. ``checkpoint_keep_finished`` decides; by
+    default "memory" drops them, or every run of a backtest would stay in the
+    process for good, and "sqlite" keeps them.
+    """
+    keep = config.get("checkpoint_keep_finished")
+    if keep is None:
+        return config.get("checkpointer") != "memory"
+    return bool(keep)
@@ -0,0 +1,304 @@
+# TradingAgents/graph/profiling.py
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from tradingagents.agents.utils.memory import EMBEDDING_EVENT
+
+
+# counters that are not counts
+_MEASURES = {"wall_time", "llm_time", "embedding_time", "cost"}
+
+
+def _counters() -> Dict[str, float]:
+    return defaultdict(float)
+
+
+def _totals(counters: Dict[str, float]) -> Dict[str, float]:
+    return {
+        key: value if key in _MEASURES else int(value) for key, value in counters.items()
+    }
+
+
+def _token_usage(response) -> tuple:
+    """(prompt tokens, completion tokens, cache hit) of an LLM result."""
+    prompt_tokens = completion_tokens = 0
+    cache_hit = False
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+                # LangChain zeroes total_cost on responses served from the cache
+                cache_hit = cache_hit or usage.get("total_cost") == 0
+    if not prompt_tokens and not completion_tokens:
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+    return prompt_tokens, completion_tokens, cache_hit
+
+
+class RunProfiler(BaseCallbackHandler):
+    """
+    Callback handler that profiles one graph run.
+
+    Pass it in the ``callbacks`` of the run config. It records the wall time
+    of every graph node and tool, the LLM calls with their prompt and
+    completion tokens, cache hits, errors and retries, and the embedding
+    requests of the agent memories, attributed to the node that made them.
+    ``profile()`` returns the totals as a JSON-serializable dict, including
+    one span per node, LLM and tool call for export_otel_spans.
+
+    ``prices`` maps model names to (USD per 1M prompt tokens, USD per 1M
+    completion tokens); calls of other models are not costed.
+    """
+
+    def __init__(self, prices: Optional[Dict[str, Any]] = None):
+        self.prices = prices or {}
+        self.started_at = time.time()
+        self.ticker = None
+        self.trade_date = None
+        self._start = time.perf_counter()
+        self._nodes = defaultdict(_counters)
+        self._tools = defaultdict(_counters)
+        self._llm = _counters()
+        self._embeddings = _counters()
+        self._spans: List[Dict[str, Any]] = []
+        self._open: Dict[UUID, Dict[str, Any]] = {}  # run id -> span being timed
+        self._parents: Dict[UUID, Optional[UUID]] = {}
+        self._lock = threading.Lock()
+
+    # spans
+
+    def _timed_parent(self, parent_run_id: Optional[UUID]) -> Optional[UUID]:
+        # nearest ancestor that is a span; chains in between are not recorded
+        while parent_run_id is not None and parent_run_id not in self._open:
+            parent_run_id = self._parents.get(parent_run_id)
+        return parent_run_id
+
+    def _start_span(self, run_id, parent_run_id, name, kind, node, **attributes):
+        parent = self._timed_parent(parent_run_id)
+        self._open[run_id] = {
+            "name": name,
+            "kind": kind,
+            "node": node,
+            "id": str(run_id),
+            "parent": str(parent) if parent is not None else None,
+            "start": time.time(),
+            "attributes": attributes,
+        }
+
+    def _end_span(self, run_id, error: Optional[BaseException] = None):
+        span = self._open.pop(run_id, None)
+        if span is not None:
+            span["end"] = time.time()
+            if error is not None:
+                span["error"] = repr(error)
+            self._spans.append(span)
+        return span
+
+    # graph nodes
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        with self._lock:
+            self._parents[run_id] = parent_run_id
+            if parent_run_id is None and isinstance(inputs, dict):
+                self.ticker = inputs.get("company_of_interest", self.ticker)
+                self.trade_date = inputs.get("trade_date", self.trade_date)
+            # a node's own runnable is named after it; the node of a subgraph
+            # inside a node (parallel analysts) counts towards the outer node
+            if node is not None and kwargs.get("name") == node:
+                outer = self._timed_parent(parent_run_id)
+                if outer is None or self._open[outer]["kind"] != "node":
+                    self._start_span(run_id, parent_run_id, node, "node", node)
+
+    def _end_chain(self, run_id, error=None):
+        with self._lock:
+            self._parents.pop(run_id, None)
+            span = self._end_span(run_id, error)
+            if span is not None:
+                counters = self._nodes[span["node"]]
+                counters["calls"] += 1
+                counters["wall_time"] += span["end"] - span["start"]
+                counters["errors"] += error is not None
+
+    def on_chain_end(self, outputs, *, run_id, parent_run_id=None, **kwargs):
+        if parent_run_id is None and isinstance(outputs, dict):
+            self.ticker = outputs.get("company_of_interest", self.ticker)
+            self.trade_date = outputs.get("trade_date", self.trade_date)
+        self._end_chain(run_id)
+
+    def on_chain_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        self._end_chain(run_id, error)
+
+    # LLM calls
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        self._start_llm(run_id, parent_run_id, metadata, kwargs.get("invocation_params"))
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        self._start_llm(run_id, parent_run_id, metadata, kwargs.get("invocation_params"))
+
+    def _start_llm(self, run_id, parent_run_id, metadata, invocation_params):
+        metadata = metadata or {}
+        invocation_params = invocation_params or {}
+        model = (
+            metadata.get("ls_model_name")
+            or invocation_params.get("model")
+            or invocation_params.get("model_name")
+        )
+        with self._lock:
+            self._start_span(
+                run_id,
+                parent_run_id,
+                model or "llm",
+                "llm",
+                metadata.get("langgraph_node"),
+                model=model,
+            )
+
+    def _cost(self, model, prompt_tokens, completion_tokens) -> float:
+        prices = self.prices.get(model)
+        if not prices:
+            return 0.0
+        return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1e6
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        prompt_tokens, completion_tokens, cache_hit = _token_usage(response)
+        with self._lock:
+            span = self._end_span(run_id)
+            if span is None:
+                return
+            cost = 0.0 if cache_hit else self._cost(
+                span["attributes"]["model"], prompt_tokens, completion_tokens
+            )
+            span["attributes"].update(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                cache_hit=cache_hit,
+            )
+            for counters in (self._llm, self._nodes[span["node"]]):
+                counters["llm_calls"] += 1
+                counters["llm_time"] += span["end"] - span["start"]
+                counters["prompt_tokens"] += prompt_tokens
+                counters["completion_tokens"] += completion_tokens
+                counters["cache_hits"] += cache_hit
+                counters["cost"] += cost
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            span = self._end_span(run_id, error)
+            if span is not None:
+                self._llm["errors"] += 1
+                self._nodes[span["node"]]["llm_errors"] += 1
+
+    def on_retry(self, retry_state, *, run_id, **kwargs):
+        with self._lock:
+            self._llm["retries"] += 1
+
+    # tools
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name", "tool")
+        with self._lock:
+            self._start_span(
+                run_id, parent_run_id, name, "tool", (metadata or {}).get("langgraph_node")
+            )
+
+    def _end_tool(self, run_id, error=None):
+        with self._lock:
+            span = self._end_span(run_id, error)
+            if span is not None:
+                counters = self._tools[span["name"]]
+                counters["calls"] += 1
+                counters["wall_time"] += span["end"] - span["start"]
+                counters["errors"] += error is not None
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end_tool(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end_tool(run_id, error)
+
+    # memory embeddings
+
+    def on_custom_event(self, name, data, *, run_id, metadata=None, **kwargs):
+        if name != EMBEDDING_EVENT:
+            return
+        with self._lock:
+            node = (metadata or {}).get("langgraph_node")
+            for counters in (self._embeddings, self._nodes[node]):
+                counters["embedding_calls"] += 1
+                counters["embedded_texts"] += data["texts"]
+                counters["embedding_requests"] += data["requested"]
+                counters["embedding_time"] += data["seconds"]
+
+    def profile(self) -> Dict[str, Any]:
+        """Totals of the run so far, per node, per tool and overall."""
+        with self._lock:
+            return {
+                "ticker": self.ticker,
+                "trade_date": self.trade_date,
+                "started_at": self.started_at,
+                "wall_time": time.perf_counter() - self._start,
+                "nodes": {node: _totals(counters) for node, counters in self._nodes.items()},
+                "tools": {tool: _totals(counters) for tool, counters in self._tools.items()},
+                "llm": _totals(self._llm),
+                "embeddings": _totals(self._embeddings),
+                "spans": sorted(self._spans, key=lambda span: span["start"]),
+            }
+
+
+def append_profile(path: str, profile: Dict[str, Any]) -> None:
+    """Append a run profile as one JSON line to path."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(profile, ensure_ascii=False) + "\n")
+
+
+def export_otel_spans(profile: Dict[str, Any], tracer_name: str = "tradingagents") -> None:
+    """
+    Replay the spans of a run profile through the OpenTelemetry tracer
+    provider configured by the application. Needs opentelemetry-api.
+    """
+    from opentelemetry import trace
+
+    tracer = trace.get_tracer(tracer_name)
+    root = tracer.start_span(
+        "propagate",
+        start_time=int(profile["started_at"] * 1e9),
+        attributes={
+            "ticker": str(profile["ticker"]),
+            "trade_date": str(profile["trade_date"]),
+        },
+    )
+    spans = {}
+    for record in profile["spans"]:
+        parent = spans.get(record["parent"], root)
+        attributes = {
+            key: value for key, value in record["attributes"].items() if value is not None
+        }
+        if record["node"] is not None:
+            attributes["node"] = record["node"]
+        span = tracer.start_span(
+            f"{record['kind']} {record['name']}",
+            context=trace.set_span_in_context(parent),
+            start_time=int(record["start"] * 1e9),
+            attributes=attributes,
+        )
+        if "error" in record:
+            span.set_status(trace.Status(trace.StatusCode.ERROR, record["error"]))
+        spans[record["id"]] = span
+    # parents are created first, children end before them
+    for record in reversed(profile["spans"]):
+        spans[record["id"]].end(end_time=int(record["end"] * 1e9))
+    root.end(end_time=int((profile["started_at"] + profile["wall_time"]) * 1e9))
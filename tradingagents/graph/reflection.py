@@ -1,8 +1,26 @@
 # TradingAgents/graph/reflection.py
 
-from typing import Dict, Any
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple
 from langchain_openai import ChatOpenAI
 
+# memory name -> (component reflected on, path of its analysis/decision in the state)
+REFLECTION_COMPONENTS = {
+    "bull_memory": ("BULL", ("investment_debate_state", "bull_history")),
+    "bear_memory": ("BEAR", ("investment_debate_state", "bear_history")),
+    "trader_memory": ("TRADER", ("trader_investment_plan",)),
+    "invest_judge_memory": ("INVEST JUDGE", ("investment_debate_state", "judge_decision")),
+    "risk_manager_memory": ("RISK JUDGE", ("risk_debate_state", "judge_decision")),
+}
+
+
+def _component_report(current_state: Dict[str, Any], path) -> str:
+    value = current_state
+    for key in path:
+        value = value[key]
+    return value
+
 
 class Reflector:
     """Handles reflection on decisions and updating memory."""
@@ -55,11 +73,8 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
 
         return f"{curr_market_report}\n\n{curr_sentiment_report}\n\n{curr_news_report}\n\n{curr_fundamentals_report}"
 
-    def _reflect_on_component(
-        self, component_type: str, report: str, situation: str, returns_losses
-    ) -> str:
-        """Generate reflection for a component."""
-        messages = [
+    def _reflection_messages(self, report: str, situation: str, returns_losses):
+        return [
             ("system", self.reflection_system_prompt),
             (
                 "human",
@@ -67,55 +82,124 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
             ),
         ]
 
+    def _reflect_on_component(
+        self, component_type: str, report: str, situation: str, returns_losses
+    ) -> str:
+        """Generate reflection for a component."""
+        messages = self._reflection_messages(report, situation, returns_losses)
+
         result = self.quick_thinking_llm.invoke(messages).content
         return result
 
-    def reflect_bull_researcher(self, current_state, returns_losses, bull_memory):
-        """Reflect on bull researcher's analysis and update memory."""
+    async def _areflect_on_component(
+        self, component_type: str, report: str, situation: str, returns_losses
+    ) -> str:
+        """Async version of _reflect_on_component."""
+        messages = self._reflection_messages(report, situation, returns_losses)
+
+        result = (await self.quick_thinking_llm.ainvoke(messages)).content
+        return result
+
+    def _reflect(self, memory_name, current_state, returns_losses, memory):
+        component_type, path = REFLECTION_COMPONENTS[memory_name]
         situation = self._extract_current_situation(current_state)
-        bull_debate_history = current_state["investment_debate_state"]["bull_history"]
 
         result = self._reflect_on_component(
-            "BULL", bull_debate_history, situation, returns_losses
+            component_type,
+            _component_report(current_state, path),
+            situation,
+            returns_losses,
         )
-        bull_memory.add_situations([(situation, result)])
+        memory.add_situations([(situation, result)])
+        return situation, result
+
+    def reflect_bull_researcher(self, current_state, returns_losses, bull_memory):
+        """Reflect on bull researcher's analysis and update memory."""
+        return self._reflect("bull_memory", current_state, returns_losses, bull_memory)
 
     def reflect_bear_researcher(self, current_state, returns_losses, bear_memory):
         """Reflect on bear researcher's analysis and update memory."""
-        situation = self._extract_current_situation(current_state)
-        bear_debate_history = current_state["investment_debate_state"]["bear_history"]
-
-        result = self._reflect_on_component(
-            "BEAR", bear_debate_history, situation, returns_losses
-        )
-        bear_memory.add_situations([(situation, result)])
+        return self._reflect("bear_memory", current_state, returns_losses, bear_memory)
 
     def reflect_trader(self, current_state, returns_losses, trader_memory):
         """Reflect on trader's decision and update memory."""
-        situation = self._extract_current_situation(current_state)
-        trader_decision = current_state["trader_investment_plan"]
-
-        result = self._reflect_on_component(
-            "TRADER", trader_decision, situation, returns_losses
-        )
-        trader_memory.add_situations([(situation, result)])
+        return self._reflect("trader_memory", current_state, returns_losses, trader_memory)
 
     def reflect_invest_judge(self, current_state, returns_losses, invest_judge_memory):
         """Reflect on investment judge's decision and update memory."""
-        situation = self._extract_current_situation(current_state)
-        judge_decision = current_state["investment_debate_state"]["judge_decision"]
-
-        result = self._reflect_on_component(
-            "INVEST JUDGE", judge_decision, situation, returns_losses
+        return self._reflect(
+            "invest_judge_memory", current_state, returns_losses, invest_judge_memory
         )
-        invest_judge_memory.add_situations([(situation, result)])
 
     def reflect_risk_manager(self, current_state, returns_losses, risk_manager_memory):
         """Reflect on risk manager's decision and update memory."""
+        return self._reflect(
+            "risk_manager_memory", current_state, returns_losses, risk_manager_memory
+        )
+
+    def _remember(self, situation, results, memories):
+        # every component reflects on the same situation: embed it once
+        embedding = next(iter(memories.values())).get_embedding(situation)
+        for memory_name, result in results.items():
+            memories[memory_name].add_situations(
+                [(situation, result)], embeddings=[embedding]
+            )
+        return {memory_name: (situation, result) for memory_name, result in results.items()}
+
+    def reflect_all(
+        self,
+        current_state,
+        returns_losses,
+        memories: Dict[str, Any],
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Tuple[str, str]]:
+        """Reflect on every component of REFLECTION_COMPONENTS in ``memories``
+        concurrently, then add all reflections to the memories.
+
+        Returns:
+            dict: memory name to the (situation, reflection) pair added to it
+        """
+        names = [name for name in REFLECTION_COMPONENTS if name in memories]
+        if not names:
+            return {}
         situation = self._extract_current_situation(current_state)
-        judge_decision = current_state["risk_debate_state"]["judge_decision"]
 
-        result = self._reflect_on_component(
-            "RISK JUDGE", judge_decision, situation, returns_losses
+        def reflect(memory_name):
+            component_type, path = REFLECTION_COMPONENTS[memory_name]
+            return self._reflect_on_component(
+                component_type,
+                _component_report(current_state, path),
+                situation,
+                returns_losses,
+            )
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(names)) as executor:
+            results = dict(zip(names, executor.map(reflect, names)))
+
+        return self._remember(situation, results, memories)
+
+    async def areflect_all(
+        self, current_state, returns_losses, memories: Dict[str, Any]
+    ) -> Dict[str, Tuple[str, str]]:
+        """Async version of reflect_all."""
+        names = [name for name in REFLECTION_COMPONENTS if name in memories]
+        if not names:
+            return {}
+        situation = self._extract_current_situation(current_state)
+
+        reflections = await asyncio.gather(
+            *[
+                self._areflect_on_component(
+                    REFLECTION_COMPONENTS[name][0],
+                    _component_report(current_state, REFLECTION_COMPONENTS[name][1]),
+                    situation,
+                    returns_losses,
+                )
+                for name in names
+            ]
+        )
+
+        # embedding and inserting are blocking calls
+        return await asyncio.to_thread(
+            self._remember, situation, dict(zip(names, reflections)), memories
         )
-        risk_manager_memory.add_situations([(situation, result)])
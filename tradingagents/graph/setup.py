@@ -1,6 +1,7 @@
 # TradingAgents/graph/setup.py
 
 from typing import Dict, Any
+from langchain_core.runnables import RunnableLambda
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
@@ -11,6 +12,14 @@ from tradingagents.agents.utils.agent_utils import Toolkit
 
 from .conditional_logic import ConditionalLogic
 
+# report field written by each analyst
+ANALYST_REPORT_FIELDS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+}
+
 
 class GraphSetup:
     """Handles the setup and configuration of the agent graph."""
@@ -27,8 +36,14 @@ class GraphSetup:
         invest_judge_memory,
         risk_manager_memory,
         conditional_logic: ConditionalLogic,
+        parallel_analysts: bool = False,
+        checkpointer=None,
     ):
-        """Initialize with required components."""
+        """Initialize with required components.
+
+        With a checkpointer the graph saves its state after every step, so an
+        interrupted run can be resumed from the last completed node.
+        """
         self.quick_thinking_llm = quick_thinking_llm
         self.deep_thinking_llm = deep_thinking_llm
         self.toolkit = toolkit
@@ -39,6 +54,48 @@ class GraphSetup:
         self.invest_judge_memory = invest_judge_memory
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
+        self.parallel_analysts = parallel_analysts
+        self.checkpointer = checkpointer
+
+    def _create_isolated_analyst(self, analyst_type, analyst_node, tool_node):
+        """Wrap an analyst and its tool loop into a node with its own message channel.
+
+        The analyst runs as a subgraph on a private copy of the messages, and
+        only its report field is written back, so several analysts can run in
+        the same step without interleaving their messages.
+        """
+        analyst_name = f"{analyst_type.capitalize()} Analyst"
+        tools_name = f"tools_{analyst_type}"
+        report_field = ANALYST_REPORT_FIELDS[analyst_type]
+
+        subgraph = StateGraph(AgentState)
+        subgraph.add_node(analyst_name, analyst_node)
+        subgraph.add_node(tools_name, tool_node)
+        subgraph.add_edge(START, analyst_name)
+        subgraph.add_conditional_edges(
+            analyst_name,
+            getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+            {
+                tools_name: tools_name,
+                f"Msg Clear {analyst_type.capitalize()}": END,
+            },
+        )
+        subgraph.add_edge(tools_name, analyst_name)
+        subgraph = subgraph.compile()
+
+        def isolated_analyst_node(state, config):
+            final_state = subgraph.invoke(
+                {**state, "messages": list(state["messages"])}, config
+            )
+            return {report_field: final_state[report_field]}
+
+        async def aisolated_analyst_node(state, config):
+            final_state = await subgraph.ainvoke(
+                {**state, "messages": list(state["messages"])}, config
+            )
+            return {report_field: final_state[report_field]}
+
+        return RunnableLambda(isolated_analyst_node, afunc=aisolated_analyst_node)
 
     def setup_graph(
         self, selected_analysts=["market", "social", "news", "fundamentals"]
@@ -113,6 +170,15 @@ class GraphSetup:
 
         # Add analyst nodes to the graph
         for analyst_type, node in analyst_nodes.items():
+            if self.parallel_analysts:
+                workflow.add_node(
+                    f"{analyst_type.capitalize()} Analyst",
+                    self._create_isolated_analyst(
+                        analyst_type, node, tool_nodes[analyst_type]
+                    ),
+                )
+                continue
+
             workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
             workflow.add_node(
                 f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
@@ -130,30 +196,41 @@ class GraphSetup:
         workflow.add_node("Risk Judge", risk_manager_node)
 
         # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
-
-        # Connect analysts in sequence
-        for i, analyst_type in enumerate(selected_analysts):
-            current_analyst = f"{analyst_type.capitalize()} Analyst"
-            current_tools = f"tools_{analyst_type}"
-            current_clear = f"Msg Clear {analyst_type.capitalize()}"
-
-            # Add conditional edges for current analyst
-            workflow.add_conditional_edges(
-                current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
-                [current_tools, current_clear],
-            )
-            workflow.add_edge(current_tools, current_analyst)
+        if self.parallel_analysts:
+            # Fan out to all analysts at once and join before the Bull Researcher;
+            # each analyst writes its own report field, so the merge is deterministic
+            analyst_names = [
+                f"{analyst_type.capitalize()} Analyst"
+                for analyst_type in selected_analysts
+            ]
+            for analyst_name in analyst_names:
+                workflow.add_edge(START, analyst_name)
+            workflow.add_edge(analyst_names, "Bull Researcher")
+        else:
+            # Start with the first analyst
+            first_analyst = selected_analysts[0]
+            workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
+
+            # Connect analysts in sequence
+            for i, analyst_type in enumerate(selected_analysts):
+                current_analyst = f"{analyst_type.capitalize()} Analyst"
+                current_tools = f"tools_{analyst_type}"
+                current_clear = f"Msg Clear {analyst_type.capitalize()}"
+
+                # Add conditional edges for current analyst
+                workflow.add_conditional_edges(
+                    current_analyst,
+                    getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+                    [current_tools, current_clear],
+                )
+                workflow.add_edge(current_tools, current_analyst)
 
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, "Bull Researcher")
+                # Connect to next analyst or to Bull Researcher if this is the last analyst
+                if i < len(selected_analysts) - 1:
+                    next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
+                    workflow.add_edge(current_clear, next_analyst)
+                else:
+                    workflow.add_edge(current_clear, "Bull Researcher")
 
         # Add remaining edges
         workflow.add_conditional_edges(
@@ -202,4 +279,4 @@ class GraphSetup:
         workflow.add_edge("Risk Judge", END)
 
         # Compile and return
-        return workflow.compile()
+        return workflow.compile(checkpointer=self.checkpointer)
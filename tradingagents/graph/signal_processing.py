@@ -1,14 +1,123 @@
 # TradingAgents/graph/signal_processing.py
 
+import re
+import threading
+from enum import Enum
+from typing import Dict, NamedTuple, Optional
+
 from langchain_openai import ChatOpenAI
 
 
+class Signal(str, Enum):
+    BUY = "BUY"
+    SELL = "SELL"
+    HOLD = "HOLD"
+
+
+class SignalExtraction(NamedTuple):
+    signal: Signal
+    confidence: float  # 0..1, how unambiguous the text is
+
+
+_SIGNAL_WORDS = {
+    "buy": Signal.BUY,
+    "sell": Signal.SELL,
+    "hold": Signal.HOLD,
+    "买入": Signal.BUY,
+    "卖出": Signal.SELL,
+    "持有": Signal.HOLD,
+}
+_WORD = r"(buy|sell|hold|买入|卖出|持有)"
+# a decision word must not be part of a longer word ("Holdings") and must not
+# start a list of choices echoed from the prompt ("BUY/HOLD/SELL", "Buy, Sell, or Hold")
+_END = r"(?![a-z])(?!\s*(?:[/,，、|]|or\b|或))"
+_FILLER = r"[\s:：*_\"'“”‘’「」『』【】\-—>]*"
+
+# "FINAL TRANSACTION PROPOSAL: **BUY**" / "最终交易提案：**买入**"
+_MARKER = re.compile(
+    rf"(?:final\s+transaction\s+proposal|最终交易提案){_FILLER}{_WORD}{_END}",
+    re.IGNORECASE,
+)
+# "Recommendation: **Hold**" / "最终决策：卖出"
+_LABELED = re.compile(
+    rf"(?:recommendation|decision|verdict|建议|决策|决定|结论){_FILLER}{_WORD}{_END}",
+    re.IGNORECASE,
+)
+# a decision word that is bold on its own: "**SELL**"
+_BOLD = re.compile(rf"\*\*\s*{_WORD}\s*\*\*", re.IGNORECASE)
+
+# (pattern, confidence when every match agrees, confidence otherwise)
+_PATTERNS = (
+    (_MARKER, 1.0, 0.75),
+    (_LABELED, 0.9, 0.5),
+    (_BOLD, 0.7, 0.3),
+)
+
+
+def extract_signal(text: str) -> Optional[SignalExtraction]:
+    """
+    Find the decision in an English or Chinese trading report without an LLM.
+
+    Explicit final transaction proposals win over labeled recommendations,
+    which win over a bare bold decision word. When the matches of a pattern
+    disagree the last one is returned with a lower confidence. Returns None
+    when the text names no decision at all.
+    """
+    for pattern, agreed, disputed in _PATTERNS:
+        signals = [_SIGNAL_WORDS[word.lower()] for word in pattern.findall(text)]
+        if signals:
+            confidence = agreed if len(set(signals)) == 1 else disputed
+            return SignalExtraction(signals[-1], confidence)
+    return None
+
+
 class SignalProcessor:
     """Processes trading signals to extract actionable decisions."""
 
-    def __init__(self, quick_thinking_llm: ChatOpenAI):
-        """Initialize with an LLM for processing."""
+    def __init__(
+        self,
+        quick_thinking_llm: ChatOpenAI,
+        fast_path: bool = True,
+        min_confidence: float = 0.8,
+    ):
+        """
+        Initialize with an LLM for processing. With ``fast_path`` the decision
+        is read from the text directly when extract_signal is at least
+        ``min_confidence`` sure, and the LLM is asked only otherwise.
+        """
         self.quick_thinking_llm = quick_thinking_llm
+        self.fast_path = fast_path
+        self.min_confidence = min_confidence
+        self.fast_path_hits = 0
+        self.llm_fallbacks = 0
+        self._lock = threading.Lock()
+
+    def _messages(self, full_signal: str):
+        return [
+            (
+                "system",
+                "You are an efficient assistant designed to analyze paragraphs or financial reports provided by a group of analysts. Your task is to extract the investment decision: SELL, BUY, or HOLD. Provide only the extracted decision (SELL, BUY, or HOLD) as your output, without adding any additional text or information.",
+            ),
+            ("human", full_signal),
+        ]
+
+    def _fast_path(self, full_signal: str) -> Optional[str]:
+        extraction = extract_signal(full_signal) if self.fast_path else None
+        with self._lock:
+            if extraction is not None and extraction.confidence >= self.min_confidence:
+                self.fast_path_hits += 1
+                return extraction.signal.value
+            self.llm_fallbacks += 1
+        return None
+
+    @staticmethod
+    def _normalize(content: str) -> str:
+        # the LLM sometimes adds punctuation or a sentence; keep it if unclear
+        words = {
+            _SIGNAL_WORDS[word.lower()]
+            for word in re.findall(_WORD + _END, content, re.IGNORECASE)
+        }
+        return words.pop().value if len(words) == 1 else content
 
     def process_signal(self, full_signal: str) -> str:
         """
@@ -20,12 +129,27 @@ class SignalProcessor:
         Returns:
             Extracted decision (BUY, SELL, or HOLD)
         """
-        messages = [
-            (
-                "system",
-                "You are an efficient assistant designed to analyze paragraphs or financial reports provided by a group of analysts. Your task is to extract the investment decision: SELL, BUY, or HOLD. Provide only the extracted decision (SELL, BUY, or HOLD) as your output, without adding any additional text or information.",
-            ),
-            ("human", full_signal),
-        ]
+        signal = self._fast_path(full_signal)
+        if signal is not None:
+            return signal
+        return self._normalize(
+            self.quick_thinking_llm.invoke(self._messages(full_signal)).content
+        )
+
+    async def aprocess_signal(self, full_signal: str) -> str:
+        """Async version of process_signal."""
+        signal = self._fast_path(full_signal)
+        if signal is not None:
+            return signal
+        response = await self.quick_thinking_llm.ainvoke(self._messages(full_signal))
+        return self._normalize(response.content)
 
-        return self.quick_thinking_llm.invoke(messages).content
+    def stats(self) -> Dict[str, float]:
+        """Fast path hits, LLM fallbacks and the fast path hit rate."""
+        with self._lock:
+            total = self.fast_path_hits + self.llm_fallbacks
+            return {
+                "fast_path_hits": self.fast_path_hits,
+                "llm_fallbacks": self.llm_fallbacks,
+                "hit_rate": self.fast_path_hits / total if total else 0.0,
+            }
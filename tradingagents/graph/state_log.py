@@ -0,0 +1,183 @@
+# TradingAgents/graph/state_log.py
+
+import gzip
+import json
+import os
+import threading
+import zlib
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+_CHUNK_SIZE = 1 << 16
+
+
+class StateLog(Mapping):
+    """
+    Append-only log of the final states of one ticker, keyed by trade date.
+
+    Each ``append`` writes one record, ``{"date": ..., "state": ...}``, to the
+    end of ``path`` in a single write: a JSON line, or its own gzip member when
+    ``path`` ends in ``.gz`` (concatenated members are still one valid gzip
+    file). The byte range of every record goes to ``<path>.idx`` only after
+    the record is on disk, so the index never points at a partial record.
+
+    Reading is a Mapping from trade date to state. Only the index is held in
+    memory; looking up a date seeks to its record and decodes just that one.
+    Logging a date again replaces it, the old record stays in the file.
+    """
+
+    def __init__(self, path: str, compression_level: int = 6):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.compressed = path.endswith(".gz")
+        self.compression_level = compression_level
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        self._end = 0  # end of the last indexed record
+        self._index_size = 0  # bytes of the index file already read
+        self._recovered = False
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Pick up records appended by another writer since the last read."""
+        with self._lock:
+            if not os.path.exists(self.index_path):
+                if os.path.exists(self.path):
+                    # the index is derived data, rebuild it from the records
+                    for offset, length, record in self._scan(0):
+                        self._index(record["date"], offset, length)
+                return
+            self._read_index()
+
+    def _read_index(self) -> None:
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_size)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # being written
+                entry = json.loads(line)
+                self._index(entry["date"], entry["offset"], entry["length"])
+                self._index_size += len(line)
+
+    def _index(self, date: str, offset: int, length: int) -> None:
+        self._offsets[date] = (offset, length)
+        self._end = max(self._end, offset + length)
+
+    def _encode(self, record: Dict[str, Any]) -> bytes:
+        data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        if self.compressed:
+            return gzip.compress(data, compresslevel=self.compression_level)
+        return data
+
+    def _decode(self, data: bytes) -> Dict[str, Any]:
+        if self.compressed:
+            data = gzip.decompress(data)
+        return json.loads(data)
+
+    def _scan(self, offset: int) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """(offset, length, record) of every complete record from offset on."""
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            if not self.compressed:
+                for line in iter(f.readline, b""):
+                    if not line.endswith(b"\n"):
+                        return
+                    yield offset, len(line), json.loads(line)
+                    offset += len(line)
+                return
+
+            while True:
+                decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+                parts, consumed = [], 0
+                while not decompressor.eof:
+                    chunk = f.read(_CHUNK_SIZE)
+                    if not chunk:
+                        return
+                    try:
+                        parts.append(decompressor.decompress(chunk))
+                    except zlib.error:
+                        return  # torn member
+                    consumed += len(chunk)
+                length = consumed - len(decompressor.unused_data)
+                yield offset, length, json.loads(b"".join(parts))
+                offset += length
+                f.seek(offset)
+
+    def _recover(self) -> None:
+        # a crash can leave records the index misses, a torn record and a torn
+        # index line at the end; index the complete records and cut the rest
+        # before appending
+        if os.path.exists(self.index_path):
+            self._read_index()
+            if os.path.getsize(self.index_path) > self._index_size:
+                # the next entry would be appended to the torn line
+                with open(self.index_path, "r+b") as f:
+                    f.truncate(self._index_size)
+        if not os.path.exists(self.path):
+            return
+        if not os.path.exists(self.index_path) and self._offsets:
+            # persist the index refresh rebuilt from the records
+            self._write_index(
+                [(date, offset, length) for date, (offset, length) in self._offsets.items()]
+            )
+        if os.path.getsize(self.path) == self._end:
+            return
+        entries = []
+        for offset, length, record in self._scan(self._end):
+            entries.append((record["date"], offset, length))
+        end = entries[-1][1] + entries[-1][2] if entries else self._end
+        with open(self.path, "r+b") as f:
+            f.truncate(end)
+        self._write_index(entries)
+
+    def _write_index(self, entries) -> None:
+        lines = "".join(
+            json.dumps({"date": date, "offset": offset, "length": length}) + "\n"
+            for date, offset, length in entries
+        ).encode("utf-8")
+        with open(self.index_path, "ab") as f:
+            f.write(lines)
+        self._index_size += len(lines)
+        for entry in entries:
+            self._index(*entry)
+
+    def append(self, trade_date, state: Dict[str, Any]) -> None:
+        """Durably log the state of trade_date, replacing any earlier one."""
+        record = self._encode({"date": str(trade_date), "state": state})
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            if not self._recovered:
+                self._recover()
+                self._recovered = True
+
+            with open(self.path, "ab") as f:
+                offset = f.tell()
+                f.write(record)
+                f.flush()
+                os.fsync(f.fileno())
+            self._write_index([(str(trade_date), offset, len(record))])
+
+    def __getitem__(self, trade_date) -> Dict[str, Any]:
+        with self._lock:
+            offset, length = self._offsets[str(trade_date)]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return self._decode(f.read(length))["state"]
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._offsets))
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, trade_date) -> bool:
+        return str(trade_date) in self._offsets
+
+
+def state_log_path(results_dir: str, ticker: str, compression_level: Optional[int]) -> str:
+    """Where the state log of ticker lives, .gz when it is compressed."""
+    path = os.path.join(
+        results_dir, ticker, "TradingAgentsStrategy_logs", "full_states_log.jsonl"
+    )
+    return path + ".gz" if compression_level is not None else path
@@ -1,6 +1,7 @@
 # TradingAgents/graph/trading_graph.py
 
 import os
+import threading
 from pathlib import Path
 import json
 from datetime import date
@@ -8,7 +9,6 @@ from typing import Dict, Any, Tuple, List, Optional
 
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
 
 from langgraph.prebuilt import ToolNode
 
@@ -21,12 +21,17 @@ from tradingagents.agents.utils.agent_states import (
     RiskDebateState,
 )
 from tradingagents.dataflows.interface import set_config
+from tradingagents.dataflows.clients import get_client_registry
+from tradingagents.dataflows.llm_cache import create_llm_cache, set_llm_response_cache
 
+from .checkpointing import create_checkpointer, keep_finished_threads
 from .conditional_logic import ConditionalLogic
 from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
+from .profiling import RunProfiler, append_profile, export_otel_spans
 from .signal_processing import SignalProcessor
+from .state_log import StateLog, state_log_path
 
 
 class TradingAgentsGraph:
@@ -37,6 +42,9 @@ class TradingAgentsGraph:
         selected_analysts=["market", "social", "news", "fundamentals"],
         debug=False,
         config: Dict[str, Any] = None,
+        quick_thinking_llm=None,
+        deep_thinking_llm=None,
+        embedding_func=None,
     ):
         """Initialize the trading agents graph and components.
 
@@ -44,6 +52,11 @@ class TradingAgentsGraph:
             selected_analysts: List of analyst types to include
             debug: Whether to run in debug mode
             config: Configuration dictionary. If None, uses default config
+            quick_thinking_llm, deep_thinking_llm: Chat models to use instead of
+                the ones built from the configured provider; a model that is
+                not passed in is still built from the config
+            embedding_func: Function embedding a list of texts, used by the
+                memories instead of the provider's embedding endpoint
         """
         self.debug = debug
         self.config = config or DEFAULT_CONFIG
@@ -57,29 +70,52 @@ class TradingAgentsGraph:
             exist_ok=True,
         )
 
-        # Initialize LLMs
-        llm_timeout = self.config.get("llm_timeout")
+        # Initialize LLMs, building only the ones that were not passed in
+        self.deep_thinking_llm = (
+            deep_thinking_llm
+            if deep_thinking_llm is not None
+            else self._create_llm(self.config["deep_think_llm"])
+        )
+        self.quick_thinking_llm = (
+            quick_thinking_llm
+            if quick_thinking_llm is not None
+            else self._create_llm(self.config["quick_think_llm"])
+        )
+
+        # Cache model responses, keyed by model, parameters, messages and tools
+        self.llm_cache = create_llm_cache(self.config)
+        set_llm_response_cache(self.llm_cache)
+        if self.llm_cache is not None:
+            # copies, the models may be shared with the caller or other graphs
+            self.deep_thinking_llm = self.deep_thinking_llm.model_copy(
+                update={"cache": self.llm_cache}
+            )
+            self.quick_thinking_llm = self.quick_thinking_llm.model_copy(
+                update={"cache": self.llm_cache}
+            )
 
-        if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
-            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], request_timeout=llm_timeout)
-            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], request_timeout=llm_timeout)
-        elif self.config["llm_provider"].lower() == "anthropic":
-            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], timeout=llm_timeout)
-            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], timeout=llm_timeout)
-        elif self.config["llm_provider"].lower() == "google":
-            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"], timeout=llm_timeout)
-            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"], timeout=llm_timeout)
-        else:
-            raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
-        
         self.toolkit = Toolkit(config=self.config)
 
         # Initialize memories
-        self.bull_memory = FinancialSituationMemory("bull_memory", self.config)
-        self.bear_memory = FinancialSituationMemory("bear_memory", self.config)
-        self.trader_memory = FinancialSituationMemory("trader_memory", self.config)
-        self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config)
-        self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config)
+        self.bull_memory = FinancialSituationMemory(
+            "bull_memory", self.config, embedding_func
+        )
+        self.bear_memory = FinancialSituationMemory(
+            "bear_memory", self.config, embedding_func
+        )
+        self.trader_memory = FinancialSituationMemory(
+            "trader_memory", self.config, embedding_func
+        )
+        self.invest_judge_memory = FinancialSituationMemory(
+            "invest_judge_memory", self.config, embedding_func
+        )
+        self.risk_manager_memory = FinancialSituationMemory(
+            "risk_manager_memory", self.config, embedding_func
+        )
+
+        # Checkpoint every graph step so that interrupted runs can be resumed
+        self.checkpointer = create_checkpointer(self.config)
+        self.keep_finished_threads = keep_finished_threads(self.config)
 
         # Create tool nodes
         self.tool_nodes = self._create_tool_nodes()
@@ -97,20 +133,50 @@ class TradingAgentsGraph:
             self.invest_judge_memory,
             self.risk_manager_memory,
             self.conditional_logic,
+            parallel_analysts=self.config.get("parallel_analysts", False),
+            checkpointer=self.checkpointer,
         )
 
         self.propagator = Propagator()
         self.reflector = Reflector(self.quick_thinking_llm)
-        self.signal_processor = SignalProcessor(self.quick_thinking_llm)
+        self.signal_processor = SignalProcessor(
+            self.quick_thinking_llm,
+            fast_path=self.config.get("signal_fast_path", True),
+            min_confidence=self.config.get("signal_min_confidence", 0.8),
+        )
 
         # State tracking
         self.curr_state = None
+        self.last_profile = None  # run profile of the last propagate
         self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
+        self.log_states_dict = None  # StateLog of the last logged ticker, date to full state dict
+        self._state_logs = {}
+        self._log_lock = threading.Lock()
 
         # Set up the graph
         self.graph = self.graph_setup.setup_graph(selected_analysts)
 
+    def _create_llm(self, model):
+        """Chat model of the configured provider."""
+        llm_timeout = self.config.get("llm_timeout")
+        clients = get_client_registry()
+        provider = self.config["llm_provider"].lower()
+
+        if provider in ("openai", "ollama", "openrouter"):
+            # LangChain only uses http_client for sync calls, apropagate needs the async one
+            return ChatOpenAI(
+                model=model,
+                base_url=self.config["backend_url"],
+                request_timeout=llm_timeout,
+                http_client=clients.http_client(self.config.get("proxies")),
+                http_async_client=clients.async_http_client(self.config.get("proxies")),
+            )
+        if provider == "anthropic":
+            return ChatAnthropic(model=model, base_url=self.config["backend_url"], timeout=llm_timeout)
+        if provider == "google":
+            return clients.google_chat(model, llm_timeout)
+        raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
+
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources."""
         return {
@@ -152,6 +218,7 @@ class TradingAgentsGraph:
                     self.toolkit.get_simfin_balance_sheet,
                     self.toolkit.get_simfin_cashflow,
                     self.toolkit.get_simfin_income_stmt,
+                    self.toolkit.get_simfin_statements,
                 ]
             ),
         }
@@ -161,39 +228,283 @@ class TradingAgentsGraph:
 
         self.ticker = company_name
 
-        # Initialize state
+        final_state, decision, profile = self._run(company_name, trade_date)
+
+        # Store current state for reflection
+        self.curr_state = final_state
+        self.last_profile = profile
+        self.log_states_dict = self.state_log(company_name)
+
+        return final_state, decision
+
+    def run(self, company_name, trade_date, thread_id=None):
+        """Run the graph for one (ticker, date) without touching the per-run
+        state of the instance (ticker, curr_state, last_profile,
+        log_states_dict), so it can be called concurrently from several
+        threads. Returns the final state and the processed signal.
+
+        With a checkpointer the run is checkpointed under thread_id, by default
+        "<ticker>:<date>". Running a (ticker, date) whose previous run was
+        interrupted resumes it after its last completed node; a thread that
+        already finished is started over.
+        """
+
+        final_state, decision, _ = self._run(company_name, trade_date, thread_id)
+        return final_state, decision
+
+    def _run(self, company_name, trade_date, thread_id=None):
+        """run, also returning the run profile (None when profiling is off)."""
+        init_agent_state, args = self.prepare_run(company_name, trade_date, thread_id)
+        final_state, profile = self._invoke(init_agent_state, args)
+        return final_state, self._finish(final_state, args), profile
+
+    async def apropagate(self, company_name, trade_date):
+        """Async version of propagate, driving the graph with ainvoke.
+
+        Nodes call the LLMs with ainvoke, so many propagations can share one
+        event loop.
+        """
+
+        final_state, decision, profile = await self._arun(company_name, trade_date)
+
+        # Store current state for reflection
+        self.ticker = company_name
+        self.curr_state = final_state
+        self.last_profile = profile
+        self.log_states_dict = self.state_log(company_name)
+
+        return final_state, decision
+
+    async def arun(self, company_name, trade_date, thread_id=None):
+        """Async version of run."""
+
+        final_state, decision, _ = await self._arun(company_name, trade_date, thread_id)
+        return final_state, decision
+
+    async def _arun(self, company_name, trade_date, thread_id=None):
+        """Async version of _run."""
+        init_agent_state, args = await self.aprepare_run(
+            company_name, trade_date, thread_id
+        )
+        final_state, profile = await self._ainvoke(init_agent_state, args)
+        return final_state, await self._afinish(final_state, args), profile
+
+    def prepare_run(self, company_name, trade_date, thread_id=None):
+        """Graph input and args of a run for one (ticker, date), for callers
+        that drive self.graph themselves (the CLI streams it).
+
+        With a checkpointer the input is None when the thread was interrupted,
+        so the run resumes, and a thread that already finished is deleted.
+        """
         init_agent_state = self.propagator.create_initial_state(
             company_name, trade_date
         )
-        args = self.propagator.get_graph_args()
+        thread_id = self._thread_id(company_name, trade_date, thread_id)
+        args = self.propagator.get_graph_args(thread_id)
+
+        if thread_id is not None:
+            snapshot = self.graph.get_state(args["config"])
+            if snapshot.next:
+                init_agent_state = None  # resume the interrupted run
+            elif snapshot.values:
+                self.checkpointer.delete_thread(thread_id)
+        return init_agent_state, args
+
+    async def aprepare_run(self, company_name, trade_date, thread_id=None):
+        """Async version of prepare_run."""
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date
+        )
+        thread_id = self._thread_id(company_name, trade_date, thread_id)
+        args = self.propagator.get_graph_args(thread_id)
+
+        if thread_id is not None:
+            snapshot = await self.graph.aget_state(args["config"])
+            if snapshot.next:
+                init_agent_state = None  # resume the interrupted run
+            elif snapshot.values:
+                await self.checkpointer.adelete_thread(thread_id)
+        return init_agent_state, args
+
+    def resume(self, thread_id):
+        """Continue an interrupted run from the checkpoint after its last completed node."""
+        self._require_checkpointer()
+        args = self.propagator.get_graph_args(thread_id)
+        final_state, _ = self._invoke(None, args)
+        return final_state, self._finish(final_state, args)
+
+    async def aresume(self, thread_id):
+        """Async version of resume."""
+        self._require_checkpointer()
+        args = self.propagator.get_graph_args(thread_id)
+        final_state, _ = await self._ainvoke(None, args)
+        return final_state, await self._afinish(final_state, args)
+
+    def replay_from(self, thread_id, node):
+        """Run a checkpointed thread again from its last checkpoint before node.
+
+        Nodes completed before it are not run again; node and everything after
+        it are, e.g. replay_from("NVDA:2025-07-03", "Risk Judge") only asks the
+        Risk Judge for a new decision. The replay forks the thread, its earlier
+        history stays available. Finished runs can only be replayed when their
+        checkpoints are kept (checkpoint_keep_finished, on by default for "sqlite").
+        """
+        self._require_checkpointer()
+        args = self.propagator.get_graph_args(thread_id)
+        for snapshot in self.graph.get_state_history(args["config"]):
+            if node in snapshot.next:
+                args["config"]["configurable"] = snapshot.config["configurable"]
+                final_state, _ = self._invoke(None, args)
+                return final_state, self._finish(final_state, args)
+        raise ValueError(f"Thread {thread_id} has no checkpoint before node {node!r}")
+
+    async def areplay_from(self, thread_id, node):
+        """Async version of replay_from."""
+        self._require_checkpointer()
+        args = self.propagator.get_graph_args(thread_id)
+        async for snapshot in self.graph.aget_state_history(args["config"]):
+            if node in snapshot.next:
+                args["config"]["configurable"] = snapshot.config["configurable"]
+                final_state, _ = await self._ainvoke(None, args)
+                return final_state, await self._afinish(final_state, args)
+        raise ValueError(f"Thread {thread_id} has no checkpoint before node {node!r}")
+
+    def _thread_id(self, company_name, trade_date, thread_id=None):
+        if self.checkpointer is None:
+            return None
+        return thread_id or f"{company_name}:{trade_date}"
+
+    def _require_checkpointer(self):
+        if self.checkpointer is None:
+            raise ValueError(
+                "Resuming needs a checkpointer, set config['checkpointer'] to 'memory' or 'sqlite'"
+            )
+
+    def _profiled(self, args):
+        """Graph args with a RunProfiler attached, unless profiling is off."""
+        if not self.config.get("run_profile", True):
+            return args, None
+        profiler = RunProfiler(self.config.get("llm_prices"))
+        return {**args, "config": {**args["config"], "callbacks": [profiler]}}, profiler
+
+    def _save_profile(self, profiler):
+        """Append the run profile next to the state log, export it as spans
+        and return it.
+
+        Runs in a finally block, so failures are only reported: they must not
+        replace the result or the exception of the run itself.
+        """
+        profile = full_profile = profiler.profile()
+        if profile["ticker"] is not None:
+            if not self.config.get("run_profile_spans"):
+                # the totals are enough for the log, spans grow with every call
+                profile = {key: value for key, value in profile.items() if key != "spans"}
+            try:
+                append_profile(
+                    os.path.join(
+                        "eval_results",
+                        profile["ticker"],
+                        "TradingAgentsStrategy_logs",
+                        "run_profiles.jsonl",
+                    ),
+                    profile,
+                )
+            except Exception as e:
+                print(f"Error saving the run profile: {e}")
+        if self.config.get("run_profile_otel"):
+            try:
+                export_otel_spans(full_profile)
+            except Exception as e:
+                print(f"Error exporting the run profile as OpenTelemetry spans: {e}")
+        return full_profile
+
+    def _invoke(self, graph_input, args):
+        """Final state and run profile of one graph run."""
+        args, profiler = self._profiled(args)
+        profile = None
+        try:
+            final_state = self._invoke_graph(graph_input, args)
+        finally:
+            if profiler is not None:
+                profile = self._save_profile(profiler)
+        return final_state, profile
+
+    async def _ainvoke(self, graph_input, args):
+        """Async version of _invoke."""
+        args, profiler = self._profiled(args)
+        profile = None
+        try:
+            final_state = await self._ainvoke_graph(graph_input, args)
+        finally:
+            if profiler is not None:
+                profile = self._save_profile(profiler)
+        return final_state, profile
+
+    def _invoke_graph(self, graph_input, args):
+        if self.debug:
+            # Debug mode with tracing
+            trace = []
+            for chunk in self.graph.stream(graph_input, **args):
+                if len(chunk["messages"]) == 0:
+                    pass
+                else:
+                    chunk["messages"][-1].pretty_print()
+                    trace.append(chunk)
+
+            return trace[-1]
 
+        # Standard mode without tracing
+        return self.graph.invoke(graph_input, **args)
+
+    async def _ainvoke_graph(self, graph_input, args):
         if self.debug:
             # Debug mode with tracing
             trace = []
-            for chunk in self.graph.stream(init_agent_state, **args):
+            async for chunk in self.graph.astream(graph_input, **args):
                 if len(chunk["messages"]) == 0:
                     pass
                 else:
                     chunk["messages"][-1].pretty_print()
                     trace.append(chunk)
 
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
+            return trace[-1]
 
-        # Store current state for reflection
-        self.curr_state = final_state
+        # Standard mode without tracing
+        return await self.graph.ainvoke(graph_input, **args)
+
+    def finish_thread(self, args):
+        """Drop the checkpoints of a finished run, unless they are kept for
+        replay_from (see checkpoint_keep_finished in the config)."""
+        thread_id = args["config"].get("configurable", {}).get("thread_id")
+        if thread_id is not None and not self.keep_finished_threads:
+            self.checkpointer.delete_thread(thread_id)
 
-        # Log state
-        self._log_state(trade_date, final_state)
+    async def afinish_thread(self, args):
+        """Async version of finish_thread."""
+        thread_id = args["config"].get("configurable", {}).get("thread_id")
+        if thread_id is not None and not self.keep_finished_threads:
+            await self.checkpointer.adelete_thread(thread_id)
 
-        # Return decision and processed signal
-        return final_state, self.process_signal(final_state["final_trade_decision"])
+    def _finish(self, final_state, args):
+        """Log the final state, release its thread and return the processed signal."""
+        self._log_state(
+            final_state["trade_date"], final_state, final_state["company_of_interest"]
+        )
+        self.finish_thread(args)
+        return self.process_signal(final_state["final_trade_decision"])
+
+    async def _afinish(self, final_state, args):
+        """Async version of _finish."""
+        self._log_state(
+            final_state["trade_date"], final_state, final_state["company_of_interest"]
+        )
+        await self.afinish_thread(args)
+        return await self.aprocess_signal(final_state["final_trade_decision"])
 
-    def _log_state(self, trade_date, final_state):
-        """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+    def _log_state(self, trade_date, final_state, ticker=None):
+        """Append the final state to the state log of the ticker."""
+        ticker = ticker or self.ticker
+        state = {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
@@ -222,35 +533,76 @@ class TradingAgentsGraph:
             "investment_plan": final_state["investment_plan"],
             "final_trade_decision": final_state["final_trade_decision"],
         }
+        self.state_log(ticker).append(trade_date, state)
+
+    def state_log(self, ticker) -> StateLog:
+        """The append-only log of every state logged for ticker, keyed by trade date."""
+        with self._log_lock:
+            if ticker not in self._state_logs:
+                level = self.config.get("state_log_compression")
+                self._state_logs[ticker] = StateLog(
+                    state_log_path("eval_results", ticker, level),
+                    compression_level=level if level is not None else 6,
+                )
+            return self._state_logs[ticker]
+
+    def _memories(self) -> Dict[str, FinancialSituationMemory]:
+        return {
+            "bull_memory": self.bull_memory,
+            "bear_memory": self.bear_memory,
+            "trader_memory": self.trader_memory,
+            "invest_judge_memory": self.invest_judge_memory,
+            "risk_manager_memory": self.risk_manager_memory,
+        }
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
-        directory.mkdir(parents=True, exist_ok=True)
+    def export_memories(self, directory):
+        """Export every memory to <directory>/<memory name>.jsonl.
 
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log.json",
-            "w",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+        Returns:
+            dict: memory name to the number of exported memories
+        """
+        os.makedirs(directory, exist_ok=True)
+        return {
+            name: memory.export_memories(os.path.join(directory, f"{name}.jsonl"))
+            for name, memory in self._memories().items()
+        }
 
-    def reflect_and_remember(self, returns_losses):
-        """Reflect on decisions and update memory based on returns."""
-        self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
-        )
-        self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
-        )
-        self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
-        )
-        self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
-        )
-        self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
-        )
+    def import_memories(self, directory):
+        """Import the memory exports found in directory (see export_memories).
+
+        Returns:
+            dict: memory name to the number of imported memories
+        """
+        imported = {}
+        for name, memory in self._memories().items():
+            path = os.path.join(directory, f"{name}.jsonl")
+            if os.path.exists(path):
+                imported[name] = memory.import_memories(path)
+        return imported
+
+    def reflect_and_remember(self, returns_losses, state=None):
+        """Reflect on decisions and update memory based on returns.
+
+        Args:
+            returns_losses: returns of the position taken on the decision
+            state: final state of the run to reflect on, defaults to the last
+                propagated one
+
+        Returns:
+            dict: memory name to the (situation, reflection) pair added to it
+        """
+        state = state if state is not None else self.curr_state
+        return self.reflector.reflect_all(state, returns_losses, self._memories())
+
+    async def areflect_and_remember(self, returns_losses, state=None):
+        """Async version of reflect_and_remember."""
+        state = state if state is not None else self.curr_state
+        return await self.reflector.areflect_all(state, returns_losses, self._memories())
 
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal)
+
+    async def aprocess_signal(self, full_signal):
+        """Async version of process_signal."""
+        return await self.signal_processor.aprocess_signal(full_signal)